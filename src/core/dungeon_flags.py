@@ -0,0 +1,80 @@
+"""
+Compiled dungeon-flag tables for the native memory reader (core/memory_reader.py).
+
+dungeon_flags_*.json lists, per flag address, the locations whose `flag`
+bit is set there once the dungeon is cleared. DungeonFlagTable turns that
+into one 256-entry table per flag byte (byte value -> bitset of cleared
+locations), so decoding a poll is a table lookup and an OR per byte.
+
+Bitsets are diffed with XOR, giving exact added / removed locations.
+"""
+import json
+import logging
+from typing import Dict, List, Tuple
+
+from utils.constants import DATA_DIR
+
+
+class DungeonFlagTable:
+    def __init__(self, flags: Dict[str, List[dict]], shift: int = 0):
+        addresses = sorted(int(address, 16) + shift for address in flags)
+        self.start = addresses[0] if addresses else 0
+        self.size = addresses[-1] - self.start + 1 if addresses else 0
+        self.addresses = addresses
+
+        self.locations: List[str] = [] # Bit i is locations[i]
+        masks = [[] for _ in range(self.size)] # Per flag byte: [(mask, bit)]
+        for address, entries in flags.items():
+            offset = int(address, 16) + shift - self.start
+            for entry in entries:
+                mask = int(entry["flag"], 16)
+                binary = entry.get("binary")
+                if binary and int(binary.replace(" ", ""), 2) != mask:
+                    logging.warning(f"{entry['location']}: flag {entry['flag']} and binary {binary} disagree, using flag")
+                masks[offset].append((mask, 1 << len(self.locations)))
+                self.locations.append(entry["location"])
+        self.bits = {name: 1 << i for i, name in enumerate(self.locations)}
+
+        # Byte offset -> 256 bitsets. Bytes without locations get no table and are skipped.
+        self.tables: List[Tuple[int, List[int]]] = []
+        for offset, byte_masks in enumerate(masks):
+            if not byte_masks:
+                continue
+            table = [0] * 256
+            for value in range(256):
+                for mask, bit in byte_masks:
+                    if value & mask:
+                        table[value] |= bit
+            self.tables.append((offset, table))
+
+    @classmethod
+    def load(cls, filename: str, shift: int = 0) -> "DungeonFlagTable":
+        """`shift` moves every address (a relocated emulator build, see EmulatorProfile.shifted)."""
+        with open(DATA_DIR / filename, "r", encoding="utf-8") as f:
+            return cls(json.load(f), shift)
+
+    def decode(self, data) -> int:
+        """Bitset of cleared locations from the flag bytes (starting at self.start)."""
+        bits = 0
+        for offset, table in self.tables:
+            bits |= table[data[offset]]
+        return bits
+
+    def names(self, bits: int) -> List[str]:
+        names = []
+        locations = self.locations
+        while bits:
+            low = bits & -bits
+            names.append(locations[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def diff(self, old: int, new: int) -> Tuple[List[str], List[str]]:
+        """(added, removed) location names between two decoded bitsets."""
+        changed = old ^ new
+        if not changed:
+            return [], []
+        return self.names(changed & new), self.names(changed & old)
+
+    def __repr__(self):
+        return f"DungeonFlagTable({len(self.locations)} locations, {len(self.tables)} bytes at 0x{self.start:X})"
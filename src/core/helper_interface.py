@@ -1,115 +1,441 @@
+import asyncio
 import subprocess
 import threading
-import socket
-import json
 import logging
-import os
+import sys
 import time
 import atexit
 from pathlib import Path
 
+from core.schema import PayloadSchemaError, decode_payload, loads
+from network.capture import CAPTURE_NDJSON, CaptureWriter
+from network.commands import CMD_PING, CMD_SYNC, CMD_OPTIONS, PendingCommands, is_ack, options_command, sync_command
+from network.health import (
+    LINK_STOPPED, LINK_WAITING, LINK_CONNECTED, LINK_UNRESPONSIVE, LINK_RESTARTING, LINK_FAILED,
+    HEARTBEAT_INTERVAL, DEAD_PEER_TIMEOUT, UNRESPONSIVE_AFTER, HEALTHY_AFTER, Backoff, LinkHealth,
+)
+from network.dedup import FrameDeduplicator
+from network.framing import NdjsonFramer, BinaryFrameReader, FrameError, LinkStats
+from network.transports import Endpoint, TRANSPORT_TCP, create_server, close_server
+from network.protocol import (
+    PROTOCOL_NDJSON, PROTOCOL_BINARY, FRAME_SNAPSHOT, FRAME_DELTA, FRAME_HEARTBEAT, FRAME_COMMAND,
+    FEATURE_COMMANDS, choose_protocol, encode_json_frame, encode_ndjson, hello_ack_message,
+    parse_hello, parse_hello_features,
+)
+
 # Constants
 # Point to Standard Debug Build (win-x64)
 HELPER_PATH = Path("src/helper/bin/Debug/net8.0/win-x64/Lufia2AutoTracker.Helper.exe")
 HOST = 'localhost'
 PORT = 65432
+RECV_BUFFER_SIZE = 64 * 1024
+CONNECT_TIMEOUT = 30.0 # Stop the helper if it hasn't connected within this many seconds
+
+
+class _SharedLoop:
+    """
+    One asyncio loop on one daemon thread, shared by every HelperInterface.
+    Extra helpers or sessions add sockets to this loop, not threads.
+    """
+    _lock = threading.Lock()
+    _loop = None
+
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None or cls._loop.is_closed():
+                # On Windows the default loop is the Proactor, which subprocess pipes require
+                cls._loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=cls._loop.run_forever, name="helper-io", daemon=True)
+                thread.start()
+            return cls._loop
+
+
+class _HelperLinkProtocol(asyncio.BufferedProtocol):
+    """
+    One helper connection. asyncio reads straight into our buffers:
+    the 64 KB receive buffer while on NDJSON, and the exact header/body
+    region of the frame buffer once v2 is negotiated.
+    """
+
+    def __init__(self, interface):
+        self.interface = interface
+        self.transport = None
+        self.framer = NdjsonFramer(stats=interface.stats)
+        self.reader = None
+        self._recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._first_frame = True
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.interface._on_connected(self)
+
+    def get_buffer(self, sizehint):
+        if self.reader is not None:
+            return self.reader.get_buffer()
+        return self._recv_view
+
+    def buffer_updated(self, nbytes):
+        self.interface.health.last_rx = time.monotonic()
+        try:
+            if self.reader is not None:
+                frame = self.reader.buffer_updated(nbytes)
+                if frame is not None:
+                    self.interface._process_frame(*frame)
+                return
+
+            for frame in self.framer.feed(self._recv_view[:nbytes]):
+                if self._first_frame:
+                    self._first_frame = False
+                    binary = self.interface._negotiate(self, frame)
+                    self.interface._on_negotiated()
+                    if binary:
+                        self.reader = BinaryFrameReader(stats=self.interface.stats)
+                        for leftover in self.reader.feed(self.framer.take_pending()):
+                            self.interface._process_frame(*leftover)
+                        break
+                    if frame.startswith(b'{"hello"'):
+                        continue # Answered with v1, not a payload
+                self.interface._process_payload(frame)
+        except FrameError as e:
+            logging.error(f"Helper stream desynchronised: {e}. Dropping link.")
+            self.transport.close()
+        except Exception as e:
+            logging.error(f"Client read error: {e}")
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.interface._on_disconnected(self, exc)
+
 
 class HelperInterface:
-    def __init__(self, callback):
+    def __init__(self, callback, host=HOST, port=PORT, loop=None, endpoint=None):
         self.process = None
-        self.server_socket = None
-        self.client_socket = None
         self.running = False
         self.callback = callback # Function to call with parsed JSON data
-        self.thread = None
+        self.stats = LinkStats() # Frame / garble counters for the current link
+        self.dedup = FrameDeduplicator() # Drops byte-identical repeats before decoding
+        self.recorder = None # CaptureWriter while recording
+        # tcp (default), unix or shm - see network/transports.py
+        self.endpoint = endpoint or Endpoint(TRANSPORT_TCP, host, port)
+        self.protocol = PROTOCOL_NDJSON # Negotiated per connection
+        self.features = [] # Optional features from the helper's hello (network/protocol.py)
+        self.last_heartbeat = None
+        self.commands = PendingCommands() # Ids / acks / RTT of commands sent to the helper
+        self.options = None # Last options command; re-sent to every new connection
+
+        # Liveness: heartbeats, dead-peer detection and helper restarts (network/health.py)
+        self.health = LinkHealth()
+        self.state_callback = None # Called with the new LINK_* state, from the I/O thread
+        self.connect_timeout = CONNECT_TIMEOUT
+        self.heartbeat_interval = HEARTBEAT_INTERVAL
+        self.dead_peer_timeout = DEAD_PEER_TIMEOUT
+        self.backoff = Backoff()
+        self._helper_path = None # Set once we launched the helper ourselves, so we can relaunch it
+        self._heartbeat_timer = None
+        self._connected_at = None
+        self._gave_up = False
+
+        # An externally driven loop (e.g. qasync) can be passed in; otherwise the shared I/O thread is used
+        self._loop = loop
+        self._server = None
+        self._link = None # Active _HelperLinkProtocol
+        self._connect_timer = None
+        self._tasks = set()
+        self._atexit_registered = False
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = _SharedLoop.get()
+        return self._loop
+
+    @property
+    def connected(self) -> bool:
+        return self._link is not None
 
     def start(self):
         """Starts the TCP Server and the C# Helper process."""
         if self.running: return
 
         self.running = True
+        self._gave_up = False
+        self.backoff.reset()
         self.start_server()
         self.launch_helper()
 
-    def start_server(self):
-        """Starts the TCP server in a separate thread."""
-        self.thread = threading.Thread(target=self._server_loop, daemon=True)
-        self.thread.start()
+    def start_server(self, timeout=5.0):
+        """Starts listening on the I/O loop. Blocks until bound when called from another thread."""
+        self.running = True
+        future = self._submit(self._start_server())
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logging.error(f"Server setup error: {e}")
 
-    def _server_loop(self):
+    async def _start_server(self):
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.bind((HOST, PORT))
-            self.server_socket.listen(1)
-            logging.info(f"Helper Interface listening on {HOST}:{PORT}")
-            
-            while self.running:
-                try:
-                    self.server_socket.settimeout(1.0)
-                    client, addr = self.server_socket.accept()
-                    logging.info(f"Helper connected from {addr}")
-                    self.client_socket = client
-                    self._handle_client(client)
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    logging.error(f"Server accept error: {e}")
-        except Exception as e:
+            self._server = await create_server(self.loop, self.endpoint, lambda: _HelperLinkProtocol(self))
+        except (OSError, ValueError) as e:
             logging.error(f"Server setup error: {e}")
-        finally:
-            self.stop()
+            self.running = False
+            self._set_state(LINK_FAILED)
+            return
+        logging.info(f"Helper Interface listening on {self.endpoint}")
+        self.health.connects = 0
+        self._set_state(LINK_WAITING)
+        self._arm_connect_timer()
 
-    def _handle_client(self, client):
-        """Reads newline-delimited JSON from the client."""
-        buffer = ""
-        while self.running:
+    def _set_state(self, state: str):
+        if state == self.health.state:
+            return
+        logging.info(f"Helper link: {self.health.state} -> {state}")
+        self.health.state = state
+        if self.state_callback:
             try:
-                data = client.recv(4096)
-                if not data: break
-                
-                buffer += data.decode('utf-8')
-                
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    # Handle multiple JSON objects stuck together if any
-                    # The C# helper sends one JSON object per write. 
-                    # If we use newline checks, we need to ensure C# sends newlines?
-                    # My C# implementation uses JsonSerializer.Serialize -> Write. 
-                    # It DOES NOT explicitly append \n.
-                    # Wait, C# code: _stream.Write(data).
-                    # Issue: If C# doesn't send \n, we stream forever until buffer is huge.
-                    
-                    # Correction: I should update C# to send \n or parse brace counting.
-                    # Or since I am integrating now, I can fix the Python side to handle raw JSON stream?
-                    # Raw JSON stream is hard.
-                    # I will assume I need to update C# to send \n or use a length prefix.
-                    # BUT I just finished C#... 
-                    
-                    # For now, let's try to parse ANY complete JSON object.
-                    self._process_payload(line)
-            except OSError:
-                # Socket closed or error
-                if self.running:
-                    logging.error("Client read error (OSError). Stopping.")
-                break
+                self.state_callback(state)
             except Exception as e:
-                if self.running:
-                     logging.error(f"Client read error: {e}")
-                break
+                logging.error(f"Link state callback failed: {e}")
+
+    def _arm_connect_timer(self):
+        self._cancel_connect_timer()
+        self._connect_timer = self.loop.call_later(self.connect_timeout, self._on_connect_timeout)
+
+    def _cancel_connect_timer(self):
+        if self._connect_timer is not None:
+            self._connect_timer.cancel()
+            self._connect_timer = None
 
-    def _process_payload(self, json_str):
+    def _on_connect_timeout(self):
+        self._connect_timer = None
+        if self.running and self._link is None:
+            logging.info(f"Visual Auto Tracker timed out ({self.connect_timeout:.0f}s). Stopping helper.")
+            self.stop()
+
+    def _on_connected(self, link):
+        if self._link is not None:
+            # Only one helper per interface: a reconnect replaces the stale link
+            logging.info("New helper connection replaces the previous one.")
+            self._link.transport.close()
+        peer = link.transport.get_extra_info("peername")
+        logging.info(f"Helper connected from {peer}")
+        self._link = link
+        self.protocol = PROTOCOL_NDJSON
+        self.features = []
+        self.commands.clear()
+        self.dedup.reset()
+        self._cancel_connect_timer()
+        self.health.connects += 1
+        if self.health.connects > 1:
+            self.health.reconnects += 1
+        self.health.last_rx = self._connected_at = time.monotonic()
+        self._set_state(LINK_CONNECTED)
+
+    def _on_disconnected(self, link, exc):
+        logging.info(f"Helper link closed (protocol v{self.protocol}): {self.stats}, {self.commands.stats}")
+        if self._link is link:
+            self._link = None
+            self._stop_heartbeat()
+            if self.running:
+                self._arm_connect_timer()
+                if self.health.state != LINK_RESTARTING:
+                    self._set_state(LINK_WAITING)
+
+    def _negotiate(self, link, frame: bytes) -> bool:
+        """Answers a hello line. Returns True if the link switches to v2."""
+        if not frame.startswith(b'{"hello"'):
+            return False
         try:
-            # Attempt to parse. If it fails, it might be incomplete.
-            # But the C# helper sends a full object in one go usually.
-            data = json.loads(json_str)
+            hello = loads(frame)
+            offered = parse_hello(hello)
+        except ValueError:
+            offered = None
+        if offered is None:
+            return False
+
+        self.protocol = choose_protocol(offered)
+        self.features = parse_hello_features(hello)
+        link.transport.write(hello_ack_message(self.protocol))
+        logging.info(f"Helper offered protocols {offered} (features {self.features}), using v{self.protocol}.")
+        return self.protocol == PROTOCOL_BINARY
+
+    def _on_negotiated(self):
+        """First frame handled: the helper now knows how we talk, so bring it up to date with the options."""
+        if self.options is not None:
+            self.send_command(self.options)
+        if self.accepts_commands:
+            # Legacy helpers can't be pinged and only send on change: silence is normal for them
+            self._schedule_heartbeat()
+
+    # --- Liveness ---
+
+    def _schedule_heartbeat(self):
+        self._stop_heartbeat()
+        self._heartbeat_timer = self.loop.call_later(self.heartbeat_interval, self._heartbeat_tick)
+
+    def _stop_heartbeat(self):
+        if self._heartbeat_timer is not None:
+            self._heartbeat_timer.cancel()
+            self._heartbeat_timer = None
+
+    def _heartbeat_tick(self):
+        """Runs on the I/O loop every heartbeat_interval while a command-capable helper is connected."""
+        self._heartbeat_timer = None
+        if self._link is None or not self.running:
+            return
+        now = time.monotonic()
+        silence = self.health.silence(now)
+        if silence > self.dead_peer_timeout:
+            self.health.dead_peer_drops += 1
+            logging.warning(f"Helper silent for {silence:.1f}s (timeout {self.dead_peer_timeout:.0f}s). Dropping link.")
+            self._restart_helper("dead peer")
+            return
+
+        if silence > UNRESPONSIVE_AFTER * self.heartbeat_interval:
+            self._set_state(LINK_UNRESPONSIVE)
+        else:
+            self._set_state(LINK_CONNECTED)
+            if self.backoff.attempts and now - self._connected_at > HEALTHY_AFTER:
+                self.backoff.reset()
+
+        if self.send_command({"cmd": CMD_PING}):
+            self.health.heartbeats_sent += 1
+        self._schedule_heartbeat()
+
+    def _restart_helper(self, reason: str):
+        """Drops the link and relaunches the helper after the next backoff delay. I/O loop only."""
+        self._stop_heartbeat()
+        link, self._link = self._link, None
+        if link is not None:
+            link.transport.abort() # A hung peer won't drain a graceful close
+        if not self.running:
+            return
+        if self._helper_path is None:
+            # Started by hand (or a stand-in): nothing to relaunch, just wait for it to come back
+            self._set_state(LINK_WAITING)
+            self._arm_connect_timer()
+            return
+
+        delay = self.backoff.next_delay()
+        if delay is None:
+            logging.error(f"Helper failed {self.backoff.attempts} times in a row ({reason}). Giving up.")
+            self._gave_up = True
+            self.stop()
+            return
+        self.health.restarts += 1
+        self._set_state(LINK_RESTARTING)
+        logging.warning(f"Restarting helper in {delay:.1f}s ({reason}, attempt {self.backoff.attempts})")
+        self._spawn(self._relaunch(delay))
+
+    async def _relaunch(self, delay: float):
+        self._cancel_connect_timer()
+        await self._terminate_process()
+        await asyncio.sleep(delay)
+        if not self.running:
+            return
+        await self._launch_helper(self._helper_path)
+        self._set_state(LINK_WAITING)
+        self._arm_connect_timer()
+
+    async def _watch_process(self, process):
+        """A helper that exits on its own (crash) is relaunched like a dead peer."""
+        returncode = await process.wait()
+        if self.running and self.process is process:
+            self.process = None
+            self._restart_helper(f"helper exited with code {returncode}")
+
+    def metrics(self) -> dict:
+        """Link metrics for display / logging: liveness, commands and framing counters."""
+        return {
+            "health": self.health.as_dict(),
+            "commands": self.commands.stats.as_dict(),
+            "link": self.stats.as_dict(),
+            "dedup": self.dedup.stats.as_dict(),
+        }
+
+    @property
+    def accepts_commands(self) -> bool:
+        """True if the helper understands JSON commands (and acks them), not just the SYNC keyword."""
+        return self.protocol == PROTOCOL_BINARY or FEATURE_COMMANDS in self.features
+
+    def start_recording(self, path):
+        """Tees every frame received from the helper into a capture file (see core/replay.py)."""
+        self.stop_recording()
+        self.recorder = CaptureWriter(path)
+        if not self._atexit_registered:
+            atexit.register(self._stop_blocking)
+            self._atexit_registered = True
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def _process_frame(self, frame_type: int, body):
+        """Dispatches a single v2 frame."""
+        if self.recorder is not None:
+            self.recorder.write(frame_type, body)
+        if frame_type == FRAME_HEARTBEAT:
+            self.last_heartbeat = time.monotonic()
+        elif frame_type in (FRAME_SNAPSHOT, FRAME_DELTA):
+            if self.dedup.is_repeat(body):
+                return
+            data = self._decode(bytes(body))
+            if data is None:
+                return
+            if frame_type == FRAME_DELTA:
+                # Same shape as a v1 delta line, so consumers don't care about the protocol
+                data.setdefault("type", "delta")
             if self.callback:
                 self.callback(data)
-        except json.JSONDecodeError:
-            pass # logging.warning(f"Incomplete JSON: {json_str[:20]}...")
+        elif frame_type == FRAME_COMMAND:
+            self._handle_ack(body)
+        else:
+            self.stats.garbled_frames += 1
+            logging.debug(f"Unknown helper frame type 0x{frame_type:02X} ({len(body)} bytes)")
+
+    def _process_payload(self, frame: bytes):
+        if is_ack(frame):
+            # Control traffic, not game state: keep it out of the capture and the decoder
+            self._handle_ack(frame)
+            return
+        if self.recorder is not None:
+            self.recorder.write(CAPTURE_NDJSON, frame)
+        if self.dedup.is_repeat(frame):
+            return
+        data = self._decode(frame)
+        if data is not None and self.callback:
+            self.callback(data)
+
+    def _handle_ack(self, frame):
+        try:
+            data = loads(bytes(frame))
+        except ValueError:
+            self.stats.garbled_frames += 1
+            logging.debug(f"Garbled helper command frame: {bytes(frame[:40])!r}")
+            return
+        if isinstance(data, dict) and "ack" in data:
+            if self.commands.acknowledge(data) == CMD_PING:
+                self.health.record_rtt(self.commands.stats.last_rtt_ms)
+        else:
+            logging.info(f"Helper command: {bytes(frame)[:80]!r}")
+
+    def _decode(self, frame: bytes):
+        """Parses and validates one JSON frame (core/schema.py). Counts and drops anything that isn't a payload."""
+        try:
+            return decode_payload(frame)
+        except PayloadSchemaError as e:
+            self.stats.garbled_frames += 1
+            logging.debug(f"Helper frame failed validation: {e}")
+        except ValueError: # JSONDecodeError, UnicodeDecodeError
+            self.stats.garbled_frames += 1
+            logging.debug(f"Garbled helper frame ({len(frame)} bytes): {bytes(frame[:40])!r}...")
+        return None
 
     def launch_helper(self):
         """Launches the C# Helper executable."""
-        import sys
         if getattr(sys, 'frozen', False):
             # PyInstaller Temp Directory
             base_path = Path(sys._MEIPASS)
@@ -120,118 +446,164 @@ class HelperInterface:
         if not abs_path.exists():
             logging.error(f"Helper not found at {abs_path}")
             return
+        if self.endpoint.kind != TRANSPORT_TCP:
+            logging.warning(f"{HELPER_PATH.name} only connects over TCP; it won't find the tracker on {self.endpoint}.")
+
+        self._submit(self._launch_helper(abs_path))
 
+    async def _launch_helper(self, abs_path: Path):
         try:
-            # Popen with pipes to capture output
-            self.process = subprocess.Popen(
-                [str(abs_path)], 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                text=True,
-                bufsize=1 # Line buffered
+            self.process = await asyncio.create_subprocess_exec(
+                str(abs_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
             )
-            logging.info(f"Started Helper Process (PID: {self.process.pid})")
-            atexit.register(self.stop)
-            
-            # Start threads to read stdout/stderr to prevent blocking
-            self.stdout_thread = threading.Thread(target=self._read_output, args=(self.process.stdout, "HELPER"), daemon=True)
-            self.stderr_thread = threading.Thread(target=self._read_output, args=(self.process.stderr, "HELPER_ERR"), daemon=True)
-            self.stdout_thread.start()
-            self.stderr_thread.start()
-            
         except Exception as e:
             logging.error(f"Failed to launch helper: {e}")
+            return
+
+        logging.info(f"Started Helper Process (PID: {self.process.pid})")
+        self._helper_path = abs_path
+        if not self._atexit_registered:
+            atexit.register(self._stop_blocking)
+            self._atexit_registered = True
+
+        # Pipe readers are tasks on the same loop, not threads
+        self._spawn(self._read_output(self.process.stdout, "HELPER"))
+        self._spawn(self._read_output(self.process.stderr, "HELPER_ERR"))
+        self._spawn(self._watch_process(self.process))
 
-    def _read_output(self, stream, prefix):
+    async def _read_output(self, stream, prefix):
         """Reads lines from a stream and logs them."""
         try:
-            for line in iter(stream.readline, ''):
+            while True:
+                line = await stream.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8", "replace").strip()
                 if line:
-                    logging.info(f"[{prefix}] {line.strip()}")
+                    logging.info(f"[{prefix}] {line}")
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logging.error(f"Error reading {prefix}: {e}")
-        finally:
-            stream.close()
 
     def stop(self):
+        """Stops server, link and helper process. Returns immediately; teardown runs on the I/O loop."""
         self.running = False
-        try:
-            if self.client_socket: 
-                self.client_socket.shutdown(socket.SHUT_RDWR)
-                self.client_socket.close()
-        except: pass
-        
-        try:
-            if self.server_socket: 
-                self.server_socket.close()
-        except: pass
-        
-        if self.process: 
+        self._submit(self._shutdown())
+
+    def _stop_blocking(self):
+        """atexit hook: make sure the helper process is gone (and the capture flushed) before the interpreter exits."""
+        self.running = False
+        self.stop_recording()
+        future = self._submit(self._shutdown())
+        if future is not None:
+            try:
+                future.result(2.0)
+            except Exception:
+                pass
+
+    async def _shutdown(self):
+        self._cancel_connect_timer()
+        self._stop_heartbeat()
+        if self._server is not None:
+            close_server(self._server, self.endpoint)
+            self._server = None
+        if self._link is not None:
+            self._link.transport.close()
+            self._link = None
+
+        await self._terminate_process()
+        self._set_state(LINK_FAILED if self._gave_up else LINK_STOPPED)
+
+        current = asyncio.current_task()
+        for task in list(self._tasks):
+            if task is not current:
+                task.cancel()
+
+    async def _terminate_process(self):
+        process, self.process = self.process, None
+        if process is not None and process.returncode is None:
             try:
                 logging.info("Terminating helper process...")
-                self.process.terminate()
+                process.terminate()
                 try:
-                    self.process.wait(timeout=1)
-                except subprocess.TimeoutExpired:
+                    await asyncio.wait_for(process.wait(), timeout=1)
+                except asyncio.TimeoutError:
                     logging.warning("Helper process did not terminate. Force killing...")
-                    self.process.kill()
+                    process.kill()
+            except ProcessLookupError:
+                pass
             except Exception as e:
                 logging.error(f"Error stopping helper: {e}")
-            self.process = None
 
-    def _server_loop(self):
+    def _submit(self, coro):
+        """
+        Runs `coro` on the I/O loop. From another thread this returns a
+        concurrent Future; on the loop thread itself it schedules a task.
+        """
+        loop = self.loop
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.bind((HOST, PORT))
-            self.server_socket.listen(1)
-            self.server_socket.settimeout(1.0)
-            logging.info(f"Helper Interface listening on {HOST}:{PORT}")
-            
-            last_connection_time = time.time()
-            
-            while self.running:
-                try:
-                    # Check for 30s timeout on connection waiting
-                    if self.client_socket is None and (time.time() - last_connection_time > 30):
-                        logging.info("Visual Auto Tracker timed out (30s). Stopping helper.")
-                        # How to stop from here? 
-                        # We are in a thread. We should signal main thread or just self.stop()
-                        self.stop() 
-                        # We also need to notify UI? 
-                        # HelperInterface has no link to UI signals directly except callback. 
-                        # Maybe callback with special status?
-                        break
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._spawn(coro)
+            return None
+        return asyncio.run_coroutine_threadsafe(coro, loop)
 
-                    client, addr = self.server_socket.accept()
-                    logging.info(f"Helper connected from {addr}")
-                    self.client_socket = client
-                    self._handle_client(client)
-                    
-                    # After handle_client returns (connection closed)
-                    self.client_socket = None
-                    last_connection_time = time.time()
-                    
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    logging.error(f"Server accept error: {e}")
-                    if not self.running: break
-                    
-        except Exception as e:
-            logging.error(f"Server setup error: {e}")
-        finally:
-            self.stop()
+    def _spawn(self, coro):
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
 
-    def request_sync(self):
+    def send_command(self, command: dict) -> bool:
+        """
+        Sends a control message (network/commands.py) to the connected helper in the negotiated protocol.
+        Returns False if there is no helper or it can't understand the command.
+        """
+        link = self._link
+        if link is None:
+            return False
+        if self.accepts_commands:
+            command = self.commands.track(command)
+            if self.protocol == PROTOCOL_BINARY:
+                data = encode_json_frame(FRAME_COMMAND, command)
+            else:
+                data = encode_ndjson(command)
+        elif command.get("cmd") == CMD_SYNC:
+            # Legacy helpers only understand the bare keyword
+            data = b"SYNC\n"
+        else:
+            self.commands.stats.unsupported += 1
+            logging.debug(f"Helper doesn't take commands, not sending {command.get('cmd')}")
+            return False
+        if command.get("cmd") in (CMD_SYNC, CMD_OPTIONS):
+            # The full state the helper sends in reply must get through even if unchanged.
+            # The I/O thread owns the deduplicator: reset it there, ahead of the write.
+            self.loop.call_soon_threadsafe(self.dedup.reset)
+        # Transports aren't thread-safe: hand the write to the loop
+        self.loop.call_soon_threadsafe(link.transport.write, data)
+        return True
+
+    def set_options(self, categories: dict, poll_ms: dict = None) -> bool:
+        """
+        Pushes the tracking category mask and poll rates to the helper, so it stops
+        reading what the tracker would throw away. Kept and re-sent on reconnect.
+        """
+        self.options = options_command(categories, poll_ms)
+        return self.send_command(self.options)
+
+    def request_sync(self, categories=None):
         """Sends a SYNC command to the connected C# helper to force a full state refresh."""
-        if self.client_socket:
+        if self._link is not None:
             try:
-                self.client_socket.sendall(b"SYNC\n")
+                self.send_command(sync_command(categories))
                 logging.info("Sent SYNC request to Tracker Helper.")
             except Exception as e:
                 logging.error(f"Failed to send SYNC request: {e}")
         else:
             logging.warning("Cannot send SYNC request: Not connected to Tracker Helper.")
-
-
@@ -0,0 +1,84 @@
+"""
+Undo / redo of manual overrides (StateManager.undo / redo).
+
+Each manual action (a location dot, an item toggle, a character assignment,
+a shop item) is recorded as the ops that redo it and the ops that undo it,
+in the journal's op format (core/journal.py): the old and new value of each
+key it changed, as its setters reported them (core/state_delta.py
+ChangeLog), no copies of the state. The history is bounded by MAX_ENTRIES
+and by MAX_BYTES of ops (their JSON size); the oldest entries go first.
+"""
+import json
+from collections import deque
+from typing import List, Optional
+
+MAX_ENTRIES = 200
+MAX_BYTES = 256 * 1024
+
+
+class HistoryEntry:
+    __slots__ = ("label", "redo_ops", "undo_ops", "size")
+
+    def __init__(self, label: str, redo_ops: List[dict], undo_ops: List[dict]):
+        self.label = label
+        self.redo_ops = redo_ops
+        self.undo_ops = undo_ops
+        self.size = len(json.dumps(redo_ops, separators=(",", ":"))) + len(json.dumps(undo_ops, separators=(",", ":")))
+
+    def __repr__(self):
+        return f"HistoryEntry({self.label!r}, {len(self.redo_ops)} ops, {self.size} bytes)"
+
+
+class UndoHistory:
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self.bytes = 0 # Ops held by both stacks
+        self.evicted = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, entry: HistoryEntry):
+        """A new action: it can be undone, and what was undone before can't be redone anymore."""
+        for dropped in self._redo:
+            self.bytes -= dropped.size
+        self._redo.clear()
+        self._undo.append(entry)
+        self.bytes += entry.size
+        while self._undo and (len(self._undo) > self.max_entries or self.bytes > self.max_bytes):
+            self.bytes -= self._undo.popleft().size
+            self.evicted += 1
+
+    def undo(self) -> Optional[HistoryEntry]:
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry
+
+    def redo(self) -> Optional[HistoryEntry]:
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return entry
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    def __repr__(self):
+        return (f"UndoHistory({len(self._undo)} undo, {len(self._redo)} redo, {self.bytes:,} bytes, "
+                f"{self.evicted} evicted)")
@@ -0,0 +1,143 @@
+"""
+Precompiled inventory / scenario-key decoder for raw WRAM bytes
+(core/memory_reader.py).
+
+Every tool and scenario item gets a bit. Decoding a poll returns one int
+bitset of obtained items, built from lookup tables compiled once:
+
+    inventory  16-bit item id -> item bits, looked up for every 2-byte window
+               (the helper matches an id at any offset, not just even ones)
+    scenario   one 256-entry table per scenario byte: byte value -> bits of the
+               items whose binary mask shares a set bit with it
+
+Backends:
+    numpy  - all windows of the range in one vectorized gather + OR reduce
+    array  - array('H') views of the range, intersected with the known ids
+"""
+import sys
+from array import array
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+BACKENDS = ("numpy", "array")
+
+def available_backends() -> List[str]:
+    return [name for name in BACKENDS if name != "numpy" or numpy is not None]
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def _mask(binary: str) -> int:
+    """'0001 0000 0000 0000 0000 0000' -> int"""
+    return int(binary.replace(" ", ""), 2)
+
+
+class ItemDecoder:
+    """
+    Compiled from tool_items.json and scenario_items.json.
+    decode() -> bitset; names() turns a bitset back into item names.
+    """
+
+    def __init__(self, tool_items: Dict[str, dict], scenario_items: Dict[str, dict],
+                 scenario_size: int = 3, backend: Optional[str] = None):
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in available_backends():
+            raise ValueError(f"Decoder backend '{self.backend}' is not installed")
+
+        self.items = list(tool_items) + list(scenario_items) # Bit i is items[i]
+        if self.backend == "numpy" and len(self.items) > 64:
+            self.backend = "array" # The id table holds uint64 bitsets
+        self.bits = {name: 1 << i for i, name in enumerate(self.items)}
+        self.tool_bits = reduce(or_, (self.bits[name] for name in tool_items), 0)
+        self.scenario_bits = reduce(or_, (self.bits[name] for name in scenario_items), 0)
+
+        # Item id -> bits ("normal" tools), scenario mask -> bits ("special" tools and scenario keys)
+        self.ids: Dict[int, int] = {}
+        masks = []
+        for name, item in tool_items.items():
+            if item.get("type") == "normal":
+                item_id = int(item["obtained_value"], 16)
+                self.ids[item_id] = self.ids.get(item_id, 0) | self.bits[name]
+            elif item.get("type") == "special":
+                masks.append((_mask(item["obtained_value"]), self.bits[name]))
+        for name, item in scenario_items.items():
+            masks.append((_mask(item["obtained_value"]), self.bits[name]))
+
+        # Scenario: byte k of the little-endian value -> table k
+        self.scenario_size = scenario_size
+        self.scenario_tables = []
+        for k in range(scenario_size):
+            table = [0] * 256
+            for mask, bits in masks:
+                byte_mask = (mask >> (8 * k)) & 0xFF
+                if byte_mask:
+                    for value in range(256):
+                        if value & byte_mask:
+                            table[value] |= bits
+            self.scenario_tables.append(table)
+
+        if self.backend == "numpy":
+            self._id_table = numpy.zeros(1 << 16, dtype=numpy.uint64)
+            for item_id, bits in self.ids.items():
+                self._id_table[item_id] = bits
+            self.decode_inventory = self._inventory_numpy
+        else:
+            self._id_set = frozenset(self.ids)
+            self._swap = sys.byteorder != "little"
+            self.decode_inventory = self._inventory_array
+
+    def decode(self, inventory, scenario) -> int:
+        """Bitset of obtained items from the raw inventory and scenario bytes."""
+        return self.decode_inventory(inventory) | self.decode_scenario(scenario)
+
+    def decode_scenario(self, scenario) -> int:
+        bits = 0
+        for table, value in zip(self.scenario_tables, scenario):
+            bits |= table[value]
+        return bits
+
+    def _inventory_numpy(self, data) -> int:
+        if len(data) < 2:
+            return 0
+        # Every 2-byte window at once: a zero-copy little-endian u16 view with a 1-byte stride
+        windows = numpy.ndarray(shape=(len(data) - 1,), dtype="<u2", buffer=data, strides=(1,))
+        return int(numpy.bitwise_or.reduce(self._id_table.take(windows)))
+
+    def _inventory_array(self, data) -> int:
+        size = len(data)
+        even = array("H", data[:size & ~1])
+        odd = array("H", data[1:1 + ((size - 1) & ~1)]) if size > 2 else array("H")
+        if self._swap:
+            even.byteswap()
+            odd.byteswap()
+        found = self._id_set.intersection(even) | self._id_set.intersection(odd)
+        bits = 0
+        for item_id in found:
+            bits |= self.ids[item_id]
+        return bits
+
+    def names(self, bits: int) -> List[str]:
+        """Item names in bit order (tool_items.json, then scenario_items.json)."""
+        names = []
+        items = self.items
+        while bits:
+            low = bits & -bits
+            names.append(items[low.bit_length() - 1])
+            bits ^= low
+        return names
+
+    def diff(self, old: int, new: int):
+        """(added, removed) item names between two decoded bitsets."""
+        changed = old ^ new
+        if not changed:
+            return [], []
+        return self.names(changed & new), self.names(changed & old)
+
+    def __repr__(self):
+        return f"ItemDecoder({len(self.items)} items, {len(self.ids)} ids, backend={self.backend})"
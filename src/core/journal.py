@@ -0,0 +1,218 @@
+"""
+Append-only autosave for StateManager.
+
+The tracker state is a document of sections, the same one save_state()
+writes (StateManager._document()). After every batch (payloads, overrides,
+assignments, shop items, hints) StateManager hands over the ops of the keys
+and sections the batch changed (core/state_delta.py ChangeLog), appended as
+one NDJSON line:
+
+    {"n": 42, "ops": [{"s": "locations", "k": "Foomy Woods", "v": "cleared"},
+                      {"s": "inventory_overrides", "k": "Bomb"},          # no "v": removed
+                      {"s": "hints", "v": "..."}]}                        # no "k": whole section
+
+Every SNAPSHOT_EVERY entries (or MAX_LOG_BYTES of log) the full document is
+written as a compact snapshot (atomically, os.replace) and the log starts
+over. Recovery is snapshot + the log entries after its "n", so a crash
+between the two steps replays nothing twice, and a torn last line is skipped.
+"""
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.constants import STATE_DIR
+
+SNAPSHOT_FILE = "state.snapshot.json"
+LOG_FILE = "state.journal"
+SNAPSHOT_EVERY = 500 # Entries between snapshots
+MAX_LOG_BYTES = 1 << 20
+
+# Sections keyed by name: journaled per key. Everything else is replaced whole.
+KEYED_SECTIONS = ("inventory_overrides", "location_overrides", "character_locations",
+                  "inventory", "locations", "characters")
+# Every section of the document, in the order save_state writes them
+DOCUMENT_SECTIONS = KEYED_SECTIONS + ("active_party", "obtained_capsules", "capsule_mapping", "shop_items", "hints")
+
+
+def section_ops(name: str, before, after) -> List[dict]:
+    """Ops turning section `name` from `before` into `after` (both plain JSON values)."""
+    if name not in KEYED_SECTIONS or not isinstance(before, dict) or not isinstance(after, dict):
+        return [{"s": name, "v": after}]
+    ops = [{"s": name, "k": key} for key in before if key not in after]
+    ops += [{"s": name, "k": key, "v": value} for key, value in after.items()
+            if key not in before or before[key] != value]
+    return ops
+
+
+def key_op(name: str, key: str, value) -> dict:
+    """Op setting `key` of keyed section `name` to `value`, or removing it if that is None."""
+    return {"s": name, "k": key} if value is None else {"s": name, "k": key, "v": value}
+
+
+def apply_ops(document: dict, ops: List[dict]):
+    for op in ops:
+        name = op["s"]
+        if "k" not in op:
+            document[name] = op.get("v")
+        elif "v" in op:
+            document.setdefault(name, {})[op["k"]] = op["v"]
+        else:
+            document.get(name, {}).pop(op["k"], None)
+
+
+class JournalStats:
+    def __init__(self):
+        self.entries = 0        # Lines appended this run
+        self.ops = 0
+        self.bytes_written = 0  # Log bytes (snapshots not included)
+        self.snapshots = 0
+        self.recovered = 0      # Log entries replayed on startup
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return (f"JournalStats(entries={self.entries}, ops={self.ops}, bytes={self.bytes_written:,}, "
+                f"snapshots={self.snapshots}, recovered={self.recovered})")
+
+
+class StateJournal:
+    """
+    recover() once on startup, record(document) once after that, append(ops)
+    for each change. `document` maps section -> JSON value; record compares
+    every section against what was journaled, append takes the ops as they are.
+    """
+
+    def __init__(self, directory=None, snapshot_every: int = SNAPSHOT_EVERY, max_log_bytes: int = MAX_LOG_BYTES):
+        self.directory = Path(directory) if directory else STATE_DIR / "journal"
+        self.snapshot_every = snapshot_every
+        self.max_log_bytes = max_log_bytes
+        self.stats = JournalStats()
+        self._written: Dict[str, object] = {} # section -> copy as last journaled
+        self._seq = 0             # "n" of the last entry
+        self._since_snapshot = 0
+        self._log = None
+        self._log_bytes = 0
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.directory / SNAPSHOT_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.directory / LOG_FILE
+
+    def recover(self) -> Optional[dict]:
+        """The journaled document (snapshot + log tail), or None if there is none."""
+        document, base = {}, 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            document, base = snapshot.get("state") or {}, snapshot.get("n", 0)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Journal: unreadable snapshot {self.snapshot_path}: {e}")
+
+        self._seq = base
+        found = bool(document)
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Journal: skipping torn entry at line {line_number}")
+                        continue
+                    if entry.get("n", 0) <= base:
+                        continue # Already in the snapshot
+                    apply_ops(document, entry.get("ops") or [])
+                    self._seq = entry["n"]
+                    self._since_snapshot += 1
+                    self.stats.recovered += 1
+                    found = True
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Journal: can't read {self.log_path}: {e}")
+
+        self._written = copy.deepcopy(document)
+        if found:
+            logging.info(f"Journal: recovered state up to entry {self._seq} ({self.stats.recovered} from the log)")
+        return document if found else None
+
+    def record(self, document: dict) -> int:
+        """Appends whatever in `document` differs from what was journaled. Returns the number of ops written."""
+        ops = []
+        for name, value in document.items():
+            if name not in self._written or self._written[name] != value:
+                ops += section_ops(name, self._written.get(name), copy.deepcopy(value))
+        return self.append(ops)
+
+    def append(self, ops: List[dict]) -> int:
+        """Appends `ops` as one entry (none if there are no ops). Returns the number of ops written."""
+        if not ops:
+            return 0
+        apply_ops(self._written, ops) # Kept for the snapshot; ops are not changed after they are handed in
+
+        self._seq += 1
+        line = json.dumps({"n": self._seq, "ops": ops}, separators=(",", ":")) + "\n"
+        try:
+            if self._log is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._log = open(self.log_path, "a", encoding="utf-8")
+                self._log_bytes = self._log.tell()
+                if self._log_bytes and not self._ends_with_newline():
+                    line = "\n" + line # Keep a torn last entry (crash mid-write) off this one
+            self._log.write(line)
+            self._log.flush() # In the OS by the time the GUI moves on: survives a crash of the tracker
+        except OSError as e:
+            logging.warning(f"Journal: can't append to {self.log_path}: {e}")
+            return 0
+        self._log_bytes += len(line)
+        self._since_snapshot += 1
+        self.stats.entries += 1
+        self.stats.ops += len(ops)
+        self.stats.bytes_written += len(line)
+
+        if self._since_snapshot >= self.snapshot_every or self._log_bytes >= self.max_log_bytes:
+            self.compact()
+        return len(ops)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.log_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def compact(self):
+        """Writes the journaled document as the snapshot and starts an empty log."""
+        snapshot = json.dumps({"n": self._seq, "state": self._written}, separators=(",", ":"))
+        tmp = self.snapshot_path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # Entries up to n are in the snapshot now; until this truncate, recover() skips them
+            if self._log is not None:
+                self._log.close()
+            self._log = open(self.log_path, "w", encoding="utf-8")
+        except OSError as e:
+            logging.warning(f"Journal: snapshot failed: {e}")
+            return
+        self._log_bytes = 0
+        self._since_snapshot = 0
+        self.stats.snapshots += 1
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __repr__(self):
+        return f"StateJournal({self.directory}, entry {self._seq}, {self.stats})"
@@ -1,6 +1,7 @@
 import logging
-from typing import Dict, Set, Any
+from typing import Dict, List, Set, Any
 from core.data_loader import DataLoader
+from core.registry import Registry
 from utils.constants import ALWAYS_ACCESSIBLE_LOCATIONS
 
 class LogicEngine:
@@ -13,6 +14,27 @@ class LogicEngine:
     def __init__(self, data_loader: DataLoader):
         self._locations_logic = data_loader.get_locations_logic()
         self._cities = data_loader.get_cities()
+        # Dense item / location IDs, shared with StateManager (core/registry.py)
+        self.registry = Registry.from_data(data_loader)
+        
+        # Rules compiled to item bitsets: a location is accessible if one of its masks is fully obtained
+        self._rule_masks: Dict[str, List[int]] = {}
+        for location in set(self._locations_logic.keys()) | set(self._cities.keys()):
+            self._rule_masks[location] = self._compile_rules(location)
+        self._last_accessibility = None # (obtained bits, map)
+        
+    def _compile_rules(self, location: str) -> List[int]:
+        """Same outcome as _check_location: [0] is always accessible, [] never."""
+        if location in ALWAYS_ACCESSIBLE_LOCATIONS:
+            return [0]
+        logic = self._locations_logic.get(location)
+        if logic is None:
+            return [0] if location in self._cities else []
+        access_rules = logic.get("access_rules", [])
+        if not access_rules:
+            return [0]
+        items = self.registry.items
+        return [items.mask(item.strip() for item in rule.split(',')) for rule in access_rules]
         
     def calculate_accessibility(self, inventory: Dict[str, bool]) -> Dict[str, bool]:
         """
@@ -20,17 +42,20 @@ class LogicEngine:
         Input: inventory dict {item_name: bool}
         Output: accessibility dict {location_name: bool}
         """
-        # Convert inventory dict to a set of obtained items for faster lookup
-        obtained_items_set = {item for item, obtained in inventory.items() if obtained}
-        
-        accessibility_map = {}
-        # Iterate over both Logic locations AND Cities (which might be missing from logic)
-        all_relevant_locations = set(self._locations_logic.keys()) | set(self._cities.keys())
-        
-        for location in all_relevant_locations:
-            is_accessible = self._check_location(location, obtained_items_set)
-            accessibility_map[location] = is_accessible
-            
+        obtained = self.registry.items.mask(item for item, obtained in inventory.items() if obtained)
+        return self.calculate_accessibility_bits(obtained)
+
+    def calculate_accessibility_bits(self, obtained: int) -> Dict[str, bool]:
+        """
+        calculate_accessibility for a bitset of obtained items (StateManager.inventory_bits).
+        The map of the last call is reused while the inventory stays the same: don't modify it.
+        """
+        if self._last_accessibility is not None and self._last_accessibility[0] == obtained:
+            return self._last_accessibility[1]
+        missing = ~obtained
+        accessibility_map = {location: any(not mask & missing for mask in masks)
+                             for location, masks in self._rule_masks.items()}
+        self._last_accessibility = (obtained, accessibility_map)
         return accessibility_map
 
     def get_missing_requirements(self, location, inventory):
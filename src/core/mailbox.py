@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Dict, List
+
+from .payloads import is_delta, merge_payloads
+
+
+class MailboxStats:
+    """Counters describing how much backlog the mailbox absorbed."""
+
+    def __init__(self):
+        self.posted = 0     # Payloads handed in by the helper thread
+        self.merged = 0     # Payloads folded into an already pending one
+        self.dropped = 0    # Pending payloads fully superseded by a newer one
+        self.wakeups = 0    # Times the consumer had to be woken
+        self.delivered = 0  # Payloads handed to the consumer after merging
+        self.max_depth = 0  # Largest number of unmergeable payloads pending at once
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v}" for k, v in vars(self).items())
+        return f"MailboxStats({fields})"
+
+
+class PayloadMailbox:
+    """
+    Latest-wins hand-off between the helper thread and the Qt main thread.
+
+    The producer `post()`s every decoded payload; while the consumer hasn't
+    drained yet, new payloads are merged into the pending one per field
+    (see payloads.merge_payloads). `post()` returns True only when the
+    mailbox goes from empty to non-empty, so the consumer is woken at most
+    once per drain no matter how fast the helper sends.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self.stats = MailboxStats()
+
+    def post(self, payload: Dict[str, Any]) -> bool:
+        """Adds a payload. Returns True if the consumer needs a wake-up."""
+        with self._lock:
+            self.stats.posted += 1
+            if not self._pending:
+                self._pending.append(payload)
+                self.stats.wakeups += 1
+                return True
+
+            last = self._pending[-1]
+            # A snapshot whose every field is overwritten by the newer one carried nothing we'll use
+            superseded = not is_delta(last) and not is_delta(payload) and all(
+                payload.get(key) is not None for key, value in last.items() if value is not None
+            )
+            merged = merge_payloads(last, payload)
+            if merged is None:
+                # Can't be expressed as one payload, keep both in order
+                self._pending.append(payload)
+                self.stats.max_depth = max(self.stats.max_depth, len(self._pending))
+            else:
+                self._pending[-1] = merged
+                self.stats.merged += 1
+                if superseded:
+                    self.stats.dropped += 1
+            return False
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Takes everything pending (usually a single merged payload)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self.stats.delivered += len(pending)
+            return pending
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
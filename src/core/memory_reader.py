@@ -0,0 +1,616 @@
+"""
+Native Linux backend for auto tracking: reads the emulator's memory
+directly with process_vm_readv (core/process_memory.py) instead of going
+through the C# helper, its subprocess and its socket.
+
+Addresses come from data/emulator_addresses.json, exactly like the helper's
+config fallback (helper/Program.cs): every address is relative to the base
+of the emulator module, except the ROM pointer at pointer_base_address,
+which is absolute. Decoding mirrors helper/Core/DataReaders.cs, so the
+payload is the same GameState dict StateManager.process_auto_update consumes.
+
+Static ROM data (spoiler log, capsule sprites, shops) is read once per seed
+and kept in core/seed_cache.py; payloads then carry its "seed_hash" instead.
+Everything else is read per region on the schedule of core/poll_scheduler.py.
+"""
+import copy
+import json
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.constants import DATA_DIR
+from .payloads import delta_is_empty, make_delta
+from .dungeon_flags import DungeonFlagTable
+from .item_decoder import ItemDecoder
+from .poll_scheduler import PollScheduler
+from .process_memory import ProcessMemory, ProcessMemoryError, find_module_base
+from .read_plan import DEFAULT_GAP, ReadPlan
+from .seed_cache import SeedCache, SeedData, default_cache, seed_hash
+
+EMULATOR_ADDRESSES = "emulator_addresses.json"
+SHOP_ADDRESSES = "shop_addresses.json"
+SHOP_DATA = "shop_data.json"
+POLL_INTERVAL = 0.1 # The helper's main loop tick (PollScheduler.fixed for a single-rate reader)
+SEED_READ_ATTEMPTS = 10 # Per ROM pointer value, while the ROM reads as empty
+SPOILER_LOG_MARKER = b"ITEM LOCATIONS"
+
+CHARACTER_IDS = {0x00: "Maxim", 0x01: "Selan", 0x02: "Guy", 0x03: "Artea", 0x04: "Tia", 0x05: "Dekar", 0x06: "Lexis"}
+CAPSULE_NAMES = ["Jelze", "Flash", "Gusto", "Zeppy", "Darbi", "Sully", "Blaze"] # Capsule slot order
+CAPSULE_SPRITE_COUNT = 7
+CAPSULE_SPRITE_STRIDE = 10
+TRANSPORT_SHIP = 0xFF
+SHOP_SPELLS = "spell" # 1-byte spell ids; the other shop categories hold 2-byte item ids
+SHOP_END = 0xFF # Terminates a shop list (0xFF / 0xFFFF)
+
+# Set fields decoded as bitsets: their deltas come from XOR-ing the last two reads
+BITSET_FIELDS = ("inventory", "scenario", "cleared_locations")
+
+# Poll region (core/poll_scheduler.py) -> read plan fields, by name prefix
+REGION_FIELDS = {
+    "pos": ("transport", "walk_", "ship_"),
+    "items": ("inventory", "scenario", "gold"),
+    "party": ("character_", "capsules"),
+    "dungeons": ("dungeon_flags",),
+    "rom": ("rom_pointer",),
+}
+
+
+def field_region(name: str) -> Optional[str]:
+    return next((region for region, prefixes in REGION_FIELDS.items() if name.startswith(prefixes)), None)
+
+
+def _address(value) -> Optional[int]:
+    """'0xA32D9E' -> int. Missing or placeholder ("0x") addresses are None."""
+    if not value or value == "0x":
+        return None
+    return int(value, 16)
+
+
+def _load_json(name: str):
+    with open(DATA_DIR / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# EmulatorProfile attributes holding one WRAM address (module relative)
+WRAM_ADDRESSES = ("gold", "capsule_start", "capsule_end", "inventory_start", "inventory_end", "scenario_start",
+                  "scenario_end", "map_address", "dungeon_flag_start", "dungeon_flag_end", "transport_flag")
+
+
+class EmulatorProfile:
+    """One entry of emulator_addresses.json (see helper/Core/ConfigLoader.cs)."""
+
+    def __init__(self, module: str, config: dict):
+        self.module = module # Executable the addresses are relative to, e.g. "snes9x-x64.exe"
+        self.name = config.get("name", module)
+        self.gold = _address(config.get("gold_address"))
+        self.character_slots = [_address(a) for a in config.get("character_slots", [])]
+        self.capsule_start = _address((config.get("capsule_slots_start") or [None])[0])
+        self.capsule_end = _address((config.get("capsule_slots_end") or [None])[0])
+        self.inventory_start, self.inventory_end = [_address(a) for a in config["inventory_range"]]
+        self.scenario_start, self.scenario_end = [_address(a) for a in config["scenario_range"]]
+        self.pointer_base = _address(config.get("pointer_base_address"))
+        self.capsule_sprite_offset = _address(config.get("capsule_sprite_offset"))
+        self.map_address = _address(config.get("map_address"))
+        self.spoiler_log_start = _address(config.get("spoiler_log_offset_start"))
+        self.spoiler_log_end = _address(config.get("spoiler_log_offset_end"))
+        self.dungeon_flag_start = _address(config.get("dungeon_flag_start"))
+        self.dungeon_flag_end = _address(config.get("dungeon_flag_end"))
+        self.dungeon_flag_file = config.get("dungeon_flag_addresses")
+        self.transport_flag = _address(config.get("transport_flag"))
+        self.ship = [_address(config.get(f"ship_{k}_address")) for k in ("x_fast", "x_slow", "y_fast", "y_slow")]
+        self.walk = [_address(config.get(f"walk_{k}_address")) for k in ("x_fast", "x_slow", "y_fast", "y_slow")]
+        self.wram_shift = 0 # Added to the dungeon_flag_addresses file too (see shifted())
+
+    def shifted(self, shift: int, pointer_base: Optional[int] = None) -> "EmulatorProfile":
+        """
+        The same profile with all WRAM addresses moved by `shift` (another build
+        of the emulator, see core/profile_detect.py). ROM offsets stay as they are.
+        """
+        def move(address):
+            return None if address is None else address + shift
+
+        profile = copy.copy(self)
+        profile.name = f"{self.name} ({'+' if shift >= 0 else '-'}0x{abs(shift):X})" if shift else self.name
+        for name in WRAM_ADDRESSES:
+            setattr(profile, name, move(getattr(self, name)))
+        for name in ("character_slots", "ship", "walk"):
+            setattr(profile, name, [move(address) for address in getattr(self, name)])
+        profile.pointer_base = pointer_base
+        profile.wram_shift = self.wram_shift + shift
+        return profile
+
+    def __repr__(self):
+        return f"EmulatorProfile({self.name!r}, module={self.module!r})"
+
+
+def load_profiles(filename: str = EMULATOR_ADDRESSES) -> List[EmulatorProfile]:
+    profiles = []
+    for module, configs in _load_json(filename).items():
+        for config in configs:
+            try:
+                profiles.append(EmulatorProfile(module, config))
+            except (KeyError, ValueError, TypeError) as e:
+                logging.warning(f"Skipping emulator profile {config.get('name', module)!r}: {e}")
+    return profiles
+
+
+def find_profile(pid: int, profiles: List[EmulatorProfile], name: Optional[str] = None):
+    """
+    Picks the profile for `pid`: the one called `name`, or else the first whose
+    module is mapped in the process. Returns (profile, module base).
+    """
+    for profile in profiles:
+        if name is not None and profile.name != name:
+            continue
+        try:
+            return profile, find_module_base(pid, profile.module)
+        except ProcessMemoryError:
+            continue
+    wanted = repr(name) if name else "any of " + ", ".join(sorted({p.module for p in profiles}))
+    raise ProcessMemoryError(f"No emulator profile matches pid {pid} (looked for {wanted})")
+
+
+POSITION_BYTES = ("x_fast", "x_slow", "y_fast", "y_slow")
+
+
+def compile_read_plan(profile: EmulatorProfile, dungeon_addresses=(), gap: int = DEFAULT_GAP) -> ReadPlan:
+    """
+    Every WRAM address the tracker needs, relative to the module base.
+    Dungeon flags span the addresses of the profile's dungeon_flags_*.json.
+    """
+    p = profile
+    fields = {
+        "capsules": (p.capsule_start, p.capsule_end - p.capsule_start + 1),
+        "inventory": (p.inventory_start, p.inventory_end - p.inventory_start), # End is exclusive (DataReaders.cs)
+        "scenario": (p.scenario_start, p.scenario_end - p.scenario_start + 1),
+        "transport": (p.transport_flag, 1),
+    }
+    if p.gold is not None:
+        fields["gold"] = (p.gold, 3)
+    for i, address in enumerate(p.character_slots):
+        fields[f"character_{i}"] = (address, 1)
+    for mode in ("walk", "ship"):
+        for key, address in zip(POSITION_BYTES, getattr(p, mode)):
+            fields[f"{mode}_{key}"] = (address, 1)
+    if dungeon_addresses:
+        fields["dungeon_flags"] = (min(dungeon_addresses), max(dungeon_addresses) - min(dungeon_addresses) + 1)
+    else:
+        fields["dungeon_flags"] = (p.dungeon_flag_start, p.dungeon_flag_end - p.dungeon_flag_start + 1)
+    if p.pointer_base is not None:
+        fields["rom_pointer"] = (p.pointer_base, 4)
+    # Merged per poll region only: a region read doesn't pull in the bytes of the others
+    return ReadPlan(fields, gap, {name: field_region(name) for name in fields})
+
+
+def _shop_range(text: str):
+    """'bf0cf - bf0f8' -> (0xBF0CF, 42). Both ends are inclusive."""
+    start, end = (int(part, 16) for part in text.split("-"))
+    return start, end - start + 1
+
+
+def compile_rom_plan(profile: EmulatorProfile, shops=(), gap: int = DEFAULT_GAP) -> Optional[ReadPlan]:
+    """
+    Static ROM data, relative to the ROM start: the capsule sprite table (one
+    2-byte entry every 10 bytes), the spoiler log and the shop lists of
+    shop_addresses.json. Read once per seed (see MemoryReader.read_seed).
+    """
+    p = profile
+    fields = {}
+    if p.capsule_sprite_offset is not None:
+        for i in range(CAPSULE_SPRITE_COUNT):
+            fields[f"sprite_{i}"] = (p.capsule_sprite_offset + i * CAPSULE_SPRITE_STRIDE, 2)
+    if p.spoiler_log_start is not None and p.spoiler_log_end is not None:
+        fields["spoiler_log"] = (p.spoiler_log_start, p.spoiler_log_end - p.spoiler_log_start)
+    for shop in shops:
+        for category, text in shop.items():
+            if category != "city":
+                fields[f"shop {shop['city']}/{category}"] = _shop_range(text)
+    return ReadPlan(fields, gap) if fields else None
+
+
+def shop_item_ids(shop_data: Dict[str, Dict[str, list]]) -> Dict[str, Dict[int, str]]:
+    """category -> {id: name} over every city of shop_data.json ("3800" is the little-endian id 0x0038)."""
+    ids = {}
+    for categories in shop_data.values():
+        for category, entries in categories.items():
+            table = ids.setdefault(category, {})
+            for name, hex_id in entries:
+                table[int.from_bytes(bytes.fromhex(hex_id), "little")] = name
+    return ids
+
+
+def parse_shop(data, category: str, ids: Dict[str, Dict[int, str]]) -> List[str]:
+    """
+    Names of one shop list. Weapons and armor share a range, so only ids
+    known for `category` are kept; the list ends at 0xFF / 0xFFFF.
+    """
+    table = ids.get(category, {})
+    if category == SHOP_SPELLS:
+        values = bytes(data)
+        end = SHOP_END
+    else:
+        values = [int.from_bytes(data[i:i + 2], "little") for i in range(0, len(data) - 1, 2)]
+        end = SHOP_END << 8 | SHOP_END
+    names = []
+    for value in values:
+        if value == end:
+            break
+        if value in table:
+            names.append(table[value])
+    return names
+
+
+class MemoryReader:
+    """
+    Reads GameStates from an emulator process: one process_vm_readv for the
+    WRAM spans of the regions asked for per read_game_state(), plus one for
+    the static ROM data until the seed is known. Regions whose bytes didn't
+    change (see `scheduler`) keep their last decoded value.
+    """
+
+    def __init__(self, memory: ProcessMemory, base: int, profile: EmulatorProfile, gap: int = DEFAULT_GAP,
+                 seed_cache: Optional[SeedCache] = None, scheduler: Optional[PollScheduler] = None):
+        self.memory = memory
+        self.base = base
+        self.profile = profile
+        self.polls = 0
+        self.scheduler = scheduler or PollScheduler()
+
+        self.items = ItemDecoder(_load_json("tool_items.json"), _load_json("scenario_items.json"),
+                                 scenario_size=profile.scenario_end - profile.scenario_start + 1)
+        self.dungeons = (DungeonFlagTable.load(profile.dungeon_flag_file, profile.wram_shift)
+                         if profile.dungeon_flag_file else None)
+        self.bits = dict.fromkeys(BITSET_FIELDS, 0) # Bitsets of the last read (a new dict whenever one changes)
+
+        self.plan = compile_read_plan(profile, self.dungeons.addresses if self.dungeons else (), gap)
+        self._views = self.plan.views
+        self.regions = {region: [] for region in REGION_FIELDS}
+        for name in self.plan.fields:
+            self.regions[field_region(name)].append(name)
+        self._region_spans = {} # frozenset of regions -> bound spans
+        self._decoders = {"pos": self._decode_pos, "items": self._decode_items, "party": self._decode_party,
+                          "dungeons": self._decode_dungeons, "rom": self._decode_rom}
+        self.state = empty_game_state() # Last decoded value of every field
+        self.changed = set() # Regions decoded by the last read_game_state()
+        self.shops = _load_json(SHOP_ADDRESSES)["shops"]
+        self.shop_ids = shop_item_ids(_load_json(SHOP_DATA))
+        self.rom_plan = compile_rom_plan(profile, self.shops, gap)
+
+        # Static per-seed data (core/seed_cache.py)
+        self.seed_cache = seed_cache or default_cache()
+        self.seed_hash: Optional[str] = None
+        self.seed: Optional[SeedData] = None
+        self._seed_inline = False # Cache unwritable: payloads carry the data itself
+        self._seed_rom = None
+        self._seed_attempts = 0
+
+    def read_game_state(self, regions=None) -> Dict:
+        """
+        One full GameState payload (helper/Core/GameState.cs). Only `regions`
+        (default: all of them) are read; the others keep their last value.
+        """
+        regions = frozenset(self.regions if regions is None else regions)
+        spans = self._region_spans.get(regions)
+        if spans is None:
+            fields = [name for region in regions for name in self.regions.get(region, ())]
+            spans = self._region_spans[regions] = self.plan.bind_fields(self.base, fields)
+        if spans:
+            self.memory.readv(self.plan.buffer, spans)
+        self.polls += 1
+
+        views = self._views
+        now = time.monotonic()
+        self.changed = set()
+        for region in regions:
+            if self.scheduler.changed(region, [views[name] for name in self.regions[region]], now):
+                self.changed.add(region)
+        for region in self.changed:
+            self._decoders[region]()
+        if "rom" in regions and "rom" not in self.changed and self.seed is None:
+            self._decode_rom() # Still retrying an empty ROM
+        return dict(self.state)
+
+    def _decode_pos(self):
+        x, y, mode = self._position()
+        self.state.update(player_x=x, player_y=y, transport_mode=mode)
+
+    def _decode_items(self):
+        items = self.items
+        obtained = items.decode(self._views["inventory"], self._views["scenario"])
+        self.bits = dict(self.bits, inventory=obtained & items.tool_bits, scenario=obtained & items.scenario_bits)
+        self.state["inventory"] = items.names(self.bits["inventory"])
+        self.state["scenario"] = items.names(self.bits["scenario"])
+
+    def _decode_party(self):
+        capsules = self._views["capsules"][:len(CAPSULE_NAMES)]
+        self.state["characters"] = self._characters()
+        self.state["capsules"] = [CAPSULE_NAMES[i] for i, value in enumerate(capsules) if value]
+
+    def _decode_dungeons(self):
+        cleared = self.dungeons.decode(self._views["dungeon_flags"]) if self.dungeons else 0
+        self.bits = dict(self.bits, cleared_locations=cleared)
+        self.state["cleared_locations"] = self.dungeons.names(cleared) if self.dungeons else []
+
+    def _decode_rom(self):
+        seed = self.read_seed()
+        state = self.state
+        if seed is None:
+            state.pop("seed_hash", None)
+            state["capsule_sprite_values"] = []
+            state["spoiler_log"] = []
+        else:
+            state["seed_hash"] = self.seed_hash
+            # Cached: the tracker restores these from the hash
+            state["capsule_sprite_values"] = seed.capsule_sprite_values if self._seed_inline else None
+            state["spoiler_log"] = seed.spoiler_log if self._seed_inline else None
+
+    def make_delta(self, old: Dict, old_bits: Dict, new: Dict, new_bits: Dict, seq: int) -> Dict:
+        """
+        Delta between two reads. Bitset fields are diffed with XOR, giving
+        exact add / remove lists; everything else goes through payloads.make_delta.
+        """
+        delta = make_delta(old, dict(new, **dict.fromkeys(BITSET_FIELDS)), seq)
+        for field in BITSET_FIELDS:
+            if old_bits[field] == new_bits[field]:
+                continue
+            table = self.dungeons if field == "cleared_locations" else self.items
+            added, removed = table.diff(old_bits[field], new_bits[field])
+            if added:
+                delta.setdefault("add", {})[field] = added
+            if removed:
+                delta.setdefault("remove", {})[field] = removed
+        return delta
+
+    def _characters(self) -> List[str]:
+        views = self._views
+        names = (CHARACTER_IDS.get(views[f"character_{i}"][0]) for i in range(len(self.profile.character_slots)))
+        return [name for name in names if name is not None]
+
+    def _position(self):
+        views = self._views
+        mode = "ship" if views["transport"][0] == TRANSPORT_SHIP else "walk"
+        x_fast, x_slow, y_fast, y_slow = (views[f"{mode}_{key}"][0] for key in POSITION_BYTES)
+        return (x_slow << 8) | x_fast, (y_slow << 8) | y_fast, mode
+
+    def _rom_start(self) -> Optional[int]:
+        if "rom_pointer" not in self._views:
+            return None
+        return int.from_bytes(self._views["rom_pointer"], "little") or None
+
+    def read_seed(self) -> Optional[SeedData]:
+        """
+        Static ROM data of the loaded seed, from the seed cache if its hash is
+        known there. The ROM is read (and hashed) once per ROM pointer value;
+        while it reads as empty it is retried up to SEED_READ_ATTEMPTS times.
+        """
+        rom = self._rom_start()
+        if rom != self._seed_rom:
+            self.forget_seed()
+            self._seed_rom = rom
+        if self.seed is not None or self._seed_attempts >= SEED_READ_ATTEMPTS:
+            return self.seed
+        if rom is None or self.rom_plan is None:
+            return None
+        self._seed_attempts += 1
+
+        plan = self.rom_plan
+        try:
+            self.memory.readv(plan.buffer, plan.bind(rom))
+        except ProcessMemoryError:
+            return None # ROM not loaded (yet)
+        if not any(plan.buffer):
+            if self._seed_attempts >= SEED_READ_ATTEMPTS:
+                logging.info("ROM data still empty. Stopping retries until the next sync.")
+            return None
+
+        key = seed_hash(plan.buffer)
+        seed = self.seed_cache.get(key)
+        if seed is None:
+            seed = self._parse_seed()
+            self._seed_inline = not self.seed_cache.put(key, seed)
+            logging.info(f"Seed {key[:12]}: parsed {seed} from ROM.")
+        else:
+            self._seed_inline = False
+            logging.info(f"Seed {key[:12]}: restored {seed} from cache.")
+        self.seed_hash, self.seed = key, seed
+        return seed
+
+    def forget_seed(self):
+        """Next read_seed() reads and hashes the ROM again (e.g. on sync, another ROM may be loaded)."""
+        self.seed_hash = self.seed = None
+        self._seed_attempts = 0
+
+    def resync(self):
+        """Re-reads and re-decodes everything on the next read_game_state(), seed included."""
+        self.forget_seed()
+        self.scheduler.reset()
+
+    def _parse_seed(self) -> SeedData:
+        views = self.rom_plan.views
+        sprites = None
+        if "sprite_0" in views:
+            sprites = [views[f"sprite_{i}"].hex().upper() for i in range(CAPSULE_SPRITE_COUNT)]
+        spoiler_log = parse_spoiler_log(bytes(views["spoiler_log"])) if "spoiler_log" in views else None
+        shops = {}
+        for shop in self.shops:
+            city = shop["city"]
+            for category in shop:
+                if category != "city":
+                    shops.setdefault(city, {})[category] = parse_shop(
+                        views[f"shop {city}/{category}"], category, self.shop_ids)
+        if spoiler_log:
+            logging.info(f"Parsed Spoiler Log: {len(spoiler_log)} entries.")
+        return SeedData(spoiler_log, sprites, shops)
+
+
+def empty_game_state() -> Dict:
+    """GameState of an emulator without a game: the tracker resets on it."""
+    return {"inventory": [], "characters": [], "capsules": [], "capsule_sprite_values": [],
+            "player_x": 0, "player_y": 0, "transport_mode": None, "cleared_locations": [],
+            "scenario": [], "maidens": {}, "spoiler_log": []}
+
+
+def parse_spoiler_log(data: bytes) -> List[Dict[str, str]]:
+    """Same word splitting as DataReaders.ReadSpoilerLog: item / location / boss triples after the marker."""
+    index = data.find(SPOILER_LOG_MARKER)
+    if index == -1:
+        return []
+    text = data[index + len(SPOILER_LOG_MARKER):].decode("ascii", "replace")
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    words = [word.strip() for word in re.findall(r"[A-Za-z\s]+", text) if word.strip()]
+    return [
+        {"item": words[i], "location": words[i + 1], "boss": words[i + 2]}
+        for i in range(0, len(words) - 2, 3)
+    ]
+
+
+class MemoryReaderStats:
+    def __init__(self):
+        self.reads = 0        # GameStates read
+        self.idle_reads = 0   # ... where no due region had changed
+        self.snapshots = 0    # Full payloads handed to the callback
+        self.deltas = 0       # Delta payloads
+        self.errors = 0
+        self.max_read_ms = 0.0
+        self.syscalls = 0     # process_vm_readv calls (ProcessMemory counters)
+        self.bytes_read = 0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        reads = max(self.reads, 1)
+        return (f"MemoryReaderStats(reads={self.reads}, idle={self.idle_reads}, snapshots={self.snapshots}, deltas={self.deltas}, "
+                f"errors={self.errors}, max_read={self.max_read_ms:.2f}ms, "
+                f"{self.syscalls / reads:.2f} syscalls and {self.bytes_read / reads:,.0f} bytes per read)")
+
+
+class MemoryReaderSource:
+    """
+    Polls an emulator process on its own thread and feeds payloads to
+    `callback` (normally StateManager.on_helper_data): a snapshot with a seq
+    first (and after request_sync), then sequenced deltas (core/payloads.py)
+    for whatever changed, and an empty state when the emulator goes away.
+    Regions are read when `scheduler` says they're due (core/poll_scheduler.py);
+    `interval` instead reads everything at one fixed rate. Without a
+    profile_name the profile is detected (core/profile_detect.py).
+    """
+
+    def __init__(self, pid: int, callback, profile_name: Optional[str] = None,
+                 base: Optional[int] = None, interval: Optional[float] = None, gap: int = DEFAULT_GAP,
+                 scheduler: Optional[PollScheduler] = None, detect: bool = True):
+        self.pid = pid
+        self.callback = callback
+        self.profile_name = profile_name
+        self.base = base # Module base override (e.g. a test process without the emulator executable)
+        self.scheduler = scheduler or (PollScheduler.fixed(interval) if interval else PollScheduler())
+        self.gap = gap # Read planner merge threshold (core/read_plan.py)
+        self.detect = detect
+        self.stats = MemoryReaderStats()
+        self.reader = None
+        self._force_full = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def attach(self) -> MemoryReader:
+        profiles = load_profiles()
+        if self.base is not None:
+            profile = next((p for p in profiles if self.profile_name in (None, p.name)), None)
+            if profile is None:
+                raise ProcessMemoryError(f"Unknown emulator profile {self.profile_name!r}")
+            base = self.base
+        elif self.profile_name is None and self.detect:
+            from .profile_detect import ProfileDetector # Imports this module
+            try:
+                profile, base = ProfileDetector(profiles).detect(self.pid)
+            except ProcessMemoryError as e:
+                logging.warning(f"Profile detection failed ({e}), using the first matching profile")
+                profile, base = find_profile(self.pid, profiles)
+        else:
+            profile, base = find_profile(self.pid, profiles, self.profile_name)
+        self.reader = MemoryReader(ProcessMemory(self.pid), base, profile, self.gap, scheduler=self.scheduler)
+        logging.info(f"Attached to pid {self.pid}: {profile.name} ({profile.module} at 0x{base:X})")
+        logging.info(f"WRAM read plan: {self.reader.plan.describe()}")
+        return self.reader
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def request_sync(self):
+        """Next poll sends a full state even if nothing changed, and re-checks which seed is loaded."""
+        self._force_full = True
+
+    def _run(self):
+        try:
+            if self.reader is None:
+                self.attach()
+        except (OSError, ValueError) as e:
+            logging.error(f"Memory reader can't attach to pid {self.pid}: {e}")
+            return
+
+        last = None
+        last_bits = None
+        seq = 0
+        exited = False
+        scheduler = self.scheduler
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            if self._force_full:
+                self.reader.resync() # Seed re-hashed on this read, restored from the seed cache
+            try:
+                state = self.reader.read_game_state(scheduler.due())
+            except ProcessMemoryError as e:
+                if not self.reader.memory.alive():
+                    logging.info(f"Emulator (pid {self.pid}) exited.")
+                    exited = True
+                    break
+                self.stats.errors += 1
+                logging.debug(f"Memory read failed: {e}")
+                self._stop.wait(POLL_INTERVAL)
+                continue
+            bits = self.reader.bits
+            self.stats.reads += 1
+            self.stats.syscalls = self.reader.memory.syscalls
+            self.stats.bytes_read = self.reader.memory.bytes_read
+            self.stats.max_read_ms = max(self.stats.max_read_ms, (time.perf_counter() - started) * 1000)
+
+            if last is None or self._force_full:
+                self._force_full = False
+                self.stats.snapshots += 1
+                self.callback(dict(state, seq=seq))
+                last, last_bits = state, bits
+                seq += 1
+            elif not self.reader.changed:
+                self.stats.idle_reads += 1 # Same bytes as last time: nothing to diff
+            else:
+                delta = self.reader.make_delta(last, last_bits, state, bits, seq)
+                if not delta_is_empty(delta):
+                    self.stats.deltas += 1
+                    self.callback(delta)
+                    last, last_bits = state, bits
+                    seq += 1
+
+            self._stop.wait(max(0.0, scheduler.next_due() - time.monotonic()))
+
+        if exited and last is not None:
+            # Emulator gone: an empty state wipes the tracker for the next run, like the helper does
+            self.callback(empty_game_state())
+        logging.info(f"Memory reader stopped: {self.stats}; {scheduler.describe()}")
@@ -0,0 +1,161 @@
+from typing import Any, Dict, Optional
+
+# --- Helper Payload Shapes ---
+# Snapshot: the full GameState object the C# helper sends (see helper/Core/GameState.cs),
+#           optionally tagged with "seq".
+# Delta:    {"type": "delta", "seq": N,
+#            "set":    {field: new_value, ...},            # replaced fields
+#            "add":    {set_field: [names...], ...},       # set members gained
+#            "remove": {set_field: [names...], ...}}       # set members lost
+# Deltas are only valid on top of the snapshot/delta with seq N-1.
+
+# Unordered name lists: transmitted as add/remove ops in a delta
+SET_FIELDS = ("inventory", "scenario", "cleared_locations", "capsules")
+
+# Everything else is replaced wholesale ("characters" is ordered: slot 1 is the party leader)
+VALUE_FIELDS = (
+    "characters", "capsule_sprite_values", "spoiler_log", "maidens",
+    "player_x", "player_y", "transport_mode", "seed_hash",
+)
+
+
+def is_delta(payload: Dict[str, Any]) -> bool:
+    return payload.get("type") == "delta"
+
+
+def is_reset(payload: Dict[str, Any]) -> bool:
+    """
+    The helper's empty snapshot: emulator unhooked or game reset (helper/Core/GameState.cs
+    instantiates empty lists; null lists are categories it didn't read).
+    """
+    return (not is_delta(payload) and payload.get("inventory") == [] and payload.get("characters") == []
+            and not payload.get("player_x") and not payload.get("player_y"))
+
+
+def make_delta(old: Optional[Dict[str, Any]], new: Dict[str, Any], seq: int) -> Dict[str, Any]:
+    """
+    Builds the delta that turns snapshot `old` into snapshot `new`.
+    Fields missing (or None) in `new` are treated as unchanged, matching the
+    helper's position-only payloads where everything else is null.
+    """
+    old = old or {}
+    set_fields, added, removed = {}, {}, {}
+
+    for field in SET_FIELDS:
+        if new.get(field) is None:
+            continue
+        before = set(old.get(field) or ())
+        after = set(new[field])
+        if after - before:
+            added[field] = sorted(after - before)
+        if before - after:
+            removed[field] = sorted(before - after)
+
+    for field in VALUE_FIELDS:
+        if field in new and new[field] is not None and new[field] != old.get(field):
+            set_fields[field] = new[field]
+
+    delta = {"type": "delta", "seq": seq}
+    if set_fields:
+        delta["set"] = set_fields
+    if added:
+        delta["add"] = added
+    if removed:
+        delta["remove"] = removed
+    return delta
+
+
+def delta_is_empty(delta: Dict[str, Any]) -> bool:
+    return not (delta.get("set") or delta.get("add") or delta.get("remove"))
+
+
+def merge_payloads(older: Dict[str, Any], newer: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Folds `newer` into `older` (both owned by the caller, `older` may be mutated).
+    Returns the merged payload, or None if the pair can't be expressed as one payload.
+
+    reset    + reset    -> the newer one
+    reset    + anything -> None, and the other way round: a reset must reach StateManager
+                           on its own, or overrides and assignments survive a game reset
+    snapshot + snapshot -> snapshot (newer non-null fields win)
+    delta    + delta    -> delta    (set fields replaced, add/remove ops last-op-wins)
+    snapshot + delta    -> snapshot (delta applied to the snapshot lists)
+    delta    + snapshot -> snapshot if it's a full one, delta if it's position-only
+    A merged result that spans a sequence gap is tagged "seq_gap" so the
+    consumer still resyncs.
+    """
+    older_delta, newer_delta = is_delta(older), is_delta(newer)
+
+    older_reset, newer_reset = is_reset(older), is_reset(newer)
+    if older_reset or newer_reset:
+        return newer if older_reset and newer_reset else None
+
+    if not older_delta and not newer_delta:
+        for key, value in newer.items():
+            if value is not None:
+                older[key] = value
+        if newer.get("seq") is not None and not newer.get("seq_gap"):
+            # A fresh seq'd snapshot is a new base, so an earlier gap is healed
+            older.pop("seq_gap", None)
+        return older
+
+    if older_delta and newer_delta:
+        contiguous = older.get("seq") is not None and newer.get("seq") == older["seq"] + 1
+        older.setdefault("seq_start", older.get("seq"))
+        older["seq"] = newer.get("seq")
+        if not contiguous or newer.get("seq_gap"):
+            older["seq_gap"] = True
+        if newer.get("set"):
+            older.setdefault("set", {}).update(newer["set"])
+        for field in SET_FIELDS:
+            new_add = set(newer.get("add", {}).get(field) or ())
+            new_remove = set(newer.get("remove", {}).get(field) or ())
+            if not (new_add or new_remove):
+                continue
+            add = (set(older.get("add", {}).get(field) or ()) - new_remove) | new_add
+            remove = (set(older.get("remove", {}).get(field) or ()) - new_add) | new_remove
+            _store_op(older, "add", field, add)
+            _store_op(older, "remove", field, remove)
+        return older
+
+    if not older_delta and newer_delta:
+        contiguous = older.get("seq") is not None and newer.get("seq") == older["seq"] + 1
+        for key, value in (newer.get("set") or {}).items():
+            older[key] = value
+        for field in SET_FIELDS:
+            new_add = newer.get("add", {}).get(field)
+            new_remove = newer.get("remove", {}).get(field)
+            if not (new_add or new_remove):
+                continue
+            members = set(older.get(field) or ())
+            members.difference_update(new_remove or ())
+            members.update(new_add or ())
+            older[field] = sorted(members)
+        older["seq"] = newer.get("seq")
+        if not contiguous or newer.get("seq_gap"):
+            older["seq_gap"] = True
+        return older
+
+    # older is a delta, newer is a snapshot
+    if all(newer.get(field) is None for field in SET_FIELDS):
+        # Position-only update (everything else null): fold into the delta
+        set_fields = older.setdefault("set", {})
+        for key, value in newer.items():
+            if value is not None and key in VALUE_FIELDS:
+                set_fields[key] = value
+        return older
+    if all(newer.get(field) is not None for field in SET_FIELDS):
+        # Full snapshot supersedes the delta; keep delta values the snapshot didn't carry
+        for key, value in (older.get("set") or {}).items():
+            if newer.get(key) is None:
+                newer[key] = value
+        return newer
+    return None
+
+
+def _store_op(delta: Dict[str, Any], op: str, field: str, members: set):
+    ops = delta.setdefault(op, {})
+    if members:
+        ops[field] = sorted(members)
+    else:
+        ops.pop(field, None)
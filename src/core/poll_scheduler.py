@@ -0,0 +1,136 @@
+"""
+Per-category poll scheduling for the native memory reader
+(core/memory_reader.py), and the matching poll rates for the C# helper's
+options command (network/commands.py).
+
+Memory is split into regions (groups of read plan fields), each with its own
+interval: the player position wants ~30 Hz, items ~2 Hz, dungeon flags ~1 Hz.
+Static ROM data is read once per seed anyway (core/seed_cache.py), so "rom"
+only watches the ROM pointer. A due region is read and checksummed (crc32);
+it is only decoded if the checksum moved. A region that stayed the same for
+IDLE_READS reads backs off, doubling its interval up to its max, and snaps
+back to the base interval as soon as it changes. Regions due within half the
+fastest interval are read early, together with the one that is due, so
+they share a process_vm_readv instead of waking the reader on their own.
+"""
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from network.commands import MIN_POLL_MS
+
+IDLE_READS = 10 # Unchanged reads before a region backs off
+
+# name, helper categories (network/commands.py), base interval (s), max interval (s)
+DEFAULT_REGIONS: Tuple[Tuple[str, Tuple[str, ...], float, float], ...] = (
+    ("pos", ("pos",), 1 / 30, 0.25),
+    ("items", ("tools", "keys"), 0.5, 2.0),
+    ("party", ("chars",), 0.5, 2.0),
+    ("dungeons", ("tools", "maidens"), 1.0, 4.0), # Maidens are story flags: the helper reads them at this rate
+    ("rom", (), 2.0, 2.0), # Only the ROM pointer: which seed is loaded
+)
+
+
+class PollRegion:
+    __slots__ = ("name", "categories", "interval", "max_interval", "current",
+                 "next_due", "idle", "checksum", "reads", "changes")
+
+    def __init__(self, name: str, categories: Tuple[str, ...], interval: float, max_interval: float):
+        self.name = name
+        self.categories = categories
+        self.interval = interval         # Base
+        self.max_interval = max(interval, max_interval)
+        self.current = interval          # After back-off
+        self.next_due = 0.0
+        self.idle = 0                    # Unchanged reads in a row
+        self.checksum = None
+        self.reads = 0
+        self.changes = 0
+
+    def __repr__(self):
+        return (f"PollRegion({self.name!r}, every {self.current * 1000:.0f}ms "
+                f"(base {self.interval * 1000:.0f}ms), {self.reads} reads, {self.changes} changes)")
+
+
+class PollScheduler:
+    """
+    Owns the poll intervals and checksums of every region.
+    due() -> regions to read now; changed() after reading one tells whether
+    it needs decoding and schedules its next read.
+    """
+
+    def __init__(self, regions=DEFAULT_REGIONS, idle_reads: int = IDLE_READS, adaptive: bool = True):
+        self.regions: Dict[str, PollRegion] = {name: PollRegion(name, categories, interval, max_interval)
+                                               for name, categories, interval, max_interval in regions}
+        self.idle_reads = idle_reads
+        self.adaptive = adaptive
+        self.slack = min(region.interval for region in self.regions.values()) / 2
+        self.started = time.monotonic()
+
+    @classmethod
+    def fixed(cls, interval: float, regions=DEFAULT_REGIONS) -> "PollScheduler":
+        """Every region every `interval` seconds, no back-off (the reader's old single-rate loop)."""
+        return cls([(name, categories, interval, interval) for name, categories, _, _ in regions], adaptive=False)
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        now = time.monotonic() if now is None else now
+        return [name for name, region in self.regions.items() if region.next_due <= now + self.slack]
+
+    def next_due(self) -> float:
+        """monotonic() time of the next read (something may be due a little earlier, see due())."""
+        return min(region.next_due for region in self.regions.values())
+
+    def changed(self, name: str, views: Iterable, now: Optional[float] = None) -> bool:
+        """Checksums the region's freshly read bytes, schedules its next read. True if they changed."""
+        now = time.monotonic() if now is None else now
+        region = self.regions[name]
+        checksum = 0
+        for view in views:
+            checksum = zlib.crc32(view, checksum)
+        changed = checksum != region.checksum
+        region.checksum = checksum
+        region.reads += 1
+
+        if changed:
+            region.changes += 1
+            region.idle = 0
+            region.current = region.interval
+        elif self.adaptive:
+            region.idle += 1
+            if region.idle >= self.idle_reads and region.current < region.max_interval:
+                region.idle = 0
+                region.current = min(region.current * 2, region.max_interval)
+        region.next_due = now + region.current
+        return changed
+
+    def reset(self):
+        """Everything due now, at base rate, and decoded on its next read (e.g. on sync)."""
+        for region in self.regions.values():
+            region.next_due = 0.0
+            region.idle = 0
+            region.current = region.interval
+            region.checksum = None
+
+    def poll_ms(self, current: bool = False) -> Dict[str, int]:
+        """
+        The schedule as the helper's per-category poll_ms (network/commands.py):
+        the fastest region of each category, base or current (backed-off) rate.
+        """
+        rates = {}
+        for region in self.regions.values():
+            ms = max(MIN_POLL_MS, round((region.current if current else region.interval) * 1000))
+            for category in region.categories:
+                rates[category] = min(rates.get(category, ms), ms)
+        return rates
+
+    def reads_per_second(self, elapsed: Optional[float] = None) -> Dict[str, float]:
+        elapsed = elapsed or max(time.monotonic() - self.started, 1e-9)
+        return {name: region.reads / elapsed for name, region in self.regions.items()}
+
+    def describe(self, elapsed: Optional[float] = None) -> str:
+        rates = self.reads_per_second(elapsed)
+        return ", ".join(f"{name} {rate:.1f}/s ({self.regions[name].changes} changed)" for name, rate in rates.items())
+
+    def __repr__(self):
+        total = sum(self.reads_per_second().values())
+        return f"PollScheduler({len(self.regions)} regions, adaptive={self.adaptive}, {total:.1f} region reads/s)"
@@ -0,0 +1,139 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import List, Tuple
+
+# --- Cross-Process Memory Reads (Linux) ---
+# process_vm_readv copies straight from another process's address space:
+# no ptrace stop, no /proc/pid/mem file, and several regions per syscall.
+# Needs ptrace permission on the target: same user and either
+# /proc/sys/kernel/yama/ptrace_scope = 0, the target being our child, or
+# the target having allowed us with prctl(PR_SET_PTRACER).
+
+
+class ProcessMemoryError(OSError):
+    pass
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+_libc = None
+
+
+def _process_vm_readv():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"):
+            raise ProcessMemoryError(f"process_vm_readv is Linux only (running on {sys.platform})")
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        _libc.process_vm_readv.restype = ctypes.c_ssize_t
+        _libc.process_vm_readv.argtypes = [
+            ctypes.c_int, ctypes.POINTER(_IoVec), ctypes.c_ulong,
+            ctypes.POINTER(_IoVec), ctypes.c_ulong, ctypes.c_ulong,
+        ]
+    return _libc.process_vm_readv
+
+
+def _mapping_name(path: str) -> str:
+    """File name of a mapping, lower case, without memfd: / (deleted) decorations."""
+    name = os.path.basename(path.strip().replace(" (deleted)", "")).lower()
+    if name.startswith("memfd:"):
+        name = name[len("memfd:"):]
+    return name
+
+
+def memory_map(pid: int) -> List[Tuple[int, int, str, str]]:
+    """(start, end, perms, path) of every mapping in /proc/<pid>/maps; path is "" for anonymous ones."""
+    mappings = []
+    try:
+        with open(f"/proc/{pid}/maps", "r") as f:
+            for line in f:
+                parts = line.split(None, 5)
+                if len(parts) < 5:
+                    continue
+                start, end = (int(x, 16) for x in parts[0].split("-"))
+                mappings.append((start, end, parts[1], parts[5].strip() if len(parts) == 6 else ""))
+    except OSError as e:
+        raise ProcessMemoryError(f"Can't read memory map of pid {pid}: {e}") from e
+    return mappings
+
+
+def module_mappings(pid: int, module: str) -> List[Tuple[int, int, str, str]]:
+    """Mappings of `module`, plus the anonymous ones right behind it (its .bss)."""
+    wanted = module.lower()
+    found = []
+    for mapping in memory_map(pid):
+        start, _, _, path = mapping
+        if path and _mapping_name(path) == wanted:
+            found.append(mapping)
+        elif not path and found and found[-1][1] == start:
+            found.append(mapping)
+    return found
+
+
+def find_module_base(pid: int, module: str) -> int:
+    """
+    Lowest mapped address of `module` (e.g. "snes9x-x64.exe") in /proc/<pid>/maps,
+    i.e. what MainModule.BaseAddress is on Windows. Matching is on the file name,
+    case-insensitive, so Wine and memfd mappings are found too.
+    """
+    wanted = module.lower()
+    starts = [start for start, _, _, path in memory_map(pid) if path and _mapping_name(path) == wanted]
+    if not starts:
+        raise ProcessMemoryError(f"{module} is not mapped in pid {pid}")
+    return min(starts)
+
+
+class ProcessMemory:
+    """Reads another process's memory by absolute address."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.syscalls = 0
+        self.bytes_read = 0
+        self._readv = _process_vm_readv()
+
+    def readv(self, buffer, spans) -> int:
+        """
+        Reads every (remote_address, buffer_offset, length) in `spans` into `buffer`
+        (a writable bytes-like object, e.g. a bytearray) with a single syscall.
+        Returns the number of bytes read; raises if the process is gone or a span is unmapped.
+        """
+        count = len(spans)
+        if not count:
+            return 0
+        local = (_IoVec * count)()
+        remote = (_IoVec * count)()
+        base = ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+        expected = 0
+        for i, (address, offset, length) in enumerate(spans):
+            local[i].iov_base = base + offset
+            local[i].iov_len = length
+            remote[i].iov_base = address
+            remote[i].iov_len = length
+            expected += length
+
+        done = self._readv(self.pid, local, count, remote, count, 0)
+        self.syscalls += 1
+        if done < 0:
+            errno = ctypes.get_errno()
+            raise ProcessMemoryError(errno, f"process_vm_readv(pid {self.pid}): {os.strerror(errno)}")
+        self.bytes_read += done
+        if done < expected:
+            # Partial reads stop at the first unreadable page
+            raise ProcessMemoryError(f"Short read from pid {self.pid}: {done} of {expected} bytes")
+        return done
+
+    def read(self, address: int, size: int) -> bytes:
+        buffer = bytearray(size)
+        self.readv(buffer, [(address, 0, size)])
+        return bytes(buffer)
+
+    def read_u32(self, address: int) -> int:
+        return int.from_bytes(self.read(address, 4), "little")
+
+    def alive(self) -> bool:
+        return os.path.exists(f"/proc/{self.pid}")
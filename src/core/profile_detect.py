@@ -0,0 +1,359 @@
+"""
+Emulator profile auto-detection for the native memory reader
+(core/memory_reader.py).
+
+emulator_addresses.json pins every WRAM address per emulator build, so a
+new build silently reads garbage. Within the game the WRAM layout never
+changes, though: across builds a profile's WRAM addresses all move by one
+constant (the two Snes9x 1.62.3 profiles differ by 0x3FA1B4 everywhere).
+ProfileDetector scans the emulator module (and its .bss) for the WRAM
+signature of each profile and derives that shift:
+
+    party slots    character ids or 0xFF (empty), leader present, nobody twice
+    capsules       0 / 1
+    transport      0 (walk) / 0xFF (ship)
+
+A match at shift 0 confirms a JSON profile as it is; anything else becomes a
+shifted copy of it. The ROM pointer is accepted if it points at a valid SNES
+header. Results are cached per executable (sha256 of the module file) in
+CACHE_DIR, so only the first attach of a build pays for the scan
+(tools/bench_profile_detect.py). Needs a game running: an empty WRAM has
+no party, and a new build is only trusted once the inventory holds a tool
+(something look-alike memory doesn't have).
+
+Backends:
+    numpy  - vectorized byte tables over the whole region
+    int    - bytes.translate + big-int AND masks
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from utils.constants import CACHE_DIR
+from .memory_reader import CHARACTER_IDS, TRANSPORT_SHIP, EmulatorProfile, _load_json
+from .process_memory import ProcessMemory, ProcessMemoryError, find_module_base, module_mappings
+
+BACKENDS = ("numpy", "int")
+
+def available_backends() -> List[str]:
+    return [name for name in BACKENDS if name != "numpy" or numpy is not None]
+
+DEFAULT_BACKEND = available_backends()[0]
+
+DETECT_CACHE = "emulators.json"
+EMPTY_SLOT = 0xFF
+SCAN_CHUNK = 16 << 20 # Bytes per read while scanning
+TOOL_EVIDENCE = 16 # More than any party + capsules
+MIN_EVIDENCE = TOOL_EVIDENCE # A shifted match is trusted with at least one tool (WramSignature.evidence)
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {} # (path, size, mtime_ns) -> sha256
+
+# SNES internal header: LoROM, HiROM, ExHiROM. Checksum and complement always XOR to 0xFFFF.
+ROM_HEADER_OFFSETS = (0x7FC0, 0xFFC0, 0x40FFC0)
+
+
+def has_rom_header(memory: ProcessMemory, rom: int) -> bool:
+    for offset in ROM_HEADER_OFFSETS:
+        try:
+            header = memory.read(rom + offset, 0x20)
+        except ProcessMemoryError:
+            continue
+        complement = int.from_bytes(header[0x1C:0x1E], "little")
+        checksum = int.from_bytes(header[0x1E:0x20], "little")
+        if complement ^ checksum == 0xFFFF and header[0x15] & 0xE0 == 0x20: # Map mode 0x2X
+            return True
+    return False
+
+
+class WramSignature:
+    """Byte checks at a profile's WRAM fields, relative to the lowest of them (the anchor)."""
+
+    def __init__(self, profile: EmulatorProfile, tool_ids=()):
+        slots = profile.character_slots
+        ids = bytes(sorted(CHARACTER_IDS))
+        checks = [(slots[0], ids)] # The leader slot is never empty in game
+        checks += [(address, ids + bytes([EMPTY_SLOT])) for address in slots[1:]]
+        checks += [(address, b"\x00\x01") for address in range(profile.capsule_start, profile.capsule_end + 1)]
+        checks.append((profile.transport_flag, bytes([0, TRANSPORT_SHIP])))
+
+        self.anchor = min(address for address, _ in checks)
+        self.span = max(max(address for address, _ in checks), profile.inventory_end) - self.anchor + 1
+        # Most selective first: the leader + the next slot rule out zero-filled memory right away
+        self.checks = [(address - self.anchor, allowed) for address, allowed in checks]
+        self.slots = [address - self.anchor for address in slots]
+        self.capsules = [address - self.anchor for address in range(profile.capsule_start, profile.capsule_end + 1)]
+        self.inventory = (profile.inventory_start - self.anchor, profile.inventory_end - self.anchor)
+        self.tool_ids = frozenset(tool_ids) # 16-bit inventory words of the tracked tools
+
+    def matches(self, data, offset: int = 0) -> bool:
+        """Signature at `offset` of `data` (one candidate)."""
+        if any(data[offset + at] not in allowed for at, allowed in self.checks):
+            return False
+        party = [data[offset + at] for at in self.slots]
+        members = [member for member in party if member != EMPTY_SLOT]
+        # Nobody twice, and nobody behind an empty slot
+        return len(members) == len(set(members)) and party[:len(members)] == members
+
+    def evidence(self, data, offset: int = 0) -> int:
+        """
+        How much game state backs a match: tools in the inventory first, then
+        party members and capsule monsters. Byte runs like 03 02 01 00 pass as
+        a full party in unrelated memory; a tool id there hardly ever does.
+        """
+        start, end = self.inventory
+        inventory = bytes(data[offset + start:offset + end])
+        tools = sum(int.from_bytes(inventory[i:i + 2], "little") in self.tool_ids for i in range(0, len(inventory) - 1, 2))
+        return sum(data[offset + at] != EMPTY_SLOT for at in self.slots) + \
+            sum(data[offset + at] for at in self.capsules) + TOOL_EVIDENCE * tools
+
+    def scan(self, data, backend: Optional[str] = None) -> List[int]:
+        """Every offset in `data` where the signature holds."""
+        if len(data) < self.span:
+            return []
+        if (backend or DEFAULT_BACKEND) == "numpy":
+            return self._scan_numpy(data)
+        return self._scan_int(data)
+
+    def _scan_numpy(self, data) -> List[int]:
+        array = numpy.frombuffer(data, dtype=numpy.uint8)
+        count = len(array) - self.span + 1
+        (first, first_allowed), (second, second_allowed) = self.checks[:2]
+        ok = self._table(first_allowed)[array[first:first + count]]
+        ok &= self._table(second_allowed)[array[second:second + count]]
+        ok &= (array[first:first + count] != array[second:second + count]) | (array[second:second + count] == EMPTY_SLOT)
+        candidates = numpy.flatnonzero(ok)
+        for at, allowed in self.checks[2:]:
+            if not len(candidates):
+                break
+            candidates = candidates[self._table(allowed)[array[candidates + at]]]
+        # Party rules over the survivors: nobody behind an empty slot, nobody twice
+        party = [array[candidates + at] for at in self.slots]
+        for i, j in combinations(range(len(party)), 2):
+            a, b = party[i], party[j]
+            keep = numpy.where(a == EMPTY_SLOT, b == EMPTY_SLOT, (a != b))
+            candidates, party = candidates[keep], [slot[keep] for slot in party]
+        return [int(offset) for offset in candidates]
+
+    @staticmethod
+    def _table(allowed: bytes):
+        table = numpy.zeros(256, dtype=bool)
+        table[list(allowed)] = True
+        return table
+
+    def _scan_int(self, data) -> List[int]:
+        # Per check: translate the shifted bytes to 1 (allowed) / 0 and AND them as one big int
+        data = bytes(data)
+        count = len(data) - self.span + 1
+        mask = -1
+        for at, allowed in self.checks:
+            table = bytes(1 if value in allowed else 0 for value in range(256))
+            mask &= int.from_bytes(data[at:at + count].translate(table), "little")
+            if not mask:
+                return []
+        # Leader vs. next slot (XOR is per byte): different or empty
+        first, second = self.slots[:2]
+        nonzero = bytes([0] + [1] * 255)
+        empty = bytes(1 if value == EMPTY_SLOT else 0 for value in range(256))
+        differs = int.from_bytes(data[first:first + count], "little") ^ int.from_bytes(data[second:second + count], "little")
+        mask &= int.from_bytes(differs.to_bytes(count, "little").translate(nonzero), "little") \
+            | int.from_bytes(data[second:second + count].translate(empty), "little")
+
+        hits = mask.to_bytes(count, "little")
+        offsets = []
+        offset = hits.find(1)
+        while offset != -1:
+            if self.matches(data, offset):
+                offsets.append(offset)
+            offset = hits.find(1, offset + 1)
+        return offsets
+
+
+class DetectStats:
+    def __init__(self):
+        self.scans = 0
+        self.cache_hits = 0
+        self.scanned_bytes = 0
+        self.scan_ms = 0.0
+        self.hash_ms = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return (f"DetectStats(scans={self.scans}, cache_hits={self.cache_hits}, "
+                f"scanned={self.scanned_bytes / 1048576:.1f}MiB in {self.scan_ms:.1f}ms, hashing {self.hash_ms:.1f}ms)")
+
+
+class ProfileDetector:
+    """
+    detect(pid) -> (profile, module base) for the emulator running as `pid`.
+    Results are kept in `cache_file` keyed by "<module sha256>:<module name>".
+    """
+
+    def __init__(self, profiles: List[EmulatorProfile], cache_file=None, backend: Optional[str] = None):
+        self.profiles = profiles
+        self.cache_file = cache_file or CACHE_DIR / DETECT_CACHE
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in available_backends():
+            raise ValueError(f"Scan backend '{self.backend}' is not installed")
+        self.stats = DetectStats()
+        self.tool_ids = {int(item["obtained_value"], 16) for item in _load_json("tool_items.json").values()
+                         if item.get("type") == "normal"}
+        self._cache = None
+
+    def detect(self, pid: int, use_cache: bool = True) -> Tuple[EmulatorProfile, int]:
+        memory = ProcessMemory(pid)
+        for module in dict.fromkeys(profile.module for profile in self.profiles):
+            try:
+                base = find_module_base(pid, module)
+            except ProcessMemoryError:
+                continue
+            key = self._module_key(pid, module)
+            cached = self._load_cache().get(key) if use_cache and key else None
+            if cached is not None:
+                profile = self._from_cache(module, cached)
+                if profile is not None:
+                    self.stats.cache_hits += 1
+                    logging.info(f"Emulator profile from cache: {profile.name} ({module} at 0x{base:X})")
+                    return profile, base
+            found = self._scan(memory, module, base, self._regions(pid, module))
+            if found is not None:
+                template, profile = found
+                if key:
+                    self._store(key, template, profile)
+                return profile, base
+        raise ProcessMemoryError(f"No known WRAM layout found in pid {pid} (is a game running?)")
+
+    # --- Scanning ---
+
+    def _scan(self, memory: ProcessMemory, module: str, base: int, regions) -> Optional[Tuple[EmulatorProfile, EmulatorProfile]]:
+        """Signature scan of `regions`. Exact profiles win over shifted ones. Returns (template, profile)."""
+        templates = [p for p in self.profiles if p.module == module]
+        signatures = [(profile, WramSignature(profile, self.tool_ids)) for profile in templates]
+        span = max(signature.span for _, signature in signatures)
+        started = time.perf_counter()
+        found = {} # (shift, template) -> evidence
+        for start, end in regions:
+            # Chunks overlap by a signature span so nothing straddling a boundary is missed
+            for chunk_start in range(start, end, SCAN_CHUNK):
+                size = min(SCAN_CHUNK + span, end - chunk_start)
+                try:
+                    data = memory.read(chunk_start, size)
+                except ProcessMemoryError:
+                    continue
+                self.stats.scanned_bytes += min(size, SCAN_CHUNK)
+                for profile, signature in signatures:
+                    for offset in signature.scan(data, self.backend):
+                        shift = chunk_start + offset - base - signature.anchor
+                        found[shift, profile] = signature.evidence(data, offset)
+        self.stats.scans += 1
+        self.stats.scan_ms += (time.perf_counter() - started) * 1000
+        if not found:
+            return None
+
+        # A profile that matches as it is wins. Otherwise the most game state, then the smallest shift.
+        ranked = sorted(found.items(), key=lambda hit: (hit[0][0] != 0, -hit[1], abs(hit[0][0])))
+        (shift, template), evidence = ranked[0]
+        logging.debug(f"WRAM signature: {len(found)} candidates, best shift 0x{shift:X} (evidence {evidence})")
+        if shift:
+            ties = {s + t.character_slots[0] for (s, t), e in ranked if e == evidence}
+            if evidence < MIN_EVIDENCE or len(ties) > 1:
+                logging.info(f"WRAM signature of {module} not conclusive yet ({len(ties)} places, evidence {evidence})")
+                return None
+        return template, self._validate(memory, base, template, shift)
+
+    def _regions(self, pid: int, module: str) -> List[Tuple[int, int]]:
+        """Contiguous readable ranges of the module and its .bss."""
+        regions = []
+        for start, end, perms, _ in module_mappings(pid, module):
+            if not perms.startswith("r"):
+                continue
+            if regions and regions[-1][1] == start:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+        return regions
+
+    def _validate(self, memory: ProcessMemory, base: int, template: EmulatorProfile, shift: int) -> EmulatorProfile:
+        """Checks the ROM pointer (as is, or moved along with WRAM) against a SNES header."""
+        if shift == 0:
+            logging.info(f"Emulator profile confirmed: {template.name}")
+            return template
+        pointer_base = None
+        for candidate in (template.pointer_base, template.pointer_base + shift) if template.pointer_base else ():
+            try:
+                rom = memory.read_u32(base + candidate)
+            except ProcessMemoryError:
+                continue
+            if rom and has_rom_header(memory, rom):
+                pointer_base = candidate
+                break
+        profile = template.shifted(shift, pointer_base)
+        if pointer_base is None:
+            logging.warning(f"{profile.name}: no ROM pointer found, spoiler log and capsule sprites unavailable")
+        logging.info(f"Emulator profile derived: {profile.name}")
+        return profile
+
+    # --- Cache ---
+
+    def _module_key(self, pid: int, module: str) -> Optional[str]:
+        """sha256 of the module file (the mapped file itself, or the process executable)."""
+        started = time.perf_counter()
+        paths = [path for _, _, _, path in module_mappings(pid, module) if path.startswith("/") and os.path.isfile(path)]
+        path = paths[0] if paths else f"/proc/{pid}/exe"
+        try:
+            info = os.stat(path)
+            stamp = (os.path.realpath(path), info.st_size, info.st_mtime_ns)
+            digest = _hash_memo.get(stamp)
+            if digest is None: # Same file, same stamp: don't hash a big executable again
+                sha = hashlib.sha256()
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        sha.update(block)
+                digest = _hash_memo[stamp] = sha.hexdigest()
+        except OSError as e:
+            logging.debug(f"Can't hash {module} of pid {pid}: {e}")
+            return None
+        finally:
+            self.stats.hash_ms += (time.perf_counter() - started) * 1000
+        return f"{digest}:{module.lower()}"
+
+    def _from_cache(self, module: str, entry: dict) -> Optional[EmulatorProfile]:
+        template = next((p for p in self.profiles if p.module == module and p.name == entry.get("template")), None)
+        if template is None:
+            return None # Profile since removed from emulator_addresses.json
+        shift = entry.get("shift", 0)
+        return template if shift == 0 else template.shifted(shift, entry.get("pointer_base"))
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if self._cache is None:
+            try:
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _store(self, key: str, template: EmulatorProfile, profile: EmulatorProfile):
+        cache = self._load_cache()
+        cache[key] = {
+            "template": template.name,
+            "shift": profile.wram_shift,
+            "pointer_base": profile.pointer_base,
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cache, indent=1), encoding="utf-8")
+            os.replace(tmp, self.cache_file)
+        except OSError as e:
+            logging.warning(f"Can't write {self.cache_file}: {e}")
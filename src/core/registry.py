@@ -0,0 +1,250 @@
+"""
+Dense integer IDs for item, location and character names, and the
+bitset-backed maps StateManager keeps its inventory, location and character
+state in.
+
+LogicEngine builds one Registry from the data files at load time; a name
+that only shows up later (a helper reporting an item the data doesn't list,
+a loaded save) gets the next free ID. Bit i of a bitset is names[i], the
+same layout core/dungeon_flags.py and core/item_decoder.py use.
+
+FlagMap (name -> bool) and StateMap (name -> location state) behave like the
+dicts they replace, but keep Python-int bitsets, so StateManager can build
+the effective view (base with overrides on top) with a few bitwise ops.
+Every mutation bumps `version`, which is what those cached views key on, and
+reports the keys it changes to `on_change(name, old value or None)`, which
+is how StateManager knows what a batch changed (core/state_delta.py
+ChangeLog). Setting a key to the value it has is not a change.
+"""
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List
+
+
+class NameTable:
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = [] # ID -> name
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        """ID of `name`, assigning the next one if it is new."""
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def bit(self, name: str) -> int:
+        return 1 << self.intern(name)
+
+    def mask(self, names: Iterable[str]) -> int:
+        bits = 0
+        for name in names:
+            bits |= 1 << self.intern(name)
+        return bits
+
+    def iter_names(self, bits: int) -> Iterator[str]:
+        """Names of the set bits, by ID."""
+        names = self.names
+        while bits:
+            low = bits & -bits
+            yield names[low.bit_length() - 1]
+            bits ^= low
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"NameTable({len(self.names)} names)"
+
+
+class Registry:
+    def __init__(self, items: Iterable[str] = (), locations: Iterable[str] = (), characters: Iterable[str] = ()):
+        self.items = NameTable(items)
+        self.locations = NameTable(locations)
+        self.characters = NameTable(characters) # Party members and capsule monsters
+
+    @classmethod
+    def from_data(cls, data_loader) -> "Registry":
+        """Every tool / scenario item and location the data files name, in file order."""
+        items = list(data_loader.get_tool_items()) + list(data_loader.load_json("scenario_items.json"))
+        locations_logic = data_loader.get_locations_logic()
+        for logic in locations_logic.values():
+            for rule in logic.get("access_rules", []):
+                items += [item.strip() for item in rule.split(',')]
+        locations = list(data_loader.get_locations()) + list(locations_logic) + list(data_loader.get_cities())
+        return cls(items, locations, data_loader.load_json("characters.json"))
+
+    def __repr__(self):
+        return f"Registry({len(self.items)} items, {len(self.locations)} locations, {len(self.characters)} characters)"
+
+
+class FlagMap(MutableMapping):
+    """name -> bool: `present` has the bit of every key, `on` of the True ones."""
+
+    def __init__(self, table: NameTable, values=None, on_change=None):
+        self.table = table
+        self.present = 0
+        self.on = 0
+        self.version = 0
+        self.on_change = None
+        if values:
+            self.update(values)
+        self.on_change = on_change
+
+    def __getitem__(self, name):
+        i = self.table.ids.get(name)
+        if i is None or not self.present >> i & 1:
+            raise KeyError(name)
+        return bool(self.on >> i & 1)
+
+    def __contains__(self, name):
+        i = self.table.ids.get(name)
+        return i is not None and bool(self.present >> i & 1)
+
+    def __setitem__(self, name, value):
+        bit = self.table.bit(name)
+        value = bool(value)
+        if self.present & bit:
+            old = bool(self.on & bit)
+            if old == value:
+                return
+        else:
+            old = None
+        if self.on_change is not None:
+            self.on_change(name, old)
+        self.present |= bit
+        self.on = self.on | bit if value else self.on & ~bit
+        self.version += 1
+
+    def __delitem__(self, name):
+        old = self[name]
+        if self.on_change is not None:
+            self.on_change(name, old)
+        bit = self.table.bit(name)
+        self.present &= ~bit
+        self.on &= ~bit
+        self.version += 1
+
+    def __iter__(self):
+        return self.table.iter_names(self.present)
+
+    def __len__(self):
+        return bin(self.present).count("1")
+
+    def clear(self):
+        self.replace({})
+
+    def replace(self, values):
+        """Same as clear() + update(values), as one change; only keys that differ are reported."""
+        table = self.table
+        present = table.mask(values)
+        on = table.mask(name for name, value in dict(values).items() if value)
+        changed = (self.present ^ present) | (self.on ^ on)
+        if not changed:
+            return
+        if self.on_change is not None:
+            for name in table.iter_names(changed):
+                self.on_change(name, self.get(name))
+        self.present, self.on = present, on
+        self.version += 1
+
+    def as_dict(self) -> Dict[str, bool]:
+        on, ids = self.on, self.table.ids
+        return {name: bool(on >> ids[name] & 1) for name in self}
+
+    def __repr__(self):
+        return f"FlagMap({len(self)} keys, {bin(self.on).count('1')} on)"
+
+
+class StateMap(MutableMapping):
+    """name -> state string: one bitset per state (a handful: STATE_ORDER, "city", ...)."""
+
+    def __init__(self, table: NameTable, values=None, on_change=None):
+        self.table = table
+        self.present = 0
+        self.states: Dict[str, int] = {} # state -> bits of the names in it
+        self.version = 0
+        self.on_change = None
+        if values:
+            self.update(values)
+        self.on_change = on_change
+
+    def __getitem__(self, name):
+        i = self.table.ids.get(name)
+        if i is not None and self.present >> i & 1:
+            for state, bits in self.states.items():
+                if bits >> i & 1:
+                    return state
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        i = self.table.ids.get(name)
+        return i is not None and bool(self.present >> i & 1)
+
+    def __setitem__(self, name, state):
+        bit = self.table.bit(name)
+        old = self.get(name)
+        if old == state:
+            return
+        if self.on_change is not None:
+            self.on_change(name, old)
+        if old is not None:
+            self._drop(bit)
+        self.present |= bit
+        self.states[state] = self.states.get(state, 0) | bit
+        self.version += 1
+
+    def __delitem__(self, name):
+        old = self[name]
+        if self.on_change is not None:
+            self.on_change(name, old)
+        bit = self.table.bit(name)
+        self.present &= ~bit
+        self._drop(bit)
+        self.version += 1
+
+    def _drop(self, bit: int):
+        for state, bits in self.states.items():
+            if bits & bit:
+                bits &= ~bit
+                if bits:
+                    self.states[state] = bits
+                else:
+                    del self.states[state]
+                return
+
+    def __iter__(self):
+        return self.table.iter_names(self.present)
+
+    def __len__(self):
+        return bin(self.present).count("1")
+
+    def clear(self):
+        self.replace({})
+
+    def replace(self, values):
+        """Same as clear() + update(values), as one change; only keys that differ are reported."""
+        present, states, bit = 0, {}, self.table.bit
+        for name, state in dict(values).items():
+            b = bit(name)
+            present |= b
+            states[state] = states.get(state, 0) | b
+        changed = self.present ^ present
+        for state in self.states.keys() | states.keys():
+            changed |= self.states.get(state, 0) ^ states.get(state, 0)
+        if not changed:
+            return
+        if self.on_change is not None:
+            for name in self.table.iter_names(changed):
+                self.on_change(name, self.get(name))
+        self.present, self.states = present, states
+        self.version += 1
+
+    def as_dict(self) -> Dict[str, str]:
+        names = self.table.iter_names
+        return {name: state for state, bits in self.states.items() for name in names(bits)}
+
+    def __repr__(self):
+        return f"StateMap({len(self)} keys, {len(self.states)} states)"
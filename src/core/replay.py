@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+
+from network.capture import CAPTURE_NDJSON, read_capture
+from network.dedup import FrameDeduplicator
+from network.protocol import FRAME_SNAPSHOT, FRAME_DELTA
+from .schema import PayloadSchemaError, decode_payload
+
+
+class ReplayStats:
+    def __init__(self):
+        self.frames = 0       # Records read from the capture
+        self.payloads = 0     # Payloads handed to the callback
+        self.skipped = 0      # Duplicates / heartbeats / garbled frames not delivered
+        self.max_lag = 0.0    # Worst delay behind the scaled capture clock (seconds)
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        rate = self.payloads / self.elapsed if self.elapsed else 0.0
+        return (f"ReplayStats(frames={self.frames}, payloads={self.payloads}, skipped={self.skipped}, "
+                f"elapsed={self.elapsed:.2f}s, {rate:,.0f} payloads/s, max_lag={self.max_lag * 1000:.1f}ms)")
+
+
+class ReplaySource:
+    """
+    Plays a helper capture (network/capture.py) back into a payload callback,
+    normally StateManager.on_helper_data, from its own thread - just like
+    the live helper link does.
+
+    speed: 1.0 = real time, N = N times faster, 0 = as fast as possible.
+    """
+
+    def __init__(self, path, callback, speed=1.0, loop=False):
+        self.path = path
+        self.callback = callback
+        self.speed = speed
+        self.loop = loop
+        self.stats = ReplayStats()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="helper-replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        logging.info(f"Replaying {self.path} at {'max' if not self.speed else f'{self.speed}x'} speed")
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                self._play_once()
+                if not self.loop:
+                    break
+        except Exception as e:
+            logging.error(f"Replay of {self.path} failed: {e}")
+        self.stats.elapsed = time.perf_counter() - started
+        logging.info(f"Replay finished: {self.stats}")
+
+    def _play_once(self):
+        dedup = FrameDeduplicator() # Same pre-decode filtering as the live link
+        first = None
+        wall_start = time.perf_counter()
+
+        for timestamp, frame_type, body in read_capture(self.path):
+            if self._stop.is_set():
+                return
+            self.stats.frames += 1
+            if first is None:
+                first = timestamp # Skip the idle time before the helper connected
+
+            if self.speed:
+                due = wall_start + (timestamp - first) / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    if self._stop.wait(delay):
+                        return
+                else:
+                    self.stats.max_lag = max(self.stats.max_lag, -delay)
+
+            if frame_type not in (CAPTURE_NDJSON, FRAME_SNAPSHOT, FRAME_DELTA) or dedup.is_repeat(body):
+                self.stats.skipped += 1
+                continue
+            try:
+                payload = decode_payload(body)
+            except (PayloadSchemaError, ValueError):
+                self.stats.skipped += 1
+                continue
+            if frame_type == FRAME_DELTA:
+                payload.setdefault("type", "delta")
+            self.stats.payloads += 1
+            self.callback(payload)
@@ -0,0 +1,281 @@
+"""
+Declared shape of helper payloads (see helper/Core/GameState.cs and core/payloads.py)
+and the decoder that turns raw frames into validated HelperPayload objects.
+
+The fastest JSON backend available is used:
+    msgspec  - decodes and type-checks in one pass, straight into the HelperPayload
+               struct (pip install msgspec)
+    orjson   - fast parse, then validated here and moved into the slotted HelperPayload
+    json     - stdlib fallback, same as orjson
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class PayloadSchemaError(ValueError):
+    """A frame parsed as JSON but doesn't look like a helper payload."""
+
+
+# --- Field Checks ---
+# Element types are collected with set(map(type, ...)) so the loop runs in C
+_STR = {str}
+_BOOL = {bool}
+_OPT_STR = {str, type(None)}
+
+def _is_str_list(value) -> bool:
+    return type(value) is list and (not value or set(map(type, value)) == _STR)
+
+def _is_int(value) -> bool:
+    return type(value) is int
+
+def _is_str(value) -> bool:
+    return type(value) is str
+
+def _is_bool(value) -> bool:
+    return type(value) is bool
+
+def _is_number(value) -> bool:
+    return type(value) is int or type(value) is float
+
+def _is_bool_map(value) -> bool:
+    return type(value) is dict and (not value or set(map(type, value.values())) == _BOOL)
+
+def _is_spoiler_log(value) -> bool:
+    # [{"item": ..., "location": ..., "boss": ...}, ...]
+    return type(value) is list and all(
+        type(entry) is dict and set(map(type, entry.values())) <= _OPT_STR
+        for entry in value
+    )
+
+
+# Snapshot fields -> check. None always passes (position-only payloads null everything else).
+SNAPSHOT_SCHEMA = {
+    "inventory": _is_str_list,
+    "scenario": _is_str_list,
+    "characters": _is_str_list,
+    "capsules": _is_str_list,
+    "cleared_locations": _is_str_list,
+    "capsule_sprite_values": _is_str_list,
+    "spoiler_log": _is_spoiler_log,
+    "maidens": _is_bool_map,
+    "player_x": _is_int,
+    "player_y": _is_int,
+    "transport_mode": _is_str,
+    "seed_hash": _is_str, # Static seed data is in core/seed_cache.py under this key
+    "seq": _is_int,
+    "seq_gap": _is_bool,
+    "sent_at": _is_number, # Benchmarks only (tools/bench_transports.py): time.monotonic() at send
+}
+
+# Same contract as types: the fields of HelperPayload, which msgspec checks while parsing
+PAYLOAD_FIELDS = {
+    "inventory": Optional[List[str]],
+    "scenario": Optional[List[str]],
+    "characters": Optional[List[str]],
+    "capsules": Optional[List[str]],
+    "cleared_locations": Optional[List[str]],
+    "capsule_sprite_values": Optional[List[str]],
+    "spoiler_log": Optional[List[Dict[str, Optional[str]]]],
+    "maidens": Optional[Dict[str, bool]],
+    "player_x": Optional[int],
+    "player_y": Optional[int],
+    "transport_mode": Optional[str],
+    "seed_hash": Optional[str],
+    "seq": Optional[int],
+    "seq_gap": Optional[bool],
+    "sent_at": Optional[float],
+    # Delta payloads
+    "type": Optional[str],
+    "seq_start": Optional[int],
+    "set": Optional[Dict[str, Any]],
+    "add": Optional[Dict[str, List[str]]],
+    "remove": Optional[Dict[str, List[str]]],
+}
+_FIELD_NAMES = frozenset(PAYLOAD_FIELDS)
+
+
+class _PayloadAccess:
+    """
+    Dict-style access to a HelperPayload, so merging (core/payloads.py), the
+    mailbox and StateManager take decoded payloads and the plain dicts of
+    in-process sources (core/memory_reader.py) alike. A None field is a
+    missing key; keys that aren't fields are dropped, as when decoding.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HelperPayload":
+        payload = cls()
+        for key, value in data.items():
+            payload[key] = value
+        return payload
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in _FIELD_NAMES else None
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_NAMES:
+            setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def setdefault(self, key, default=None):
+        if self.get(key) is None:
+            self[key] = default
+        return self.get(key, default)
+
+    def pop(self, key, default=None):
+        value = self.get(key, default)
+        self[key] = None
+        return value
+
+    def keys(self) -> List[str]:
+        return [name for name in PAYLOAD_FIELDS if getattr(self, name) is not None]
+
+    def items(self) -> List[tuple]:
+        return [(name, getattr(self, name)) for name in PAYLOAD_FIELDS if getattr(self, name) is not None]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+
+if msgspec is not None:
+    class _PayloadStruct(msgspec.Struct, _PayloadAccess):
+        pass
+
+    # Decoded straight into this: no dict in between
+    HelperPayload = msgspec.defstruct("HelperPayload", [(name, kind, None) for name, kind in PAYLOAD_FIELDS.items()],
+                                      bases=(_PayloadStruct,), module=__name__)
+else:
+    class HelperPayload(_PayloadAccess):
+        """Slotted stand-in for the msgspec struct: every field of PAYLOAD_FIELDS, None if missing."""
+        __slots__ = tuple(PAYLOAD_FIELDS)
+
+        def __init__(self):
+            for name in self.__slots__:
+                setattr(self, name, None)
+
+        def __repr__(self):
+            return f"HelperPayload({', '.join(f'{name}={value!r}' for name, value in self.items())})"
+
+
+def validate_payload(data) -> Dict[str, Any]:
+    """Checks a parsed payload against the schema. Returns it unchanged or raises PayloadSchemaError."""
+    if type(data) is not dict:
+        raise PayloadSchemaError(f"payload is a {type(data).__name__}, not an object")
+    if data.get("type") == "delta":
+        _validate_delta(data)
+        return data
+    _validate_fields(data)
+    return data
+
+
+def _validate_fields(fields: dict):
+    for key, value in fields.items():
+        check = SNAPSHOT_SCHEMA.get(key)
+        # Unknown keys are let through so a newer helper doesn't break an older tracker
+        if check is not None and value is not None and not check(value):
+            raise PayloadSchemaError(f"'{key}' has unexpected value {str(value)[:40]}")
+
+
+def _validate_delta(delta: dict):
+    if not _is_int(delta.get("seq")):
+        raise PayloadSchemaError("delta without an integer 'seq'")
+    set_fields = delta.get("set")
+    if set_fields is not None:
+        if type(set_fields) is not dict:
+            raise PayloadSchemaError("delta 'set' is not an object")
+        _validate_fields(set_fields)
+    for op in ("add", "remove"):
+        members = delta.get(op)
+        if members is None:
+            continue
+        if type(members) is not dict or not all(_is_str_list(x) for x in members.values()):
+            raise PayloadSchemaError(f"delta '{op}' is not a map of name lists")
+
+
+# --- Decoding ---
+BACKENDS = ("msgspec", "orjson", "json")
+
+def available_backends() -> List[str]:
+    available = {"msgspec": msgspec is not None, "orjson": orjson is not None, "json": True}
+    return [name for name in BACKENDS if available[name]]
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def loads(data):
+    """Plain (unvalidated) JSON parse with the fastest backend, for control messages like hello."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class PayloadDecoder:
+    """
+    Raw frame (bytes) -> validated HelperPayload.
+    Raises PayloadSchemaError for anything that isn't a helper payload,
+    ValueError for anything that isn't JSON.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in available_backends():
+            raise ValueError(f"JSON backend '{self.backend}' is not installed")
+
+        if self.backend == "msgspec":
+            self._decoder = msgspec.json.Decoder(HelperPayload)
+            self.decode = self._decode_msgspec
+        elif self.backend == "orjson":
+            self.decode = self._decode_orjson
+        else:
+            self.decode = self._decode_json
+
+    def _decode_msgspec(self, frame) -> "HelperPayload":
+        try:
+            data = self._decoder.decode(frame)
+        except msgspec.ValidationError as e:
+            raise PayloadSchemaError(str(e)) from None
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+        if data.type == "delta":
+            # "set" is typed loosely above, its fields still need the snapshot checks
+            _validate_delta(data)
+        return data
+
+    def _decode_orjson(self, frame) -> "HelperPayload":
+        return HelperPayload.from_dict(validate_payload(orjson.loads(frame)))
+
+    def _decode_json(self, frame) -> "HelperPayload":
+        return HelperPayload.from_dict(validate_payload(json.loads(frame)))
+
+
+_default_decoder = None
+
+def decode_payload(frame) -> "HelperPayload":
+    """Decodes one frame with the default backend (see PayloadDecoder)."""
+    global _default_decoder
+    if _default_decoder is None:
+        _default_decoder = PayloadDecoder()
+        logging.info(f"Helper payloads decoded with '{_default_decoder.backend}'")
+    return _default_decoder.decode(frame)
+
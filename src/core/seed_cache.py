@@ -0,0 +1,177 @@
+"""
+On-disk cache of the static per-seed data the memory reader takes from ROM
+(core/memory_reader.py): the parsed spoiler log, the capsule sprite table and
+the shop tables. None of it changes within a seed, so it is parsed once and
+stored under a hash of the raw ROM bytes it came from. Payloads then only
+carry that hash ("seed_hash") and StateManager restores the data from here,
+so reconnecting, re-syncing or restarting on the same seed costs one lookup.
+
+One gzipped JSON file per seed, spoiler log entries stored as
+[item, location, boss] rows. The least recently used files are pruned past
+MAX_ENTRIES.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.constants import CACHE_DIR
+
+SEED_CACHE_VERSION = 1 # Bump when the stored layout changes; older files are then misses
+MAX_ENTRIES = 32
+HASH_SIZE = 16 # blake2b digest bytes (32 hex characters)
+
+_HASH_PATTERN = re.compile(r"[0-9a-f]{%d}" % (HASH_SIZE * 2))
+_SPOILER_KEYS = ("item", "location", "boss")
+
+
+def seed_hash(*chunks) -> str:
+    """Hex digest of raw ROM bytes (any buffers)."""
+    digest = hashlib.blake2b(digest_size=HASH_SIZE)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_seed_hash(value) -> bool:
+    # Hashes arrive over the transport and end up in a file name
+    return type(value) is str and _HASH_PATTERN.fullmatch(value) is not None
+
+
+class SeedData:
+    """Static data of one seed. Fields are None if the ROM doesn't have them."""
+    __slots__ = ("spoiler_log", "capsule_sprite_values", "shops")
+
+    def __init__(self, spoiler_log: Optional[List[Dict[str, str]]] = None,
+                 capsule_sprite_values: Optional[List[str]] = None,
+                 shops: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.spoiler_log = spoiler_log
+        self.capsule_sprite_values = capsule_sprite_values
+        self.shops = shops
+
+    def to_dict(self) -> dict:
+        return {
+            "v": SEED_CACHE_VERSION,
+            "spoiler_log": None if self.spoiler_log is None else [
+                [entry.get(key) for key in _SPOILER_KEYS] for entry in self.spoiler_log
+            ],
+            "capsule_sprite_values": self.capsule_sprite_values,
+            "shops": self.shops,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SeedData":
+        if data.get("v") != SEED_CACHE_VERSION:
+            raise ValueError(f"seed cache version {data.get('v')}, expected {SEED_CACHE_VERSION}")
+        rows = data.get("spoiler_log")
+        return cls(
+            spoiler_log=None if rows is None else [dict(zip(_SPOILER_KEYS, row)) for row in rows],
+            capsule_sprite_values=data.get("capsule_sprite_values"),
+            shops=data.get("shops"),
+        )
+
+    def __repr__(self):
+        return (f"SeedData(spoiler_log={len(self.spoiler_log or ())} entries, "
+                f"capsule_sprite_values={self.capsule_sprite_values}, shops={len(self.shops or ())} cities)")
+
+
+class SeedCacheStats:
+    def __init__(self):
+        self.hits = 0       # Served from memory or disk
+        self.misses = 0
+        self.stores = 0
+        self.errors = 0     # Unreadable / unwritable files
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return f"SeedCacheStats(hits={self.hits}, misses={self.misses}, stores={self.stores}, errors={self.errors})"
+
+
+class SeedCache:
+    """
+    hash -> SeedData, kept in memory for this process and on disk across runs.
+    Shared by the payload source and StateManager (see default_cache()).
+    """
+
+    def __init__(self, directory=None, max_entries: int = MAX_ENTRIES):
+        self.directory = Path(directory) if directory else CACHE_DIR / "seeds"
+        self.max_entries = max_entries
+        self.stats = SeedCacheStats()
+        self._memory: Dict[str, SeedData] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[SeedData]:
+        if not is_seed_hash(key):
+            self.stats.misses += 1
+            return None
+        data = self._memory.get(key)
+        if data is not None:
+            self.stats.hits += 1
+            return data
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                data = SeedData.from_dict(json.loads(f.read()))
+            os.utime(path) # Most recently used
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"Seed cache: dropping unreadable {path.name}: {e}")
+            self.stats.errors += 1
+            self.stats.misses += 1
+            return None
+        self._memory[key] = data
+        self.stats.hits += 1
+        return data
+
+    def put(self, key: str, data: SeedData) -> bool:
+        """Stores `data` under `key`. False if it couldn't be written (it is still kept in memory)."""
+        if not is_seed_hash(key):
+            raise ValueError(f"Not a seed hash: {key!r}")
+        self._memory[key] = data
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            raw = json.dumps(data.to_dict(), separators=(",", ":")).encode("utf-8")
+            tmp.write_bytes(gzip.compress(raw))
+            os.replace(tmp, path) # Readers never see a half-written file
+        except OSError as e:
+            logging.warning(f"Seed cache: can't write {path}: {e}")
+            self.stats.errors += 1
+            return False
+        self.stats.stores += 1
+        self._prune()
+        return True
+
+    def _prune(self):
+        try:
+            files = sorted(self.directory.glob("*.json.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+            for path in files[self.max_entries:]:
+                path.unlink()
+                self._memory.pop(path.name.split(".")[0], None)
+        except OSError as e:
+            logging.debug(f"Seed cache: prune failed: {e}")
+
+    def __repr__(self):
+        return f"SeedCache({self.directory}, {self.stats})"
+
+
+_default_cache = None
+
+def default_cache() -> SeedCache:
+    """Process-wide cache in CACHE_DIR, so the reader's stores are the tracker's hits."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SeedCache()
+    return _default_cache
@@ -0,0 +1,78 @@
+"""
+Typed change-set StateManager emits once per batch (StateManager.batch(),
+signal state_changed). The state's maps report every key they change into a
+ChangeLog as it happens (old value, first change wins); when the batch ends
+the delta is built from those keys against the live state, so N mutations of
+the same thing still end up as one entry and nothing the batch didn't touch
+is looked at.
+"""
+from typing import Any, Dict, Optional, Set
+
+
+class ChangeLog:
+    """
+    keys       section -> key -> value before the first change (None: it wasn't there)
+    sections   whole section -> its saved form before the first change
+    """
+    __slots__ = ("keys", "sections")
+
+    def __init__(self):
+        self.keys: Dict[str, Dict[str, Any]] = {}
+        self.sections: Dict[str, Any] = {}
+
+    def key_changed(self, section: str, key: str, old):
+        self.keys.setdefault(section, {}).setdefault(key, old)
+
+    def old(self, section: str, key: str, current):
+        """Value `key` had when the log started; `current` if it didn't change since."""
+        changed = self.keys.get(section)
+        return changed[key] if changed and key in changed else current
+
+    def __bool__(self):
+        return bool(self.keys or self.sections)
+
+    def __repr__(self):
+        return (f"ChangeLog({sum(len(keys) for keys in self.keys.values())} keys, "
+                f"{len(self.sections)} sections)")
+
+
+class StateDelta:
+    """
+    inventory_added / inventory_removed   effective (incl. overrides) item names
+    locations                              location -> new effective state, None when it
+                                           went back to the logic engine
+    characters                             name -> obtained, for obtained or active changes
+    assigned / unassigned                  location -> character name (map sprites)
+    """
+    __slots__ = ("inventory_added", "inventory_removed", "locations", "characters", "assigned", "unassigned")
+
+    def __init__(self):
+        self.inventory_added: Set[str] = set()
+        self.inventory_removed: Set[str] = set()
+        self.locations: Dict[str, Optional[str]] = {}
+        self.characters: Dict[str, bool] = {}
+        self.assigned: Dict[str, str] = {}
+        self.unassigned: Dict[str, str] = {}
+
+    @property
+    def inventory_changed(self) -> bool:
+        return bool(self.inventory_added or self.inventory_removed)
+
+    def is_empty(self) -> bool:
+        return not (self.inventory_changed or self.locations or self.characters or self.assigned or self.unassigned)
+
+    def as_dict(self) -> dict:
+        return {
+            "inventory_added": sorted(self.inventory_added),
+            "inventory_removed": sorted(self.inventory_removed),
+            "locations": dict(self.locations),
+            "characters": dict(self.characters),
+            "assigned": dict(self.assigned),
+            "unassigned": dict(self.unassigned),
+        }
+
+    def __repr__(self):
+        return (f"StateDelta(+{len(self.inventory_added)}/-{len(self.inventory_removed)} items, "
+                f"{len(self.locations)} locations, {len(self.characters)} characters, "
+                f"{len(self.assigned)} assigned, {len(self.unassigned)} unassigned)")
+
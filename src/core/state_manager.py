@@ -1,9 +1,73 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QPointF
+from PyQt6.QtCore import QObject, pyqtSignal, QPointF, Qt
+import copy
+import functools
 import json
 import logging
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 
 from .helper_interface import HelperInterface
+from .history import HistoryEntry, UndoHistory
+from .journal import DOCUMENT_SECTIONS, key_op
+from .payloads import is_delta, is_reset
+from .registry import FlagMap, Registry, StateMap
+from .poll_scheduler import PollScheduler
+from .mailbox import PayloadMailbox
+from .schema import HelperPayload
+from .seed_cache import default_cache
+from .state_delta import ChangeLog, StateDelta
+from network.dedup import SectionFingerprints
+
+# Fine-grained signals a batch collapses: signal -> how many leading args name the subject (last emission wins)
+_COALESCED = {"inventory_changed": 0, "location_changed": 1, "history_changed": 0,
+              "shop_items_changed": 0, "hints_changed": 0, "player_position_changed": 0}
+
+# Keyed section -> the overrides laid on top of it in the effective view
+_OVERRIDES = {"inventory": "inventory_overrides", "locations": "location_overrides"}
+
+
+def _batched(method):
+    """Runs a StateManager method as one batch (see StateManager.batch)."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _undoable(label: str):
+    """Records a manual StateManager action in its undo history (see StateManager.undo)."""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._recording(label):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _Section:
+    """A whole (not keyed) document section in a StateManager attribute: replacing it is a change."""
+
+    def __init__(self, section: str):
+        self.section = section
+
+    def __set_name__(self, owner, attr):
+        self.attr = attr
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.attr]
+        except KeyError:
+            raise AttributeError(self.attr) from None
+
+    def __set__(self, obj, value):
+        if self.attr in obj.__dict__:
+            obj._touch(self.section)
+        obj.__dict__[self.attr] = value
+
 
 class StateManager(QObject):
     """
@@ -15,16 +79,28 @@ class StateManager(QObject):
     inventory_changed = pyqtSignal(dict)  # Emits full inventory dict
     location_changed = pyqtSignal(str, str)  # location_name, new_state (red/green/grey)
     player_position_changed = pyqtSignal(float, float)  # x, y (canvas coordinates)
-    character_changed = pyqtSignal(str, bool)  # name, is_obtained
+    character_changed = pyqtSignal(str, bool)  # name, is_obtained (only when it actually changed)
+    characters_changed = pyqtSignal(dict) # {name: is_obtained} of every character whose obtained/active state changed
+    state_changed = pyqtSignal(object) # StateDelta, once per batch (core/state_delta.py)
     character_assigned = pyqtSignal(str, str) # location, character_name
     character_unassigned = pyqtSignal(str, str) # location, character_name
     
     # Signal for external auto-updates (from network)
-    auto_update_received = pyqtSignal(dict) # payload
+    auto_update_received = pyqtSignal(object) # payload: HelperPayload (core/schema.py) or dict
     reset_occurred = pyqtSignal() # New signal for global reset
+    connection_state_changed = pyqtSignal(str) # Helper link state (network/health.py LINK_*)
+    _mailbox_ready = pyqtSignal() # Internal: helper thread -> main thread wake-up
     
     shop_items_changed = pyqtSignal(list) # List of {location, name} dictionaries
     hints_changed = pyqtSignal(str)
+    history_changed = pyqtSignal(bool, bool) # can_undo, can_redo
+    
+    # Replacing these is recorded in the batch's ChangeLog; changing them in place needs a _touch() first
+    _active_party = _Section("active_party")
+    _obtained_capsules = _Section("obtained_capsules")
+    _capsule_sprite_mapping = _Section("capsule_mapping")
+    shop_items = _Section("shop_items")
+    hints_text = _Section("hints")
     
     def __init__(self, logic_engine):
         super().__init__()
@@ -32,29 +108,89 @@ class StateManager(QObject):
         
         # --- Auto Tracker Helper ---
         self.helper = HelperInterface(self.on_helper_data)
+        # Called from the I/O thread; the queued signal delivers it on the GUI thread
+        self.helper.state_callback = self.connection_state_changed.emit
         self.auto_update_received.connect(self.process_auto_update)
         
+        # Payloads are coalesced here so a stalled GUI thread only processes the latest state
+        self.mailbox = PayloadMailbox()
+        self._mailbox_ready.connect(self._drain_mailbox, Qt.ConnectionType.QueuedConnection)
+        
         # --- Internal State ---
-        self._inventory: Dict[str, bool] = {}
-        self._locations: Dict[str, str] = {}  # name -> state
-        self._characters: Dict[str, bool] = {}
-        self._character_locations: Dict[str, str] = {}
+        # What changed since the last batch ended, reported by the maps as it happens (see _key_changed)
+        self._changes = ChangeLog()
+        # Items, locations and characters by the dense IDs of the registry, as bitsets (core/registry.py)
+        self.registry = getattr(logic_engine, 'registry', None) or Registry()
+        self._inventory = FlagMap(self.registry.items, on_change=functools.partial(self._key_changed, "inventory"))
+        self._locations = StateMap(self.registry.locations, on_change=functools.partial(self._key_changed, "locations"))  # name -> state
+        self._effective = {} # "inventory" / "locations" -> (versions, view), see _effective_view
+        self._characters = FlagMap(self.registry.characters, on_change=functools.partial(self._key_changed, "characters"))
+        # location -> character name
+        self._character_locations = StateMap(self.registry.locations, on_change=functools.partial(self._key_changed, "character_locations"))
         self._active_party = set()
         self._active_party_list = [] # Ordered list for Sprite Display
         self._obtained_capsules = set()
+        
+        # --- Batches ---
+        # Signals raised inside `with batch():` are held back and sent once when it ends.
+        self._batch_depth = 0
+        self._batch_signals = {} # key -> (signal name, args), see _emit
         self._player_pos = QPointF(0, 0)
         self._game_world_size = (4096, 4096)  # Standard SNES Map Size
         self._canvas_size = (400, 400)        # Fixed Canvas Size
         self.shop_items = [] # List of {location, name}
         self.hints_text = ""
         
+        # --- Delta Sync ---
+        # Deltas are applied on top of the last snapshot; `seq` guards against gaps.
+        self._last_seq: Optional[int] = None
+        self._resync_pending = False
+        self.resync_requests = 0
+        self._sync_sources = [] # request_sync of in-process sources (e.g. core/memory_reader.py)
+        # Per-category rates for the helper: the native reader's base schedule (core/poll_scheduler.py)
+        self.helper_poll_ms = PollScheduler().poll_ms()
+        self._auto_cleared = set() # cleared_locations as last reported by the helper
+        self._auto_scenario = set() # scenario items as last reported (kept while 'keys' is off)
+        self._spoiler_log = None
+        self._player_game_pos = (0, 0)
+        
+        # --- Journal ---
+        # Append-only autosave of every batch (core/journal.py), see open_journal()
+        self.journal = None
+        
+        # --- Undo ---
+        # Manual actions as the ops that redo / undo them (core/history.py), see undo()
+        self.history = UndoHistory()
+        self._recorded = None # ChangeLog of the undoable action that is running, see _recording
+        
+        # --- Seed Cache ---
+        # Static ROM data (spoiler log, capsule sprites, shops) arrives as a "seed_hash" into this cache.
+        self.seed_cache = default_cache()
+        self._seed_hash: Optional[str] = None
+        self.seed_shops = {} # city -> category -> item names, from the ROM of the current seed (item search dialog)
+        
+        # --- Duplicate Suppression ---
+        # Per-section digests of the last applied snapshot; unchanged sections are skipped.
+        self._sections = SectionFingerprints()
+        self._changed_sections = None # Set while a fingerprinted snapshot is being processed
+        
         # --- Overrides ---
         # If a user manually clicks something, it gets locked here.
         # External data updates for locked items are ignored until reset.
-        self._manual_inventory_overrides: Dict[str, bool] = {}
-        self._manual_location_overrides: Dict[str, str] = {}
+        self._manual_inventory_overrides = FlagMap(self.registry.items, on_change=functools.partial(self._key_changed, "inventory_overrides"))
+        self._manual_location_overrides = StateMap(self.registry.locations, on_change=functools.partial(self._key_changed, "location_overrides"))
         self._manual_character_overrides: Dict[str, bool] = {}
         
+        # Keyed sections of the document (core/journal.py KEYED_SECTIONS) -> live map
+        self._keyed = {
+            "inventory_overrides": self._manual_inventory_overrides,
+            "location_overrides": self._manual_location_overrides,
+            "character_locations": self._character_locations,
+            "inventory": self._inventory,
+            "locations": self._locations,
+            "characters": self._characters,
+        }
+        
         # --- Load Location Mapping ---
         try:
              import os
@@ -94,20 +230,49 @@ class StateManager(QObject):
     
     def get_inventory(self) -> Dict[str, bool]:
         """Explicit getter for inventory."""
-        effective = self._inventory.copy()
-        effective.update(self._manual_inventory_overrides)
-        return effective
+        return self._effective_view("inventory", self._build_inventory)
 
     @property
     def inventory(self) -> Dict[str, bool]:
-        """Returns effective inventory (actual + overrides)."""
+        """Returns effective inventory (actual + overrides). Shared until the next change: don't modify it."""
         return self.get_inventory()
 
+    @property
+    def inventory_bits(self) -> int:
+        """Effective obtained items as a bitset over registry.items."""
+        base, overrides = self._inventory, self._manual_inventory_overrides
+        return (base.on & ~overrides.present) | overrides.on
+
     @property
     def locations(self) -> Dict[str, str]:
-        """Returns effective location states."""
-        effective = self._locations.copy()
-        effective.update(self._manual_location_overrides)
+        """Returns effective location states. Shared until the next change: don't modify it."""
+        return self._effective_view("locations", self._build_locations)
+
+    def _effective_view(self, name: str, build):
+        # Rebuilt (as a new dict) only after base or overrides changed; handed-out views stay as they were
+        if name == "inventory":
+            versions = (self._inventory.version, self._manual_inventory_overrides.version)
+        else:
+            versions = (self._locations.version, self._manual_location_overrides.version)
+        cached = self._effective.get(name)
+        if cached is None or cached[0] != versions:
+            cached = self._effective[name] = (versions, build())
+        return cached[1]
+
+    def _build_inventory(self) -> Dict[str, bool]:
+        overrides = self._manual_inventory_overrides
+        on, ids = self.inventory_bits, self.registry.items.ids
+        return {name: bool(on >> ids[name] & 1)
+                for name in self.registry.items.iter_names(self._inventory.present | overrides.present)}
+
+    def _build_locations(self) -> Dict[str, str]:
+        overrides = self._manual_location_overrides
+        names = self.registry.locations.iter_names
+        effective = {}
+        for state in self._locations.states.keys() | overrides.states.keys():
+            bits = (self._locations.states.get(state, 0) & ~overrides.present) | overrides.states.get(state, 0)
+            for name in names(bits):
+                effective[name] = state
         return effective
         
     def get_player_position(self) -> QPointF:
@@ -116,36 +281,43 @@ class StateManager(QObject):
 
     # --- Manual Interactions (High Priority) ---
     
+    @_undoable("Location")
+    @_batched
     def set_manual_location_state(self, name: str, state: str):
         """User manually clicked a location dot."""
         self._manual_location_overrides[name] = state
-        self.location_changed.emit(name, state)
+        self._emit("location_changed", name, state)
         logging.info(f"Manual override: Location {name} -> {state}")
 
+    @_undoable("Item")
+    @_batched
     def toggle_manual_inventory(self, item_name: str):
         """User clicked an item icon."""
         current = self.inventory.get(item_name, False)
         new_state = not current
         self._manual_inventory_overrides[item_name] = new_state
-        self.inventory_changed.emit(self.inventory)
+        self._emit("inventory_changed", self.inventory)
         logging.info(f"Manual override: Item {item_name} -> {new_state}")
 
+    @_batched
     def reset_overrides(self):
         """Clears all manual overrides, reverting to raw external data."""
         self._manual_inventory_overrides.clear()
         self._manual_location_overrides.clear()
         self._manual_character_overrides.clear()
+        self._sections.forget()
         
         # Re-emit everything to sync UI
-        self.inventory_changed.emit(self._inventory)
+        self._emit("inventory_changed", self.inventory)
         for loc, state in self._locations.items():
-            self.location_changed.emit(loc, state)
+            self._emit("location_changed", loc, state)
         # TODO: emit characters
         
         logging.info("Manual overrides reset.")
 
     # --- External Data Updates (Low Priority) ---
     
+    @_batched
     def update_from_external(self, data: Dict[str, Any]):
         """
         Ingest data from the C# helper.
@@ -155,9 +327,9 @@ class StateManager(QObject):
         if 'inventory' in data:
             raw_inventory = data['inventory']
             # Only update internal state, do not overwrite overrides
-            self._inventory = raw_inventory
+            self._inventory.replace(raw_inventory)
             # Emit key-by-key or full update? Full update is safer for UI consistency
-            self.inventory_changed.emit(self.inventory)
+            self._emit("inventory_changed", self.inventory)
 
         # 2. Update Locations
         # Logic is complex here: 'cleared_locations' comes from memory (grey).
@@ -167,7 +339,7 @@ class StateManager(QObject):
             for loc in data['cleared_locations']:
                 if loc not in self._manual_location_overrides:
                     self._locations[loc] = "cleared"
-                    self.location_changed.emit(loc, "cleared")
+                    self._emit("location_changed", loc, "cleared")
 
         # 3. Update Player Position (Toroidal Wrap Logic)
         if 'player_x' in data and 'player_y' in data:
@@ -180,6 +352,8 @@ class StateManager(QObject):
         Calculates canvas position from game coordinates.
         Handles toroidal wrapping visuals if necessary (though straight mapping is usually fine for a 1:1 map).
         """
+        self._player_game_pos = (game_x, game_y)
+        
         # 1. Scale to Canvas
         scale_x = self._canvas_size[0] / self._game_world_size[0]
         scale_y = self._canvas_size[1] / self._game_world_size[1]
@@ -202,9 +376,16 @@ class StateManager(QObject):
         """
         Updates the filter mask for auto-tracking.
         Expected keys: 'chars', 'tools', 'keys', 'maidens', 'pos' (all bools).
+        The helper reads the enabled ones at helper_poll_ms (per category).
         """
         self._tracking_options = options
+        # Sections skipped while a category was off have to be applied again
+        self._sections.forget()
         logging.info(f"Tracking options updated: {options}")
+        # Disabled categories aren't even read by the helper anymore (network/commands.py),
+        # the others at the rates of the native reader's schedule (helper_poll_ms).
+        # Not connected yet is fine: the mask goes out as soon as a helper says hello.
+        self.helper.set_options(options, self.helper_poll_ms)
 
     def _is_tracking_enabled(self, category: str) -> bool:
         """Returns True if the category is enabled in tracking options (default True)."""
@@ -216,7 +397,7 @@ class StateManager(QObject):
     @property
     def obtained_characters(self) -> Dict[str, bool]:
         """Returns all obtained characters (whether in party or not)."""
-        return self._characters.copy()
+        return self._characters.as_dict()
 
     @property
     def active_party(self) -> set:
@@ -232,10 +413,227 @@ class StateManager(QObject):
     def get_character_at_location(self, location_name: str) -> Optional[str]:
         return self._character_locations.get(location_name)
 
+    @_batched
     def set_character_obtained(self, name: str, obtained: bool):
+        if self._changed_sections is None and self._characters.get(name) != obtained:
+            # Manual toggles must not stick just because the helper keeps sending the same party
+            self._sections.forget("characters", "capsules")
         self._characters[name] = obtained
-        self.character_changed.emit(name, obtained)
-        
+
+    # --- Batches ---
+
+    def _key_changed(self, section: str, key: str, old):
+        """on_change of the keyed sections' maps: `key` of `section` is about to change from `old`."""
+        self._changes.key_changed(section, key, old)
+        if self._recorded is not None:
+            self._recorded.key_changed(section, key, old)
+
+    def _touch(self, section: str):
+        """Whole section `section` is about to change: keeps its saved form as it was, once per batch / action."""
+        logs = [log for log in (self._changes, self._recorded) if log is not None and section not in log.sections]
+        if logs:
+            old = copy.deepcopy(self._section(section))
+            for log in logs:
+                log.sections[section] = old
+
+    @contextmanager
+    def batch(self):
+        """
+        Transaction over the state: fine-grained signals raised inside are held
+        back, and when the (outermost) block ends the UI gets
+          - inventory_changed once, location_changed once per location (last state),
+            character_assigned / character_unassigned in order
+          - character_changed per character that actually changed, then one characters_changed
+          - one state_changed(StateDelta) with everything that changed, if anything did
+        Nests: inner blocks fold into the outer one.
+        """
+        if not self._batch_depth:
+            self._batch_signals = {}
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._commit_batch()
+
+    def _emit(self, signal: str, *args):
+        """Emits `signal` now, or at the end of the running batch."""
+        if not self._batch_depth:
+            getattr(self, signal).emit(*args)
+            return
+        subject = _COALESCED.get(signal)
+        key = (signal,) + args[:subject] if subject is not None else (signal, len(self._batch_signals))
+        self._batch_signals.pop(key, None) # Re-queued at the end: it now happens after what came in between
+        self._batch_signals[key] = (signal, args)
+
+    def _commit_batch(self):
+        changes, self._changes = self._changes, ChangeLog()
+        delta = self._delta(changes)
+        signals = list(self._batch_signals.values())
+        self._batch_signals = {} # Slots may start batches of their own
+        if self.journal is not None and changes:
+            self.journal.append(self._change_ops(changes)[0])
+        for signal, args in signals:
+            getattr(self, signal).emit(*args)
+        for name, obtained in delta.characters.items():
+            self.character_changed.emit(name, obtained)
+        if delta.characters:
+            self.characters_changed.emit(dict(delta.characters))
+        if not delta.is_empty():
+            self.state_changed.emit(delta)
+
+    def _change_ops(self, changes: ChangeLog):
+        """
+        (redo, undo) ops (core/journal.py) of `changes`: from its old values to
+        the live ones and back. Keys that ended up the same are left out.
+        """
+        redo, undo = [], []
+        for section, keys in changes.keys.items():
+            live = self._keyed[section]
+            for key, old in keys.items():
+                value = live.get(key)
+                if value != old:
+                    redo.append(key_op(section, key, value))
+                    undo.append(key_op(section, key, old))
+        for section, old in changes.sections.items():
+            value = self._section(section)
+            if value != old:
+                redo.append({"s": section, "v": copy.deepcopy(value)})
+                undo.append({"s": section, "v": old})
+        return redo, undo
+
+    def _delta(self, changes: ChangeLog) -> StateDelta:
+        """What the UI draws from that changed, for the keys in `changes` (old values) against the live state."""
+        delta = StateDelta()
+        for name in sorted(self._changed_keys(changes, "inventory")):
+            before, after = self._effective_change(changes, "inventory", name)
+            if bool(before) != bool(after):
+                (delta.inventory_added if after else delta.inventory_removed).add(name)
+        for name in sorted(self._changed_keys(changes, "locations")):
+            before, after = self._effective_change(changes, "locations", name)
+            if before != after:
+                delta.locations[name] = after
+
+        # Characters: (obtained, active) is what the character widgets draw from
+        characters, party, capsules = self._characters, self._active_party, self._obtained_capsules
+        old_party = set(changes.sections.get("active_party", party))
+        old_capsules = set(changes.sections.get("obtained_capsules", capsules))
+        names = changes.keys.get("characters", {}).keys() | (old_party ^ party) | (old_capsules ^ capsules)
+        for name in sorted(names):
+            obtained = bool(characters.get(name))
+            before = (bool(changes.old("characters", name, characters.get(name))), name in old_party or name in old_capsules)
+            if before != (obtained, name in party or name in capsules):
+                delta.characters[name] = obtained
+
+        for location in sorted(changes.keys.get("character_locations", {})):
+            before = changes.old("character_locations", location, None)
+            after = self._character_locations.get(location)
+            if before == after:
+                continue
+            if before:
+                delta.unassigned[location] = before
+            if after:
+                delta.assigned[location] = after
+        return delta
+
+    def _changed_keys(self, changes: ChangeLog, section: str) -> set:
+        """Keys of `section` that changed in the base or in its overrides."""
+        return changes.keys.get(section, {}).keys() | changes.keys.get(_OVERRIDES[section], {}).keys()
+
+    def _effective_change(self, changes: ChangeLog, section: str, name: str):
+        """(before, after) of `name` in the effective view of `section`: the override if there is one, else the base."""
+        base, overrides = self._keyed[section], self._keyed[_OVERRIDES[section]]
+        before, after = changes.old(_OVERRIDES[section], name, overrides.get(name)), overrides.get(name)
+        if before is None:
+            before = changes.old(section, name, base.get(name))
+        if after is None:
+            after = base.get(name)
+        return before, after
+
+    # --- Undo / Redo ---
+
+    @contextmanager
+    def _recording(self, label: str):
+        """Batch around an undoable action; the outermost one goes into the history."""
+        if self._recorded is not None: # Nested (assigning sets the location too): part of the outer action
+            with self.batch():
+                yield
+            return
+        self._recorded = ChangeLog() # Filled by the setters as the action runs (_key_changed, _touch)
+        try:
+            with self.batch():
+                yield
+                redo_ops, undo_ops = self._change_ops(self._recorded)
+                if redo_ops:
+                    self.history.push(HistoryEntry(label, redo_ops, undo_ops))
+                    self._emit("history_changed", self.history.can_undo, self.history.can_redo)
+        finally:
+            self._recorded = None
+
+    def undo(self) -> bool:
+        """Reverts the last manual action as one batch. False if there is nothing to undo."""
+        entry = self.history.undo()
+        if entry is None:
+            return False
+        self._apply_document_ops(entry.undo_ops)
+        logging.info(f"Undo: {entry.label}")
+        return True
+
+    def redo(self) -> bool:
+        entry = self.history.redo()
+        if entry is None:
+            return False
+        self._apply_document_ops(entry.redo_ops)
+        logging.info(f"Redo: {entry.label}")
+        return True
+
+    def clear_history(self):
+        self.history.clear()
+        self._emit("history_changed", False, False)
+
+    def _apply_document_ops(self, ops):
+        """Applies ops on _document() sections to the live state, with the signals the UI needs."""
+        tables = self._keyed
+        with self.batch():
+            for op in ops:
+                name = op["s"]
+                if name in tables:
+                    key = op["k"]
+                    old = tables[name].get(key)
+                    if "v" in op:
+                        tables[name][key] = op["v"]
+                    else:
+                        tables[name].pop(key, None)
+                    if name in ("inventory", "inventory_overrides"):
+                        self._emit("inventory_changed", self.inventory)
+                    elif name in ("locations", "location_overrides"):
+                        state = self.locations.get(key)
+                        if state:
+                            self._emit("location_changed", key, state)
+                    elif name == "character_locations":
+                        if old:
+                            self._emit("character_unassigned", key, old)
+                        if "v" in op:
+                            self._emit("character_assigned", key, op["v"])
+                elif name == "active_party":
+                    self._active_party = set(op.get("v") or [])
+                elif name == "obtained_capsules":
+                    self._obtained_capsules = set(op.get("v") or [])
+                elif name == "capsule_mapping":
+                    self._capsule_sprite_mapping = copy.deepcopy(op.get("v"))
+                elif name == "shop_items":
+                    self.shop_items = copy.deepcopy(op.get("v") or [])
+                    self._emit("shop_items_changed", self.shop_items)
+                elif name == "hints":
+                    self.hints_text = op.get("v") or ""
+                    self._emit("hints_changed", self.hints_text)
+            # Manual toggles must not stick just because the helper keeps sending the same data
+            self._sections.forget()
+            self._emit("history_changed", self.history.can_undo, self.history.can_redo)
+
+    @_undoable("Assign character")
+    @_batched
     def assign_character_to_location(self, location: str, character_name: str):
         # 0. Prevent Redundant Updates
         if self._character_locations.get(location) == character_name:
@@ -252,14 +650,14 @@ class StateManager(QObject):
              # Remove from old location, but keep obtained status (moving)
              # Just emit unassign so map sprite is removed
              del self._character_locations[prev_loc]
-             self.character_unassigned.emit(prev_loc, character_name)
+             self._emit("character_unassigned", prev_loc, character_name)
 
         # 2. Check if location already has someone (Overwrite)
         old_char = self._character_locations.get(location)
         if old_char and old_char != character_name:
              # User says: "Previous character needs to be dimmed" (Reset)
              self.set_character_obtained(old_char, False)
-             self.character_unassigned.emit(location, old_char)
+             self._emit("character_unassigned", location, old_char)
              
         # 3. Assign
         self._character_locations[location] = character_name
@@ -269,8 +667,10 @@ class StateManager(QObject):
         self.set_manual_location_state(location, "cleared")
         
         # Emit signal for MapWidget
-        self.character_assigned.emit(location, character_name)
+        self._emit("character_assigned", location, character_name)
         
+    @_undoable("Remove character")
+    @_batched
     def remove_character_assignment(self, location: str):
         char = self._character_locations.pop(location, None)
         if char:
@@ -278,86 +678,166 @@ class StateManager(QObject):
             # Since inactive roster = obtained=True but not in Active Party,
             # we set obtained=False.
             self.set_character_obtained(char, False)
-            self.character_unassigned.emit(location, char)
+            self._emit("character_unassigned", location, char)
             logging.debug(f"StateManager: Removed {char} from {location} and set to Not Obtained.")
 
+    @_undoable("Add shop item")
+    @_batched
     def register_shop_item(self, location, item_name):
         # Check duplicate
         for entry in self.shop_items:
             if entry['location'] == location and entry['name'] == item_name:
                 return
+        self._touch("shop_items")
         self.shop_items.append({'location': location, 'name': item_name})
-        self.shop_items_changed.emit(self.shop_items)
+        self._emit("shop_items_changed", self.shop_items)
         
+    @_undoable("Remove shop item")
+    @_batched
     def unregister_shop_item(self, location, item_name):
         self.shop_items = [e for e in self.shop_items if not (e['location'] == location and e['name'] == item_name)]
-        self.shop_items_changed.emit(self.shop_items)
+        self._emit("shop_items_changed", self.shop_items)
         
+    @_batched
     def clear_shop_items(self):
         self.shop_items = []
-        self.shop_items_changed.emit(self.shop_items)
+        self._emit("shop_items_changed", self.shop_items)
 
+    @_batched
     def update_hints(self, text):
         if self.hints_text != text:
              self.hints_text = text
-             self.hints_changed.emit(text)
+             self._emit("hints_changed", text)
 
     def toggle_auto_tracking(self, enabled: bool):
         """Starts or stops the C# helper process."""
         if enabled:
             logging.info("Starting Auto-Tracker Helper...")
+            self._sections.forget()
             self.helper.start()
         else:
             logging.info("Stopping Auto-Tracker Helper...")
             self.helper.stop()
+            self.mailbox.clear()
+            logging.info(f"Payload mailbox: {self.mailbox.stats}")
+            logging.info(f"Duplicate suppression: helper {self.helper.dedup.stats}, sections {self._sections.stats}")
+            logging.info(f"Helper link: {self.helper.health}")
+
+    @property
+    def connection_state(self) -> str:
+        """Current helper link state: stopped / waiting / connected / unresponsive / restarting / failed."""
+        return self.helper.health.state
+
+    def link_metrics(self) -> dict:
+        """RTT, reconnect / restart counts and framing counters of the helper link."""
+        return self.helper.metrics()
 
     def on_helper_data(self, data: dict):
-        """Callback from HelperInterface thread. Bridges to main thread via signals if needed."""
-        self.auto_update_received.emit(data)
+        """
+        Callback from HelperInterface thread.
+        Posts into the mailbox and wakes the main thread only if it isn't already due to drain.
+        """
+        if self.mailbox.post(data):
+            self._mailbox_ready.emit()
+
+    def _drain_mailbox(self):
+        """Main thread: processes whatever accumulated since the last wake-up (usually one merged payload)."""
+        for payload in self.mailbox.drain():
+            if is_delta(payload):
+                # The delta moves state away from the last snapshot's sections
+                self._sections.forget(*(payload.get("set") or {}), *(payload.get("add") or {}), *(payload.get("remove") or {}))
+            else:
+                self._changed_sections = self._sections.update(payload)
+                if not self._changed_sections and not payload.get("seq_gap"):
+                    # Same state as last time: nothing to apply and nothing to redraw
+                    if payload.get("seq") is not None:
+                        self._last_seq = payload["seq"]
+                        self._resync_pending = False
+                    continue
+            try:
+                self.auto_update_received.emit(payload)
+            finally:
+                self._changed_sections = None
+
+    def _section_changed(self, *keys) -> bool:
+        """True if any of the snapshot sections differ from the last applied ones (or weren't fingerprinted)."""
+        if self._changed_sections is None:
+            return True
+        return any(key in self._changed_sections for key in keys)
 
     def process_auto_update(self, payload: dict):
         """
         Slot for auto_update_received signal. 
         Process data received from external tracker.
+        One batch per payload: signals only for what actually changed.
         """
         logging.debug(f"Auto-Update Payload Keys: {list(payload.keys())}")
         
+        with self.batch():
+            if is_delta(payload):
+                self.apply_delta(payload)
+            else:
+                self._apply_snapshot(payload)
+
+    def _apply_snapshot(self, payload: dict):
+        # Payloads were validated against core/schema.py when decoded; missing fields are None.
+        # Decoded frames already are HelperPayloads, only in-process sources hand in dicts.
+        snap = payload if isinstance(payload, HelperPayload) else HelperPayload.from_dict(payload)
+        
+        # A snapshot is a new base for subsequent deltas
+        if snap.seq is not None:
+            self._last_seq = snap.seq
+            self._resync_pending = False
+            if snap.seq_gap:
+                # Mailbox folded deltas across a gap into this snapshot: apply it, but fetch a clean base
+                self._request_resync("coalesced snapshot spans a gap")
+        
         # 0. Empty Payload Check (Emulator Unhook / Reset)
-        # GameState in C# instantiates empty lists.
-        if not payload.get("inventory") and not payload.get("characters") and payload.get("player_x", 0) == 0 and payload.get("player_y", 0) == 0:
+        # GameState in C# instantiates empty lists. Null lists are categories the helper didn't read.
+        if is_reset(payload):
              logging.debug("StateManager: Empty payload received. Triggering state reset.")
              self.reset_state()
              return
         
-        # 0. Store Capsule Mapping (if present)
-        if "capsule_sprite_values" in payload:
-            self.update_capsule_sprites(payload["capsule_sprite_values"])
+        # 0. Static Seed Data & Capsule Mapping (if present)
+        if snap.seed_hash is not None:
+            self._restore_seed(snap.seed_hash)
+        if snap.capsule_sprite_values is not None and self._section_changed("capsule_sprite_values"):
+            self.update_capsule_sprites(snap.capsule_sprite_values)
         
         # 1. Inventory & Scenario (Keys)
-        if self._is_tracking_enabled('tools') and "inventory" in payload and payload["inventory"] is not None:
+        tools_update = self._is_tracking_enabled('tools') and snap.inventory is not None
+        keys_update = self._is_tracking_enabled('keys') and snap.scenario is not None
+        if (tools_update or keys_update) and self._section_changed("inventory", "scenario"):
             new_inventory = {}
             
-            # Tools
-            for item in payload.get('inventory') or []:
+            # Tools (kept as they are if this payload doesn't cover them)
+            tools = snap.inventory if tools_update else [i for i in self._inventory if i not in self._auto_scenario]
+            for item in tools:
                  new_inventory[item] = True
             
             # Keys (Scenario Items)
-            if payload.get("scenario"):
-                for item in payload.get('scenario') or []:
-                    new_inventory[item] = True
+            if keys_update:
+                self._auto_scenario = set(snap.scenario)
+            for item in self._auto_scenario:
+                new_inventory[item] = True
             
             # Update Inventory (Authoritative)
-            self._inventory = new_inventory
+            self._inventory.replace(new_inventory)
             
             # Emit Inventory Change
-            self.inventory_changed.emit(self.get_inventory())
+            self._emit("inventory_changed", self.get_inventory())
             
         # 1.b. Maidens & Characters (Spoiler Log Check)
-        if self._is_tracking_enabled('tools') and payload.get("spoiler_log"):
+        spoiler_log = snap.spoiler_log
+        if spoiler_log is None and snap.seed_hash is not None and snap.seed_hash == self._seed_hash:
+             spoiler_log = self._spoiler_log # Restored from the seed cache
+        if self._is_tracking_enabled('tools') and spoiler_log:
+             self._spoiler_log = spoiler_log
              new_args = (
-                  payload['spoiler_log'],
-                  payload.get('cleared_locations') or [],
-                  payload.get('capsules') or []
+                  spoiler_log,
+                  snap.cleared_locations or [],
+                  snap.capsules or []
              )
              
              # Only re-process if the inputs have actually changed OR if sprites just changed
@@ -367,9 +847,10 @@ class StateManager(QObject):
                  self.process_spoiler_log(*new_args)
 
         # 2. Characters & Capsules
-        if self._is_tracking_enabled('chars') and "characters" in payload and payload["characters"] is not None:
-            active_list = payload.get('characters') or [] # Humans (Party)
-            capsule_list = payload.get('capsules') or [] # Capsules (Obtained)
+        if self._is_tracking_enabled('chars') and snap.characters is not None \
+                and self._section_changed("characters", "capsules"):
+            active_list = snap.characters # Humans (Party)
+            capsule_list = snap.capsules or [] # Capsules (Obtained)
             
             # v1.3 Logic Decoupled:
             self._active_party_list = active_list # Store ordered list
@@ -386,43 +867,27 @@ class StateManager(QObject):
 
             # Un-obtain characters that are not in the current payload
             # This fixes the issue where characters stick around after a reset or loading an earlier save.
-            assigned_chars = set(self._character_locations.values())
-            for name in list(self._characters.keys()):
-                 # A character should remain "obtained" iff:
-                 # 1. They are in the active party (humans)
-                 # 2. They are in the obtained capsules list
-                 # 3. They are pinned to a location manually (in _character_locations)
-                 # 4. They are manually forced obtained via UI (_manual_character_overrides)
-                 is_forced = self._manual_character_overrides.get(name, False)
-                 
-                 if name not in self._active_party and name not in self._obtained_capsules and name not in assigned_chars and not is_forced:
-                      if self._characters[name]: # if currently obtained
-                           self.set_character_obtained(name, False)
-                           logging.debug(f"StateManager: Character {name} not found in payload and not pinned. Set obtained=False.")
-
-            # Emit changes (force update on widget to refresh Dim/Lit states)
-            for name, obtained in self._characters.items():
-                self.character_changed.emit(name, obtained)
+            # Party changes alone (Dim/Lit states) are picked up by the batch too.
+            self._release_unpinned_characters(list(self._characters.keys()))
 
         # 3. Locations (Cleared)
-        if self._is_tracking_enabled('tools') and "cleared_locations" in payload and payload["cleared_locations"] is not None:
-             payload_cleared = set(payload['cleared_locations'])
+        if self._is_tracking_enabled('tools') and snap.cleared_locations is not None \
+                and self._section_changed("cleared_locations"):
+             payload_cleared = set(snap.cleared_locations)
+             self._auto_cleared = payload_cleared
              
              # Apply new cleared
              for loc in payload_cleared:
                 if loc not in self._manual_location_overrides:
                     if self._locations.get(loc) != "cleared":
                         self._locations[loc] = "cleared"
-                        self.location_changed.emit(loc, "cleared")
+                        self._emit("location_changed", loc, "cleared")
                         
              # Un-clear locations (Reset Logic)
              # If we have a stored "cleared" state that is NOT in payload, and NOT manual, revert it.
              # We revert by deleting it from _locations (letting LogicEngine determine state)
-             to_remove = []
-             for loc, state in self._locations.items():
-                 if state == "cleared" and loc not in self._manual_location_overrides:
-                     if loc not in payload_cleared:
-                         to_remove.append(loc)
+             cleared_bits = self._locations.states.get("cleared", 0) & ~self._manual_location_overrides.present
+             to_remove = [loc for loc in self.registry.locations.iter_names(cleared_bits) if loc not in payload_cleared]
              
              for loc in to_remove:
                  del self._locations[loc]
@@ -435,11 +900,153 @@ class StateManager(QObject):
                  # We just removed the "cleared" override.
                  
         # 4. Player Position
-        if self._is_tracking_enabled('pos') and 'player_x' in payload and 'player_y' in payload:
-             new_game_x = payload['player_x']
-             new_game_y = payload['player_y']
-             self._update_player_position(new_game_x, new_game_y)
-             self.player_position_changed.emit(self._player_pos.x(), self._player_pos.y())
+        if self._is_tracking_enabled('pos') and snap.player_x is not None and snap.player_y is not None \
+                and self._section_changed("player_x", "player_y"):
+             self._update_player_position(snap.player_x, snap.player_y)
+             self._emit("player_position_changed", self._player_pos.x(), self._player_pos.y())
+
+    def _release_unpinned_characters(self, names):
+        """Sets obtained=False for any of `names` that nothing keeps obtained anymore."""
+        assigned_chars = set(self._character_locations.values())
+        for name in names:
+             # A character should remain "obtained" iff:
+             # 1. They are in the active party (humans)
+             # 2. They are in the obtained capsules list
+             # 3. They are pinned to a location manually (in _character_locations)
+             # 4. They are manually forced obtained via UI (_manual_character_overrides)
+             is_forced = self._manual_character_overrides.get(name, False)
+             
+             if name not in self._active_party and name not in self._obtained_capsules and name not in assigned_chars and not is_forced:
+                  if self._characters.get(name): # if currently obtained
+                       self.set_character_obtained(name, False)
+                       logging.debug(f"StateManager: Character {name} not found in payload and not pinned. Set obtained=False.")
+
+    def apply_delta(self, delta: dict):
+        """
+        Applies a delta payload (see core/payloads.py) in O(changes).
+        Deltas must arrive in sequence. On a gap the delta is dropped and a
+        full snapshot is requested from the helper.
+        """
+        seq = delta.get("seq")
+        first_seq = delta.get("seq_start", seq) # Coalesced deltas cover seq_start..seq
+        if self._last_seq is None or first_seq != self._last_seq + 1 or delta.get("seq_gap"):
+            self._request_resync(f"expected seq {None if self._last_seq is None else self._last_seq + 1}, got {first_seq}")
+            return
+        self._last_seq = seq
+        
+        set_fields = delta.get("set") or {}
+        added = delta.get("add") or {}
+        removed = delta.get("remove") or {}
+        
+        # 0. Static Seed Data & Capsule Mapping
+        if set_fields.get("seed_hash") is not None:
+            self._restore_seed(set_fields["seed_hash"])
+        if "capsule_sprite_values" in set_fields:
+            self.update_capsule_sprites(set_fields["capsule_sprite_values"])
+        
+        # 1. Inventory & Scenario (Keys)
+        inventory_fields = [field for field, category in (("inventory", "tools"), ("scenario", "keys"))
+                            if self._is_tracking_enabled(category)]
+        if inventory_fields:
+            inventory_dirty = False
+            if "scenario" in inventory_fields:
+                self._auto_scenario.update(added.get("scenario") or [])
+                self._auto_scenario.difference_update(removed.get("scenario") or [])
+            for field in inventory_fields:
+                for item in removed.get(field) or []:
+                    if self._inventory.pop(item, None) is not None:
+                        inventory_dirty = True
+                for item in added.get(field) or []:
+                    if not self._inventory.get(item):
+                        self._inventory[item] = True
+                        inventory_dirty = True
+            if inventory_dirty:
+                self._emit("inventory_changed", self.get_inventory())
+        
+        # 2. Characters & Capsules
+        if self._is_tracking_enabled('chars'):
+            released = set()
+            if set_fields.get("characters") is not None:
+                active_list = set_fields["characters"]
+                released |= self._active_party - set(active_list)
+                self._active_party_list = active_list
+                self._active_party = set(active_list)
+                for name in active_list:
+                    if not self._characters.get(name):
+                        self.set_character_obtained(name, True)
+            if removed.get("capsules") or added.get("capsules"):
+                self._touch("obtained_capsules")
+            for name in removed.get("capsules") or []:
+                self._obtained_capsules.discard(name)
+                released.add(name)
+            for name in added.get("capsules") or []:
+                self._obtained_capsules.add(name)
+                if not self._characters.get(name):
+                    self.set_character_obtained(name, True)
+            self._release_unpinned_characters(released)
+        
+        # 3. Locations (Cleared)
+        if self._is_tracking_enabled('tools'):
+            for loc in added.get("cleared_locations") or []:
+                self._auto_cleared.add(loc)
+                if loc not in self._manual_location_overrides and self._locations.get(loc) != "cleared":
+                    self._locations[loc] = "cleared"
+                    self._emit("location_changed", loc, "cleared")
+            for loc in removed.get("cleared_locations") or []:
+                self._auto_cleared.discard(loc)
+                if loc not in self._manual_location_overrides and self._locations.get(loc) == "cleared":
+                    # Let LogicEngine determine the state again on the next refresh
+                    del self._locations[loc]
+            
+            # Spoiler log depends on cleared locations and capsules, so only re-run if one of them moved
+            if set_fields.get("spoiler_log"):
+                self._spoiler_log = set_fields["spoiler_log"]
+            spoiler_inputs_changed = (
+                "spoiler_log" in set_fields or "seed_hash" in set_fields or "cleared_locations" in added or "cleared_locations" in removed
+                or "capsules" in added or "capsules" in removed or not getattr(self, "_last_spoiler_args", None)
+            )
+            if self._spoiler_log and spoiler_inputs_changed:
+                self.process_spoiler_log(self._spoiler_log, list(self._auto_cleared), list(self._obtained_capsules))
+        
+        # 4. Player Position
+        if self._is_tracking_enabled('pos') and ("player_x" in set_fields or "player_y" in set_fields):
+            game_x = set_fields.get("player_x", self._player_game_pos[0])
+            game_y = set_fields.get("player_y", self._player_game_pos[1])
+            self._update_player_position(game_x, game_y)
+            self._emit("player_position_changed", self._player_pos.x(), self._player_pos.y())
+
+    def _request_resync(self, reason: str):
+        """Drops the delta base and asks the helper for a full snapshot (once per gap)."""
+        self._last_seq = None
+        if self._resync_pending:
+            return
+        self._resync_pending = True
+        self.resync_requests += 1
+        logging.warning(f"StateManager: Delta sequence gap ({reason}). Requesting full resync.")
+        if self.helper and self.helper.running:
+            self.helper.request_sync()
+        for request_sync in self._sync_sources:
+            request_sync()
+
+    def _restore_seed(self, key: str):
+        """Takes the static data of seed `key` from the seed cache, unless it is already the current seed."""
+        if key == self._seed_hash:
+            return
+        seed = self.seed_cache.get(key)
+        if seed is None:
+            logging.warning(f"StateManager: Seed {key[:12]} is not in the seed cache ({self.seed_cache.directory}).")
+            return
+        self._seed_hash = key
+        if seed.capsule_sprite_values is not None:
+            self.update_capsule_sprites(seed.capsule_sprite_values)
+        if seed.spoiler_log is not None:
+            self._spoiler_log = seed.spoiler_log
+        self.seed_shops = seed.shops or {}
+        logging.info(f"StateManager: Restored {seed} for seed {key[:12]}.")
+
+    def add_sync_source(self, request_sync):
+        """Registers a payload source other than the helper that can be asked for a full snapshot."""
+        self._sync_sources.append(request_sync)
 
     def _get_capsule_base_name(self, reward_hex_val: str) -> Optional[str]:
         """Maps a Reward Hex (e.g. A502) to the Base Name of the slot (e.g. Jelze)."""
@@ -464,29 +1071,36 @@ class StateManager(QObject):
     def reset_state(self):
         """Reset all tracker state to defaults (but keep options)."""
         logging.info("Resetting tracker state to defaults.")
-        
+        with self.batch(): # Characters UI wipe: everyone who was obtained or active
+            self._reset_state()
+            self.clear_history()
+        self._emit("reset_occurred") # After the batch's signals
+
+    def _reset_state(self):
         # Unassign all map sprites explicitly
         for loc, char in list(self._character_locations.items()):
-            self.character_unassigned.emit(loc, char)
+            self._emit("character_unassigned", loc, char)
             
         old_locations = list(self._locations.keys())
             
-        self._inventory = {}
-        self._characters = {}
+        self._inventory.clear()
+        self._characters.clear()
         self._active_party = set()
         self._obtained_capsules = set()
-        self._character_locations = {}
-        self._locations = {}
+        self._character_locations.clear()
+        self._locations.clear()
+        self._auto_cleared = set()
+        self._auto_scenario = set()
+        self._spoiler_log = None
+        self._seed_hash = None
+        self.seed_shops = {}
+        self.clear_shop_items()
         
         self.reset_overrides()
         
         # Broadcast cleared locations as unknown
         for loc in old_locations:
-             self.location_changed.emit(loc, "unknown")
-        
-        # Characters UI wipe
-        for name in ["Maxim", "Selan", "Guy", "Artea", "Tia", "Dekar", "Lexis", "Jelze", "Flash", "Gusto", "Zeppy", "Darbi", "Sully", "Blaze"]:
-            self.character_changed.emit(name, False)
+             self._emit("location_changed", loc, "unknown")
         
         # Clear Data Caches so Sync doesn't ignore fresh payloads
         if hasattr(self, '_last_spoiler_args'):
@@ -496,39 +1110,40 @@ class StateManager(QObject):
         if hasattr(self, 'capsule_sprites'):
             self.capsule_sprites = None
             
-        self.reset_occurred.emit()
-            
+    @_batched
     def force_sync(self):
         """Used by the Sync button to flush caches and demand a clean payload."""
+        self._sections.forget()
+        self._seed_hash = None # Restored again from the seed cache by the next snapshot
         if hasattr(self, '_last_spoiler_args'):
             self._last_spoiler_args = None
         if hasattr(self, '_capsule_sprite_mapping'):
             self._capsule_sprite_mapping = None
         if self.helper and self.helper.running:
             self.helper.request_sync()
-        self._character_locations = {}
+        for request_sync in self._sync_sources:
+            request_sync()
+        self._character_locations.clear()
         
         # Locations reset
-        self._locations = {}
-        self.location_changed.emit("Reset", "reset") 
+        self._locations.clear()
+        self._emit("location_changed", "Reset", "reset") 
         
         # Emit all signals to clear UI
-        self.inventory_changed.emit({})
+        self._emit("inventory_changed", {})
         self.clear_shop_items()
         
         self.hints_text = ""
         # hints UI cleared by MainWindow._on_reset_occurred
         
-        # Characters:
-        for name in ["Maxim", "Selan", "Guy", "Artea", "Tia", "Dekar", "Lexis", "Jelze", "Flash", "Gusto", "Zeppy", "Darbi", "Sully", "Blaze"]:
-            self.character_changed.emit(name, False)
+        # Characters: the requested snapshot brings any change, reset_occurred redraws the widget
+        self._emit("player_position_changed", 0, 0)
         
-        self.player_position_changed.emit(0, 0)
-        
-        self.reset_occurred.emit()
+        self._emit("reset_occurred") # After the batch's signals
 
 
 
+    @_batched
     def register_spoiler_location(self, location: str, character_name: str):
         """
         Registers a potential character location from the spoiler log.
@@ -537,7 +1152,7 @@ class StateManager(QObject):
         # Update internal map
         self._character_locations[location] = character_name
         # Emit signal so MapWidget can place the sprite (if location not cleared)
-        self.character_assigned.emit(location, character_name)
+        self._emit("character_assigned", location, character_name)
 
     def process_spoiler_log(self, spoiler_log: list, cleared_lines: list, obtained_capsules: list):
         """
@@ -644,57 +1259,84 @@ class StateManager(QObject):
         
         # Note: inventory_changed emitted by caller
 
+    def _document(self) -> Dict[str, Any]:
+        """The state as save_state writes it (and the journal records it), by section."""
+        return {name: self._section(name) for name in DOCUMENT_SECTIONS}
+
+    def _section(self, name: str):
+        """Section `name` of _document(). Keyed ones are copies, the others are the live values."""
+        keyed = self._keyed.get(name)
+        if keyed is not None:
+            return keyed.as_dict()
+        if name == "active_party":
+            return sorted(self._active_party)
+        if name == "obtained_capsules":
+            return sorted(self._obtained_capsules)
+        if name == "capsule_mapping":
+            return getattr(self, '_capsule_sprite_mapping', None)
+        if name == "shop_items":
+            return self.shop_items
+        if name == "hints":
+            return self.hints_text
+        raise KeyError(name)
+
     def save_state(self, filepath: str):
         """Serialize current overrides AND progress to JSON."""
-        data = {
-            "inventory_overrides": self._manual_inventory_overrides,
-            "location_overrides": self._manual_location_overrides,
-            "character_locations": self._character_locations,
-            # "character_obtained": self._characters, # We want full state? 
-            # If we save _characters, we save the auto-tracked state.
-            
-            # Full State
-            "inventory": self._inventory,
-            "locations": self._locations,
-            "characters": self._characters,
-            "active_party": list(self._active_party),
-            "obtained_capsules": list(self._obtained_capsules),
-            "capsule_mapping": self._capsule_sprite_mapping,
-            "shop_items": self.shop_items,
-            "hints": self.hints_text
-        }
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
+            json.dump(self._document(), f, indent=4)
         logging.info(f"State saved to {filepath}")
 
+    def open_journal(self, journal):
+        """Restores the state the journal left off with (crash recovery), then journals every change."""
+        recovered = journal.recover()
+        if recovered:
+            with self.batch():
+                self._load_state(recovered)
+        self.journal = journal
+        journal.record(self._document())
+
+    def close_journal(self):
+        """Leaves a snapshot behind, so the next start has no log to replay."""
+        if self.journal is not None:
+            self.journal.compact()
+            self.journal.close()
+            self.journal = None
+
     def load_state(self, filepath: str):
         """Load state from JSON and apply."""
         with open(filepath, 'r', encoding='utf-8') as f:
             data = json.load(f)
             
-        self._manual_inventory_overrides = data.get("inventory_overrides", {})
-        self._manual_location_overrides = data.get("location_overrides", {})
+        with self.batch():
+            self._load_state(data)
+            self.clear_history() # Its ops are relative to the state that was replaced
+        logging.info(f"State loaded from {filepath}")
+
+    def _load_state(self, data: dict):
+        self._manual_inventory_overrides.replace(data.get("inventory_overrides", {}))
+        self._manual_location_overrides.replace(data.get("location_overrides", {}))
+        self._sections.forget()
         
         # Restore State
-        self._inventory = data.get("inventory", {})
-        self._locations = data.get("locations", {})
-        self._characters = data.get("characters", {})
-        self._character_locations = data.get("character_locations", {})
+        self._inventory.replace(data.get("inventory", {}))
+        self._locations.replace(data.get("locations", {}))
+        self._characters.replace(data.get("characters", {}))
+        self._character_locations.replace(data.get("character_locations", {}))
         
         self.shop_items = data.get("shop_items", [])
-        self.shop_items_changed.emit(self.shop_items)
+        self._emit("shop_items_changed", self.shop_items)
         
         self.hints_text = data.get("hints", "")
-        self.hints_changed.emit(self.hints_text)
+        self._emit("hints_changed", self.hints_text)
         
         self._active_party = set(data.get("active_party", []))
         self._obtained_capsules = set(data.get("obtained_capsules", []))
         self._capsule_sprite_mapping = data.get("capsule_mapping", {})
         
         # Re-emit changes
-        self.inventory_changed.emit(self.inventory)
+        self._emit("inventory_changed", self.inventory)
         for loc, state in self._locations.items():
-            self.location_changed.emit(loc, state)
+            self._emit("location_changed", loc, state)
         
         # We need to re-emit character assignments essentially to place sprites
         # Clear existing sprites? MainWindow doesn't have "clear all sprites" method exposed easily
@@ -702,13 +1344,8 @@ class StateManager(QObject):
         # But we can iterate known locations and emit.
         
         for loc, char in self._character_locations.items():
-             self.character_assigned.emit(loc, char)
-            
-        # Also emit character toggles
-        for char, obtained in self._characters.items():
-            self.character_changed.emit(char, obtained)
-            
-        logging.info(f"State loaded from {filepath}")
+             self._emit("character_assigned", loc, char)
+        # Character toggles: emitted by load_state's batch
 
     def update_capsule_sprites(self, sprites: list):
         """Called by Logic/TrackerClient when C# sends new sprite data."""
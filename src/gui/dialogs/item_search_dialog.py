@@ -14,10 +14,11 @@ class ItemSearchDialog(QDialog):
     duplicate_found = pyqtSignal(str, str) # location, item_name (for highlighting)
     location_changed = pyqtSignal(str)
 
-    def __init__(self, location, data_loader, parent=None):
+    def __init__(self, location, data_loader, parent=None, shops=None):
         super().__init__(parent)
         self.location = location
         self.data_loader = data_loader
+        self.shops = shops or {} # city -> category -> item names its shop sells in this seed (StateManager.seed_shops)
         self.item_spells = data_loader.get_items_spells()
         self.all_categories = list(self.item_spells.keys())
         self.current_category = self.all_categories[0] if self.all_categories else ""
@@ -132,10 +133,18 @@ class ItemSearchDialog(QDialog):
             if query in str(item_name).lower():
                 filtered_items.append(str(item_name))
                 
-        filtered_items.sort()
+        # What the shop here sells in this seed (read from the ROM) comes first, in bold
+        sold = {name.lower() for names in self.shops.get(self.location, {}).values() for name in names}
+        filtered_items.sort(key=lambda name: (name.lower() not in sold, name))
         
         for name in filtered_items:
-            self.list_widget.addItem(name)
+            item = QListWidgetItem(name)
+            if name.lower() in sold:
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+                item.setToolTip("Sold here in this seed")
+            self.list_widget.addItem(item)
         
         if self.list_widget.count() > 0:
             self.list_widget.setCurrentRow(0)
@@ -59,6 +59,7 @@ class MainWindow(QMainWindow):
         # Auto Toggle
         self.menu_ribbon.auto_toggled.connect(self._handle_auto_toggle)
         self.menu_ribbon.auto_options_changed.connect(self.state_manager.update_tracking_options)
+        self.state_manager.connection_state_changed.connect(self.menu_ribbon.set_connection_state)
         
         # Font Toggle
         self.menu_ribbon.font_adj_toggled.connect(self._toggle_font_controls)
@@ -356,8 +357,8 @@ class MainWindow(QMainWindow):
         self.tools_widget.connect_signals(self.state_manager)
         self.scenario_widget.connect_signals(self.state_manager)
         
-        # Logic Loop Trigger (Inventory Change -> Refresh All)
-        self.state_manager.inventory_changed.connect(lambda _: self._refresh_all())
+        # Logic Loop Trigger (one StateDelta per payload / batch -> Refresh All)
+        self.state_manager.state_changed.connect(self._on_state_changed)
         
         # UI Signals -> State Manager Overrides
         self.map_widget.location_clicked.connect(self._handle_location_click)
@@ -367,7 +368,7 @@ class MainWindow(QMainWindow):
         # Character Signals
         self.state_manager.character_assigned.connect(self._on_character_assigned)
         self.state_manager.character_unassigned.connect(self.map_widget.remove_character_sprite)
-        self.state_manager.character_changed.connect(lambda n, o: self.characters_widget.refresh_state())
+        # characters_changed refreshes the characters widget itself (CharactersCanvas.connect_signals)
         
         # Map Sprite Removal Interactivity
         self.map_widget.sprite_removed.connect(self.state_manager.remove_character_assignment)
@@ -384,6 +385,11 @@ class MainWindow(QMainWindow):
             self.hint_widget.hints_changed.connect(self.state_manager.update_hints)
             self.state_manager.hints_changed.connect(self.hint_widget.set_hints)
 
+        # Undo / Redo of manual overrides (StateManager.undo), platform keys: Ctrl+Z, Ctrl+Y / Ctrl+Shift+Z
+        from PyQt6.QtGui import QShortcut, QKeySequence
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Undo), self, activated=self.state_manager.undo)
+        QShortcut(QKeySequence(QKeySequence.StandardKey.Redo), self, activated=self.state_manager.redo)
+
     def _on_reset_occurred(self):
         """Clears UI elements that aren't strictly data-bound to StateManager properties (like Hints/Map Sprites)."""
         # Clear Hints
@@ -405,10 +411,16 @@ class MainWindow(QMainWindow):
         # Refresh Logic (Just in case)
         self._refresh_all()
         
+    def _on_state_changed(self, delta):
+        # Logic depends on the inventory; locations handed back to it (None) need their color again
+        if delta.inventory_changed or None in delta.locations.values():
+            self._refresh_all()
+
     def _refresh_all(self):
         """Re-runs logic engine and pushes updates."""
         # Get Accessibility Map
-        accessibility = self.logic_engine.calculate_accessibility(self.state_manager.inventory)
+        accessibility = self.logic_engine.calculate_accessibility_bits(self.state_manager.inventory_bits)
+        inventory = self.state_manager.inventory
         
         # Current Location States (Overrides + Cleared)
         current_loc_states = self.state_manager.locations
@@ -433,7 +445,7 @@ class MainWindow(QMainWindow):
             tooltip_text = name
             if not is_accessible and final_color == "not_accessible":
                 # Get missing info
-                reqs = self.logic_engine.get_missing_requirements(name, self.state_manager.inventory)
+                reqs = self.logic_engine.get_missing_requirements(name, inventory)
                 if reqs:
                     req_str = " OR ".join(reqs)
                     tooltip_text += f"\nRequires: {req_str}"
@@ -541,7 +553,7 @@ class MainWindow(QMainWindow):
             location_name = sorted_cities[0] if sorted_cities else ""
 
         # Parent=None to allow independent window (Taskbar entry, Alt-Tab, free movement)
-        dlg = ItemSearchDialog(location_name, self.data_loader, parent=None)
+        dlg = ItemSearchDialog(location_name, self.data_loader, parent=None, shops=self.state_manager.seed_shops)
         dlg.item_added.connect(self._on_shop_item_added)
         
         def highlight_loc(name):
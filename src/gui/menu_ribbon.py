@@ -279,6 +279,22 @@ class MenuRibbon(QWidget):
             if k != "All":
                 action.setChecked(checked)
 
+    # Helper link state -> (label, colour); keys match network/health.py
+    # While the toggle is on, "stopped" means the helper gave up on its own (e.g. connect timeout)
+    LINK_STATE_LABELS = {
+        "stopped": ("Auto Tracking (Stopped)", "grey"),
+        "waiting": ("Auto Tracking (Waiting for helper)", "khaki"),
+        "connected": ("Auto Tracking (Connected)", "lightgreen"),
+        "unresponsive": ("Auto Tracking (Helper not responding)", "orange"),
+        "restarting": ("Auto Tracking (Restarting helper)", "orange"),
+        "failed": ("Auto Tracking (Helper failed)", "tomato"),
+    }
+
+    def set_connection_state(self, state: str):
+        text, color = self.LINK_STATE_LABELS.get(state, (f"Auto Tracking ({state})", "lightgreen"))
+        self.lbl_auto.setText(text)
+        self.lbl_auto.setStyleSheet(f"color: {color}; font-weight: bold;")
+
     def _on_checkbox_change(self):
         # Gather state
         state = {k.lower(): cb.isChecked() for k, cb in self.checkboxes.items()}
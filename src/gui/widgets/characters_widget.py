@@ -252,11 +252,12 @@ class CharactersCanvas(QWidget):
         self.setMinimumSize(max_x + 10, max_y + 10)
             
     def connect_signals(self):
-        self.state_manager.character_changed.connect(self._on_character_changed)
+        # One bulk signal per payload with only the characters that changed
+        self.state_manager.characters_changed.connect(self._on_characters_changed)
         self.state_manager.character_assigned.connect(self._on_assignment_changed)
         self.state_manager.character_unassigned.connect(self._on_assignment_changed)
 
-    def _on_character_changed(self, name, obtained):
+    def _on_characters_changed(self, changes):
         self.refresh_state()
 
     def _on_assignment_changed(self, location, name):
@@ -365,10 +366,7 @@ class CharactersWidget(QWidget):
         self.canvas = CharactersCanvas(data_loader, state_manager, layout_manager, self)
         self.layout.addWidget(self.canvas)
         
-        # Connect signals
-        self.state_manager.character_changed.connect(self.refresh_state)
-        # Also need assignment changes
-        self.state_manager.character_assigned.connect(lambda l, n: self.refresh_state())
+        # Character / assignment signals are connected by the canvas itself
         
     def set_content_font_size(self, size):
         self.canvas.set_content_font_size(size)
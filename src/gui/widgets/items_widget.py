@@ -143,7 +143,7 @@ class ItemsWidget(QWidget):
         # self.refresh_list() # Signal will trigger refresh
         
     def refresh_from_state(self):
-        self.entries = self.state_manager.shop_items
+        self.entries = list(self.state_manager.shop_items) # Sorting the view must not reorder the saved list
         self.refresh_list()
         
     def refresh_list(self):
@@ -163,8 +163,8 @@ class ItemsWidget(QWidget):
         self.list_container.adjustSize()
             
     def remove_item(self, location, item_name):
-        self.entries = [e for e in self.entries if not (e['name'] == item_name and e['location'] == location)]
-        self.refresh_list()
+        # Through StateManager, so it is saved (and can be undone); shop_items_changed refreshes the list
+        self.state_manager.unregister_shop_item(location, item_name)
         
     def sort_by_location(self):
         self.entries.sort(key=lambda x: x['location'])
@@ -36,21 +36,94 @@ namespace Lufia2AutoTracker.Helper.Core
         private ushort ReadUShort(int offset) => BitConverter.ToUInt16(ReadMemory(offset, 2), 0);
         private uint ReadUInt(int offset) => BitConverter.ToUInt32(ReadMemory(offset, 4), 0);
 
-        public GameState ReadGameState()
+        private enum ReadPlan { Read, Carry, Skip }
+
+        private GameState _lastRead; // Values carried forward for categories that aren't due this tick
+
+        // Disabled categories aren't read at all and go out as null; enabled ones are
+        // re-read at their own poll rate (TrackerOptions) and carried forward in between.
+        private ReadPlan Plan(TrackerOptions options, string category, long nowMs)
+        {
+            if (options == null) return ReadPlan.Read;
+            if (!options.IsEnabled(category)) return ReadPlan.Skip;
+            if (options.IsDue(category, nowMs) || _lastRead == null) return ReadPlan.Read;
+            return ReadPlan.Carry;
+        }
+
+        public GameState ReadGameState(TrackerOptions options = null)
         {
             var state = new GameState();
-            try { state.Inventory = ReadInventory(); } catch {}
-            try { state.ScenarioItems = ReadScenario(); } catch {}
-            try { state.Capsules = ReadCapsules(); } catch {}
-            try { state.CapsuleSpriteValues = ReadCapsuleSpriteValues(); } catch {}
-            try { state.Characters = ReadCharacters(); } catch {}
-            try { state.ClearedLocations = ReadDungeonFlags(); } catch {}
-            
-            var pos = ReadPosition();
-            state.PlayerX = pos.X;
-            state.PlayerY = pos.Y;
-            state.TransportMode = pos.Mode;
+            var last = _lastRead;
+            long now = Environment.TickCount64;
+
+            switch (Plan(options, TrackerOptions.Tools, now))
+            {
+                case ReadPlan.Read:
+                    try { state.Inventory = ReadInventory(); } catch {}
+                    try { state.ClearedLocations = ReadDungeonFlags(); } catch {}
+                    break;
+                case ReadPlan.Carry:
+                    state.Inventory = last.Inventory;
+                    state.ClearedLocations = last.ClearedLocations;
+                    break;
+                default:
+                    state.Inventory = null;
+                    state.ClearedLocations = null;
+                    break;
+            }
+
+            switch (Plan(options, TrackerOptions.Keys, now))
+            {
+                case ReadPlan.Read:
+                    try { state.ScenarioItems = ReadScenario(); } catch {}
+                    break;
+                case ReadPlan.Carry:
+                    state.ScenarioItems = last.ScenarioItems;
+                    break;
+                default:
+                    state.ScenarioItems = null;
+                    break;
+            }
+
+            switch (Plan(options, TrackerOptions.Chars, now))
+            {
+                case ReadPlan.Read:
+                    try { state.Capsules = ReadCapsules(); } catch {}
+                    try { state.CapsuleSpriteValues = ReadCapsuleSpriteValues(); } catch {}
+                    try { state.Characters = ReadCharacters(); } catch {}
+                    break;
+                case ReadPlan.Carry:
+                    state.Capsules = last.Capsules;
+                    state.CapsuleSpriteValues = last.CapsuleSpriteValues;
+                    state.Characters = last.Characters;
+                    break;
+                default:
+                    state.Capsules = null;
+                    state.CapsuleSpriteValues = null;
+                    state.Characters = null;
+                    break;
+            }
+
+            // Maidens aren't read from memory (the tracker takes them from the spoiler log)
+            if (options != null && !options.IsEnabled(TrackerOptions.Maidens)) state.Maidens = null;
+
+            switch (Plan(options, TrackerOptions.Pos, now))
+            {
+                case ReadPlan.Read:
+                    var pos = ReadPosition();
+                    state.PlayerX = pos.X;
+                    state.PlayerY = pos.Y;
+                    state.TransportMode = pos.Mode;
+                    break;
+                default:
+                    // Position is a plain int: hold the last value so the main loop sees no movement
+                    state.PlayerX = last?.PlayerX ?? 0;
+                    state.PlayerY = last?.PlayerY ?? 0;
+                    state.TransportMode = last?.TransportMode;
+                    break;
+            }
 
+            _lastRead = state;
             return state;
         }
 
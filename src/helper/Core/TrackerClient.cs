@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Generic;
 using System.Net.Sockets;
 using System.Text;
 using System.Text.Json;
@@ -10,11 +11,18 @@ namespace Lufia2AutoTracker.Helper.Core
     {
         private const string Host = "127.0.0.1";
         private const int Port = 65432;
+        // Stay on v1 NDJSON but tell the tracker we take JSON commands (src/network/protocol.py)
+        private const string Hello = "{\"hello\":{\"protocols\":[1],\"features\":[\"commands\"]}}\n";
         private TcpClient _client;
         private NetworkStream _stream;
+        private readonly object _writeLock = new object(); // State (main loop) and acks (listener) share the stream
+        private readonly StringBuilder _pending = new StringBuilder();
 
         public bool IsConnected => _client != null && _client.Connected;
 
+        // Category mask / poll rates from the tracker. Read by the main loop.
+        public TrackerOptions Options { get; } = new TrackerOptions();
+
         public void Connect()
         {
             try
@@ -24,6 +32,8 @@ namespace Lufia2AutoTracker.Helper.Core
                     _client = new TcpClient();
                     _client.Connect(Host, Port);
                     _stream = _client.GetStream();
+                    _pending.Clear();
+                    Write(Hello);
                     Console.WriteLine($"Connected to Tracker at {Host}:{Port}");
                 }
             }
@@ -35,6 +45,7 @@ namespace Lufia2AutoTracker.Helper.Core
         }
 
         public event Action SyncRequested;
+        public event Action OptionsChanged;
 
         public void SendState(GameState state)
         {
@@ -47,8 +58,7 @@ namespace Lufia2AutoTracker.Helper.Core
             try
             {
                 string json = JsonSerializer.Serialize(state) + "\n"; // Append newline for delimiting
-                byte[] data = Encoding.UTF8.GetBytes(json);
-                _stream.Write(data, 0, data.Length);
+                Write(json);
             }
             catch (Exception ex)
             {
@@ -58,6 +68,15 @@ namespace Lufia2AutoTracker.Helper.Core
             }
         }
 
+        private void Write(string line)
+        {
+            byte[] data = Encoding.UTF8.GetBytes(line);
+            lock (_writeLock)
+            {
+                _stream.Write(data, 0, data.Length);
+            }
+        }
+
         public void StartListening()
         {
             ThreadPool.QueueUserWorkItem(_ =>
@@ -72,12 +91,15 @@ namespace Lufia2AutoTracker.Helper.Core
                             int bytesRead = _stream.Read(buffer, 0, buffer.Length);
                             if (bytesRead > 0)
                             {
-                                string data = Encoding.UTF8.GetString(buffer, 0, bytesRead);
-                                if (data.Contains("SYNC"))
+                                _pending.Append(Encoding.UTF8.GetString(buffer, 0, bytesRead));
+                                string data = _pending.ToString();
+                                int nl;
+                                while ((nl = data.IndexOf('\n')) >= 0)
                                 {
-                                    Console.WriteLine("TrackerClient: SYNC command received from UI.");
-                                    SyncRequested?.Invoke();
+                                    HandleLine(data.Substring(0, nl).Trim());
+                                    data = data.Substring(nl + 1);
                                 }
+                                _pending.Clear().Append(data);
                             }
                         }
                         catch (Exception ex)
@@ -89,5 +111,69 @@ namespace Lufia2AutoTracker.Helper.Core
                 }
             });
         }
+
+        private void HandleLine(string line)
+        {
+            if (line.Length == 0) return;
+            if (line == "SYNC")
+            {
+                // Older trackers only send the bare keyword
+                Console.WriteLine("TrackerClient: SYNC command received from UI.");
+                Options.ForceDue();
+                SyncRequested?.Invoke();
+                return;
+            }
+
+            JsonDocument doc;
+            try
+            {
+                doc = JsonDocument.Parse(line);
+            }
+            catch (JsonException)
+            {
+                Console.WriteLine($"TrackerClient: Ignoring unreadable command: {line}");
+                return;
+            }
+            using var _ = doc;
+            var root = doc.RootElement;
+            if (root.ValueKind != JsonValueKind.Object || !root.TryGetProperty("cmd", out var cmdProp))
+                return; // hello_ack etc.
+
+            string cmd = cmdProp.GetString();
+            bool ok = true;
+            string error = null;
+            switch (cmd)
+            {
+                case "ping":
+                    break; // Heartbeat: the ack is the answer
+                case "sync":
+                    List<string> categories = null;
+                    if (root.TryGetProperty("categories", out var cats) && cats.ValueKind == JsonValueKind.Array)
+                    {
+                        categories = new List<string>();
+                        foreach (var c in cats.EnumerateArray()) categories.Add(c.GetString());
+                    }
+                    Console.WriteLine($"TrackerClient: SYNC command received from UI ({(categories == null ? "all" : string.Join(",", categories))}).");
+                    Options.ForceDue(categories);
+                    SyncRequested?.Invoke();
+                    break;
+                case "options":
+                    Options.Apply(root);
+                    Console.WriteLine($"TrackerClient: Tracking options: {Options}");
+                    OptionsChanged?.Invoke();
+                    break;
+                default:
+                    ok = false;
+                    error = $"unknown command '{cmd}'";
+                    break;
+            }
+
+            if (root.TryGetProperty("id", out var id) && id.ValueKind == JsonValueKind.Number && id.TryGetInt64(out long commandId))
+            {
+                var ack = new Dictionary<string, object> { ["ack"] = commandId, ["cmd"] = cmd, ["ok"] = ok };
+                if (error != null) ack["error"] = error;
+                Write(JsonSerializer.Serialize(ack) + "\n");
+            }
+        }
     }
 }
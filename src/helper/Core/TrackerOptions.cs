@@ -0,0 +1,102 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using System.Text.Json;
+
+namespace Lufia2AutoTracker.Helper.Core
+{
+    // Category mask + poll rates pushed by the tracker (see src/network/commands.py):
+    //   {"cmd":"options","id":5,"categories":{"tools":true,"keys":false,...},"poll_ms":{"pos":100,...}}
+    // Written by the TrackerClient listener thread, read by the main loop.
+    public class TrackerOptions
+    {
+        public const string Tools = "tools";     // Inventory, dungeon flags, spoiler log
+        public const string Keys = "keys";       // Scenario items
+        public const string Chars = "chars";     // Party, capsules, capsule sprites
+        public const string Maidens = "maidens";
+        public const string Pos = "pos";         // Position + transport mode
+
+        public const int MinPollMs = 100; // Main loop tick
+
+        private readonly object _lock = new object();
+        private readonly Dictionary<string, bool> _enabled = new Dictionary<string, bool>();
+        private readonly Dictionary<string, int> _pollMs = new Dictionary<string, int>
+        {
+            [Pos] = 100,
+            [Tools] = 500,
+            [Keys] = 500,
+            [Chars] = 500,
+            [Maidens] = 1000,
+        };
+        private readonly Dictionary<string, long> _nextDue = new Dictionary<string, long>();
+
+        // Everything is on until the tracker says otherwise (older trackers never will)
+        public bool IsEnabled(string category)
+        {
+            lock (_lock)
+            {
+                return !_enabled.TryGetValue(category, out bool on) || on;
+            }
+        }
+
+        // True if the category should be read this tick; schedules its next read.
+        public bool IsDue(string category, long nowMs)
+        {
+            lock (_lock)
+            {
+                if (_nextDue.TryGetValue(category, out long due) && nowMs < due) return false;
+                int interval = _pollMs.TryGetValue(category, out int ms) ? ms : MinPollMs;
+                _nextDue[category] = nowMs + interval;
+                return true;
+            }
+        }
+
+        // The next IsDue() is true for these categories (all of them when null).
+        public void ForceDue(IEnumerable<string> categories = null)
+        {
+            lock (_lock)
+            {
+                if (categories == null)
+                {
+                    _nextDue.Clear();
+                    return;
+                }
+                foreach (var category in categories) _nextDue.Remove(category);
+            }
+        }
+
+        public void Apply(JsonElement command)
+        {
+            lock (_lock)
+            {
+                if (command.TryGetProperty("categories", out var categories) && categories.ValueKind == JsonValueKind.Object)
+                {
+                    foreach (var prop in categories.EnumerateObject())
+                    {
+                        if (prop.Value.ValueKind == JsonValueKind.True || prop.Value.ValueKind == JsonValueKind.False)
+                            _enabled[prop.Name] = prop.Value.GetBoolean();
+                    }
+                }
+                if (command.TryGetProperty("poll_ms", out var rates) && rates.ValueKind == JsonValueKind.Object)
+                {
+                    foreach (var prop in rates.EnumerateObject())
+                    {
+                        if (prop.Value.ValueKind == JsonValueKind.Number && prop.Value.TryGetInt32(out int ms))
+                            _pollMs[prop.Name] = Math.Max(MinPollMs, ms);
+                    }
+                }
+                // Newly enabled categories must not wait out an old interval
+                _nextDue.Clear();
+            }
+        }
+
+        public override string ToString()
+        {
+            lock (_lock)
+            {
+                var parts = _pollMs.Keys.Select(c => $"{c}={(_enabled.TryGetValue(c, out bool on) && !on ? "off" : $"{_pollMs[c]}ms")}");
+                return string.Join(", ", parts);
+            }
+        }
+    }
+}
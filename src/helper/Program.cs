@@ -27,6 +27,8 @@ namespace Lufia2AutoTracker.Helper
             
             bool forceSync = false;
             client.SyncRequested += () => { forceSync = true; };
+            // The tracker's category mask changed: disabled fields go out as null from now on, so send a full state
+            client.OptionsChanged += () => { forceSync = true; };
             
             // Spoiler Log Cache (only read once per session usually)
             List<Dictionary<string, string>> cachedSpoilerLog = null;
@@ -224,11 +226,12 @@ namespace Lufia2AutoTracker.Helper
 
                     if (process != null && reader != null)
                     {
-                        var state = reader.ReadGameState();
+                        var state = reader.ReadGameState(client.Options);
+                        bool spoilerEnabled = client.Options.IsEnabled(TrackerOptions.Tools);
                         
                         // Read Spoiler Log only if empty/null and we have a valid state (game running)
                         // Limit attempts to avoid flooding console if parsing fails
-                        if ((cachedSpoilerLog == null || cachedSpoilerLog.Count == 0) && _spoilerAttemptCount < 10)
+                        if (spoilerEnabled && (cachedSpoilerLog == null || cachedSpoilerLog.Count == 0) && _spoilerAttemptCount < 10)
                         {
                              _spoilerAttemptCount++;
                              var logs = reader.ReadSpoilerLog();
@@ -242,7 +245,7 @@ namespace Lufia2AutoTracker.Helper
                                  if (_spoilerAttemptCount >= 10) Console.WriteLine("DEBUG: Max Spoiler Log attempts reached. Stopping retries.");
                              }
                         }
-                        state.SpoilerLog = cachedSpoilerLog;
+                        state.SpoilerLog = spoilerEnabled ? cachedSpoilerLog : null;
 
                         // Separate Position from Core Data for Diffing
                         var currentPosStr = $"{state.PlayerX},{state.PlayerY},{state.TransportMode}";
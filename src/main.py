@@ -1,16 +1,43 @@
 import sys
+import argparse
 import logging
 from PyQt6.QtWidgets import QApplication
 from gui.main_window import MainWindow
 from core.data_loader import DataLoader
 from core.logic_engine import LogicEngine
 from core.state_manager import StateManager
+from core.journal import StateJournal
+from core.replay import ReplaySource
+from core.memory_reader import MemoryReaderSource
+from network.transports import Endpoint
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Lufia 2 Auto Tracker")
+    parser.add_argument("--record", metavar="FILE", help="Record helper traffic to a capture file")
+    parser.add_argument("--replay", metavar="FILE", help="Play a capture into the tracker instead of a live helper")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Replay speed: 1 = real time, N = N times faster, 0 = as fast as possible")
+    parser.add_argument("--helper-endpoint", metavar="URL",
+                        help="Helper link transport: tcp://localhost:65432 (default), unix:///path or shm:///path")
+    parser.add_argument("--dead-peer-timeout", type=float, metavar="SECONDS",
+                        help="Restart the helper after this long without hearing from it (default 10)")
+    parser.add_argument("--connect-timeout", type=float, metavar="SECONDS",
+                        help="Stop auto tracking if no helper connects within this long (default 30)")
+    parser.add_argument("--memory-pid", type=int, metavar="PID",
+                        help="Linux: read the emulator's memory directly (process_vm_readv) instead of using the helper")
+    parser.add_argument("--emulator-profile", metavar="NAME",
+                        help="Profile name from emulator_addresses.json (default: detected, see core/profile_detect.py)")
+    parser.add_argument("--no-journal", action="store_true",
+                        help="Don't autosave the tracker state (and don't restore the last session)")
+    # Everything else is left for Qt (-style, -platform, ...)
+    return parser.parse_known_args()
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Lufia 2 Auto Tracker")
     app.setStyle("Fusion")
     
@@ -100,11 +127,33 @@ def main():
     data_loader = DataLoader()
     logic_engine = LogicEngine(data_loader)
     state_manager = StateManager(logic_engine)
+    if args.helper_endpoint:
+        state_manager.helper.endpoint = Endpoint.parse(args.helper_endpoint)
+    if args.dead_peer_timeout:
+        state_manager.helper.dead_peer_timeout = args.dead_peer_timeout
+    if args.connect_timeout:
+        state_manager.helper.connect_timeout = args.connect_timeout
     
     # GUI
     window = MainWindow(state_manager, data_loader, logic_engine)
     window.show()
     
+    # Autosave: restores the last session (after a crash too), then journals every change
+    if not args.no_journal:
+        state_manager.open_journal(StateJournal())
+        app.aboutToQuit.connect(state_manager.close_journal)
+    
+    # Capture / Replay (debugging and profiling without an emulator)
+    if args.record:
+        state_manager.helper.start_recording(args.record)
+    if args.replay:
+        replay = ReplaySource(args.replay, state_manager.on_helper_data, speed=args.replay_speed)
+        replay.start()
+    if args.memory_pid:
+        memory_reader = MemoryReaderSource(args.memory_pid, state_manager.on_helper_data, profile_name=args.emulator_profile)
+        state_manager.add_sync_source(memory_reader.request_sync)
+        memory_reader.start()
+    
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+import gzip
+import logging
+import struct
+import threading
+import time
+from typing import Iterator, Tuple
+
+# --- Capture File Format ---
+# gzip stream:  MAGIC, then records of
+#   <d  seconds since capture start
+#   B   frame type: CAPTURE_NDJSON for a v1 line, else the v2 FRAME_* type
+#   I   body length
+#   ... body (raw frame bytes exactly as received, no newline / v2 header)
+CAPTURE_MAGIC = b"L2ATCAP1"
+CAPTURE_NDJSON = 0
+RECORD = struct.Struct("<dBI")
+
+
+class CaptureWriter:
+    """
+    Tees raw helper frames into a compressed, timestamped capture file.
+    write() may be called from the I/O thread while another thread closes.
+    """
+
+    def __init__(self, path, compresslevel=1):
+        self.path = path
+        self.frames = 0
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+        # Level 1: the capture runs alongside live tracking, speed matters more than size
+        self._file = gzip.open(path, "wb", compresslevel=compresslevel)
+        self._file.write(CAPTURE_MAGIC)
+        self._start = time.monotonic()
+        logging.info(f"Recording helper traffic to {path}")
+
+    def write(self, frame_type: int, body):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(RECORD.pack(time.monotonic() - self._start, frame_type, len(body)))
+            self._file.write(body)
+            self.frames += 1
+            self.bytes_written += len(body)
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logging.info(f"Capture {self.path} closed: {self.frames} frames, {self.bytes_written} bytes")
+
+
+def read_capture(path) -> Iterator[Tuple[float, int, bytes]]:
+    """Yields (timestamp, frame_type, body) for every record. A truncated tail (crash mid-write) is ignored."""
+    with gzip.open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a helper capture")
+        while True:
+            try:
+                header = f.read(RECORD.size)
+            except EOFError:
+                return
+            if len(header) < RECORD.size:
+                return
+            timestamp, frame_type, length = RECORD.unpack(header)
+            try:
+                body = f.read(length)
+            except EOFError:
+                return
+            if len(body) < length:
+                return
+            yield timestamp, frame_type, body
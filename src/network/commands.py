@@ -0,0 +1,164 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Optional
+
+# --- Helper Commands ---
+# Tracker -> helper control messages. Every command carries an id; helpers
+# that speak v2 or list the "commands" feature in their hello answer each
+# one with an ack, so the tracker knows a mask / rate change is in effect.
+#
+#   {"cmd": "ping", "id": 2}                               heartbeat, just ack it
+#   {"cmd": "sync", "id": 3}                               one full state, now
+#   {"cmd": "sync", "id": 4, "categories": ["keys"]}       ... re-reading these right away
+#   {"cmd": "options", "id": 5,
+#    "categories": {"tools": true, "keys": false, ...},    what to read at all
+#    "poll_ms": {"pos": 100, "tools": 500, ...}}           how often to read each
+#
+#   helper -> {"ack": 5, "cmd": "options", "ok": true}
+#
+# v1 sends these as JSON lines, v2 as FRAME_COMMAND frames. Legacy helpers
+# (no hello) only ever get the bare "SYNC\n" keyword.
+
+CMD_PING = "ping"
+CMD_SYNC = "sync"
+CMD_OPTIONS = "options"
+
+# Tracking categories (menu ribbon checkboxes) -> GameState fields the helper fills for them.
+# A disabled category is neither read from emulator memory nor sent: its fields go out as null.
+CATEGORY_FIELDS = {
+    "tools": ("inventory", "cleared_locations", "spoiler_log"),
+    "keys": ("scenario",),
+    "chars": ("characters", "capsules", "capsule_sprite_values"),
+    "maidens": ("maidens",),
+    "pos": ("player_x", "player_y", "transport_mode"),
+}
+CATEGORIES = tuple(CATEGORY_FIELDS)
+
+# How often the helper re-reads each category (ms). Its loop ticks every 100 ms, which is the floor.
+DEFAULT_POLL_MS = {"pos": 100, "tools": 500, "keys": 500, "chars": 500, "maidens": 1000}
+MIN_POLL_MS = 100
+
+ACK_TIMEOUT = 5.0 # Unanswered commands older than this are counted as lost
+
+
+def sync_command(categories=None) -> dict:
+    command = {"cmd": CMD_SYNC}
+    if categories:
+        command["categories"] = [c for c in categories if c in CATEGORY_FIELDS]
+    return command
+
+
+def options_command(categories: dict, poll_ms: dict = None) -> dict:
+    """Builds an options command. Unknown keys (e.g. the ribbon's 'all') are dropped, missing ones default on."""
+    rates = dict(DEFAULT_POLL_MS)
+    for category, ms in (poll_ms or {}).items():
+        if category in rates:
+            rates[category] = max(MIN_POLL_MS, int(ms))
+    return {
+        "cmd": CMD_OPTIONS,
+        "categories": {c: bool(categories.get(c, True)) for c in CATEGORIES},
+        "poll_ms": rates,
+    }
+
+
+def disabled_fields(categories: dict) -> set:
+    """GameState fields that are off under a category mask."""
+    fields = set()
+    for category, names in CATEGORY_FIELDS.items():
+        if not categories.get(category, True):
+            fields.update(names)
+    return fields
+
+
+def is_ack(frame) -> bool:
+    """Cheap check on a raw frame, before it goes anywhere near the payload decoder."""
+    return bytes(frame[:6]) == b'{"ack"'
+
+
+def parse_ack(data: dict) -> Optional[int]:
+    """Returns the acknowledged command id if `data` is an ack, else None."""
+    if not isinstance(data, dict):
+        return None
+    ack = data.get("ack")
+    return ack if isinstance(ack, int) else None
+
+
+class CommandStats:
+    def __init__(self):
+        self.sent = 0
+        self.acked = 0
+        self.rejected = 0   # Acked with ok=false
+        self.lost = 0       # Never acked (timeout or link dropped)
+        self.unsupported = 0 # Not sent: the helper can't understand it
+        self.last_rtt_ms = 0.0
+        self.max_rtt_ms = 0.0
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        return (f"CommandStats(sent={self.sent}, acked={self.acked}, rejected={self.rejected}, lost={self.lost}, "
+                f"unsupported={self.unsupported}, rtt={self.last_rtt_ms:.1f}ms, max_rtt={self.max_rtt_ms:.1f}ms)")
+
+
+class PendingCommands:
+    """
+    Numbers outgoing commands and matches acks to them.
+    track() runs on whatever thread sends, acknowledge() on the I/O thread.
+    """
+
+    def __init__(self):
+        self.stats = CommandStats()
+        self._ids = itertools.count(1)
+        self._pending = {} # id -> (cmd, sent_at)
+        self._lock = threading.Lock()
+
+    def track(self, command: dict) -> dict:
+        """Returns a copy of `command` with a fresh id, registered as awaiting its ack."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            command = dict(command, id=next(self._ids))
+            self._pending[command["id"]] = (command.get("cmd"), now)
+            self.stats.sent += 1
+        return command
+
+    def acknowledge(self, ack: dict) -> Optional[str]:
+        """Settles the command `ack` answers. Returns its name, or None for an unknown / late ack."""
+        command_id = parse_ack(ack)
+        with self._lock:
+            entry = self._pending.pop(command_id, None)
+        if entry is None:
+            logging.debug(f"Ack for unknown helper command: {ack}")
+            return None
+        name, sent_at = entry
+        rtt_ms = (time.monotonic() - sent_at) * 1000
+        self.stats.last_rtt_ms = rtt_ms
+        self.stats.max_rtt_ms = max(self.stats.max_rtt_ms, rtt_ms)
+        if ack.get("ok", True):
+            self.stats.acked += 1
+            logging.debug(f"Helper acked {name} #{command_id} in {rtt_ms:.1f}ms")
+        else:
+            self.stats.rejected += 1
+            logging.warning(f"Helper rejected {name} #{command_id}: {ack.get('error', 'no reason given')}")
+        return name
+
+    def clear(self):
+        """Link dropped: nothing outstanding will be answered anymore."""
+        with self._lock:
+            self.stats.lost += len(self._pending)
+            self._pending.clear()
+
+    @property
+    def outstanding(self) -> int:
+        return len(self._pending)
+
+    def _expire(self, now: float):
+        expired = [cid for cid, (_, sent_at) in self._pending.items() if now - sent_at > ACK_TIMEOUT]
+        for cid in expired:
+            name, _ = self._pending.pop(cid)
+            self.stats.lost += 1
+            # A silent helper shows up in the link state (network/health.py), no need to shout per command
+            logging.debug(f"Helper never acked {name} #{cid}")
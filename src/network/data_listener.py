@@ -1,25 +1,55 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QByteArray, QJsonDocument
+from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtNetwork import QTcpServer, QHostAddress, QTcpSocket
 import logging
+import time
+
+from core.schema import PayloadSchemaError, decode_payload
+from .capture import CAPTURE_NDJSON, CaptureWriter
+from .dedup import FrameDeduplicator
+from .framing import NdjsonFramer, LinkStats
+
+class _ClientState:
+    """Per-socket framing buffer and counters."""
+    def __init__(self, peer: str):
+        self.peer = peer
+        self.stats = LinkStats()
+        self.framer = NdjsonFramer(stats=self.stats)
+        self.dedup = FrameDeduplicator()
+        self.connected_at = time.monotonic()
+
+    def as_dict(self) -> dict:
+        elapsed = max(time.monotonic() - self.connected_at, 1e-6)
+        info = self.stats.as_dict()
+        info["skipped_frames"] = self.dedup.stats.skipped_frames
+        info["frame_skip_rate"] = self.dedup.stats.frame_skip_rate
+        info.update({
+            "peer": self.peer,
+            "seconds_connected": round(elapsed, 1),
+            "bytes_per_second": self.stats.bytes_received / elapsed,
+            "frames_per_second": self.stats.frames / elapsed,
+        })
+        return info
 
 class DataListener(QObject):
     """
     Listens for TCP connections from the external helper (C#).
     Expects newline-delimited JSON.
     """
-    data_received = pyqtSignal(dict)
-    
+    data_received = pyqtSignal(object) # HelperPayload (core/schema.py)
+
     def __init__(self, port=65432, parent=None):
         super().__init__(parent)
         self.port = port
         self.server = QTcpServer(self)
         self.logger = logging.getLogger(__name__)
-        
+
         # Connection handling
         self.server.newConnection.connect(self._handle_new_connection)
-        
+
         self.clients = []
-        
+        self._client_state = {} # socket -> _ClientState
+        self.recorder = None # CaptureWriter while recording
+
         # self._start_server() # Don't auto-start
 
     def start_listening(self):
@@ -36,11 +66,26 @@ class DataListener(QObject):
         if self.server.isListening():
             self.server.close()
             self.logger.info("DataListener stopped listening")
-        
+
         # Disconnect clients
         for socket in self.clients:
             socket.disconnectFromHost()
         self.clients.clear()
+        self.stop_recording()
+
+    def start_recording(self, path):
+        """Tees every received frame into a capture file (see core/replay.py)."""
+        self.stop_recording()
+        self.recorder = CaptureWriter(path)
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    def client_stats(self) -> list:
+        """Throughput and parse-failure counters for every connected client."""
+        return [state.as_dict() for state in self._client_state.values()]
 
     def _handle_new_connection(self):
         while self.server.hasPendingConnections():
@@ -48,34 +93,42 @@ class DataListener(QObject):
             socket.readyRead.connect(lambda s=socket: self._read_data(s))
             socket.disconnected.connect(lambda s=socket: self._client_disconnected(s))
             self.clients.append(socket)
-            self.logger.info("New client connected")
+            peer = f"{socket.peerAddress().toString()}:{socket.peerPort()}"
+            self._client_state[socket] = _ClientState(peer)
+            self.logger.info(f"New client connected ({peer})")
 
     def _read_data(self, socket):
-        # Read all available data
-        data = socket.readAll()
-        # Handle potential fragmentation or multiple messages?
-        # For simplicity, assume one JSON object per line/message for now.
-        # Ideally we buffer split by newline.
-        
-        text = str(data, encoding='utf-8').strip()
-        if not text:
+        state = self._client_state.get(socket)
+        if state is None:
             return
-            
-        try:
-            # Parse JSON
-            doc = QJsonDocument.fromJson(data)
-            if not doc.isNull() and doc.isObject():
-                json_obj = doc.object()
-                # Convert to python dict
-                py_dict = json_obj.toVariant()
-                self.data_received.emit(py_dict)
-            else:
-                self.logger.warning(f"Received invalid JSON: {text}")
-        except Exception as e:
-            self.logger.error(f"Error parsing data: {e}")
+
+        # TCP may split one JSON line across reads or coalesce several into one,
+        # so buffer per socket and only parse complete lines.
+        data = socket.readAll()
+        for frame in state.framer.feed(data.data()):
+            if self.recorder is not None:
+                self.recorder.write(CAPTURE_NDJSON, frame)
+            if state.dedup.is_repeat(frame):
+                continue # Identical to the previous frame, nothing new to decode
+            try:
+                py_dict = decode_payload(frame)
+            except PayloadSchemaError as e:
+                state.stats.garbled_frames += 1
+                self.logger.warning(f"Received invalid payload from {state.peer}: {e}")
+                continue
+            except ValueError: # JSONDecodeError, UnicodeDecodeError
+                state.stats.garbled_frames += 1
+                self.logger.warning(f"Received invalid JSON from {state.peer}: {frame[:60]!r}")
+                continue
+
+            self.data_received.emit(py_dict)
 
     def _client_disconnected(self, socket):
-        self.logger.info("Client disconnected")
+        state = self._client_state.pop(socket, None)
+        if state is not None:
+            self.logger.info(f"Client disconnected: {state.as_dict()}")
+        else:
+            self.logger.info("Client disconnected")
         if socket in self.clients:
             self.clients.remove(socket)
         socket.deleteLater()
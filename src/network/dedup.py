@@ -0,0 +1,110 @@
+import hashlib
+from typing import Any, Dict, Optional, Set
+
+# Bookkeeping keys that change on every payload without changing any state
+_META_KEYS = ("type", "seq", "seq_start", "seq_gap")
+
+# Fixed for a ROM: while snapshots name the same seed (core/seed_cache.py) they aren't hashed again
+STATIC_SECTIONS = ("spoiler_log", "capsule_sprite_values")
+
+
+def digest(data) -> bytes:
+    """Short blake2b digest. 16 bytes is plenty to tell two consecutive frames apart."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class DedupStats:
+    """How much work the duplicate checks saved."""
+
+    def __init__(self):
+        self.frames = 0            # Raw frames checked
+        self.skipped_frames = 0    # Byte-identical to the previous frame, dropped before decoding
+        self.sections = 0          # Top-level payload sections checked
+        self.skipped_sections = 0  # Sections identical to what was last applied
+
+    @property
+    def frame_skip_rate(self) -> float:
+        return self.skipped_frames / self.frames if self.frames else 0.0
+
+    @property
+    def section_skip_rate(self) -> float:
+        return self.skipped_sections / self.sections if self.sections else 0.0
+
+    def as_dict(self) -> dict:
+        info = dict(vars(self))
+        info["frame_skip_rate"] = self.frame_skip_rate
+        info["section_skip_rate"] = self.section_skip_rate
+        return info
+
+    def __repr__(self):
+        return (f"DedupStats(frames={self.frames}, skipped={self.skipped_frames} "
+                f"({self.frame_skip_rate:.0%}), sections={self.sections}, "
+                f"skipped={self.skipped_sections} ({self.section_skip_rate:.0%}))")
+
+
+class FrameDeduplicator:
+    """
+    Remembers the digest of the last raw frame on a link.
+    The helper re-sends identical snapshots while nothing happens in game
+    (menus, standing still), those never need to reach json.loads.
+    """
+
+    def __init__(self, stats: Optional[DedupStats] = None):
+        self.stats = stats or DedupStats()
+        self._last = None
+
+    def is_repeat(self, frame) -> bool:
+        self.stats.frames += 1
+        current = digest(frame)
+        if current == self._last:
+            self.stats.skipped_frames += 1
+            return True
+        self._last = current
+        return False
+
+    def reset(self):
+        """Forget the last frame, so the next one is let through even if identical (e.g. after SYNC)."""
+        self._last = None
+
+
+class SectionFingerprints:
+    """
+    Digest per top-level payload section ("inventory", "characters", ...)
+    as last applied, so a snapshot only re-runs the parts that changed.
+    """
+
+    def __init__(self, stats: Optional[DedupStats] = None):
+        self.stats = stats or DedupStats()
+        self._digests: Dict[str, bytes] = {}
+        self._seed: Optional[str] = None # seed_hash the static sections were fingerprinted under
+
+    def update(self, payload: Dict[str, Any]) -> Set[str]:
+        """Records the sections of a snapshot and returns the keys that differ from last time."""
+        changed = set()
+        seed = payload.get("seed_hash")
+        same_seed = seed is not None and seed == self._seed
+        if seed is not None:
+            self._seed = seed
+        for key, value in payload.items():
+            if value is None or key in _META_KEYS:
+                continue
+            self.stats.sections += 1
+            if same_seed and key in STATIC_SECTIONS and key in self._digests:
+                # The spoiler log is the largest section; with the seed unchanged it can't have changed
+                self.stats.skipped_sections += 1
+                continue
+            current = digest(repr(value).encode("utf-8"))
+            if self._digests.get(key) == current:
+                self.stats.skipped_sections += 1
+            else:
+                self._digests[key] = current
+                changed.add(key)
+        return changed
+
+    def forget(self, *keys):
+        """Drops the given sections (all if none given); they count as changed next time."""
+        if not keys:
+            self._digests.clear()
+            self._seed = None
+        for key in keys:
+            self._digests.pop(key, None)
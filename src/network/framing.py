@@ -0,0 +1,195 @@
+import logging
+from typing import Optional, Tuple
+
+from .protocol import HEADER
+
+# Hard cap for a single frame. A full sync (spoiler log + sprites) is ~30 KB,
+# so anything near this size is a broken stream, not real data.
+DEFAULT_MAX_FRAME_SIZE = 1024 * 1024
+
+
+class FrameError(Exception):
+    """The byte stream can no longer be framed (the link must be dropped)."""
+
+
+class LinkStats:
+    """
+    Counters for one helper link.
+    Kept as plain attributes so the hot path is a simple `+= 1`.
+    """
+
+    def __init__(self):
+        self.frames = 0            # Complete frames handed to the decoder
+        self.bytes_received = 0    # Raw bytes fed into the framer
+        self.truncated_frames = 0  # Frames dropped for exceeding max_frame_size
+        self.garbled_frames = 0    # Frames that failed to decode (bad JSON, wrong type)
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v}" for k, v in vars(self).items())
+        return f"LinkStats({fields})"
+
+
+class NdjsonFramer:
+    """
+    Incremental newline-delimited JSON framer.
+
+    Bytes are appended to a single bytearray and only the newly received
+    region is scanned for delimiters, so a large sync burst costs O(n)
+    instead of re-splitting the whole buffer for every line.
+    Complete frames are returned as `bytes`, ready for `json.loads`.
+    """
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE, stats: LinkStats = None):
+        self.max_frame_size = max_frame_size
+        self.stats = stats if stats is not None else LinkStats()
+        self._buffer = bytearray()
+        self._scan_from = 0       # Everything before this index is known to hold no delimiter
+        self._discarding = False  # True while skipping the tail of an oversized frame
+
+    def feed(self, data) -> list:
+        """
+        Appends `data` (bytes, bytearray or memoryview) and returns a list
+        of complete frames. Empty lines are skipped.
+        """
+        buf = self._buffer
+        buf += data
+        self.stats.bytes_received += len(data)
+
+        frames = []
+        start = 0
+        view = memoryview(buf)
+        try:
+            while True:
+                nl = buf.find(b"\n", self._scan_from)
+                if nl == -1:
+                    break
+                self._scan_from = nl + 1
+
+                if self._discarding:
+                    # Tail of a frame we already gave up on
+                    self._discarding = False
+                elif nl - start > self.max_frame_size:
+                    self._drop_oversized(nl - start)
+                else:
+                    frame = bytes(view[start:nl]).strip()
+                    if frame:
+                        frames.append(frame)
+                        self.stats.frames += 1
+                start = nl + 1
+
+            pending = len(buf) - start
+            if pending > self.max_frame_size and not self._discarding:
+                # No delimiter in sight: drop what we have and skip until the next newline
+                self._drop_oversized(pending)
+                self._discarding = True
+                start = len(buf)
+            elif self._discarding:
+                start = len(buf)
+        finally:
+            view.release()
+
+        # Compact once per feed instead of once per line
+        if start:
+            del buf[:start]
+        self._scan_from = len(buf)
+        return frames
+
+    def take_pending(self) -> bytes:
+        """Removes and returns unframed bytes (used when switching protocols)."""
+        pending = bytes(self._buffer)
+        self.reset()
+        return pending
+
+    def reset(self):
+        """Drops any partial frame (e.g. on reconnect)."""
+        self._buffer.clear()
+        self._scan_from = 0
+        self._discarding = False
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._buffer)
+
+    def _drop_oversized(self, size: int):
+        self.stats.truncated_frames += 1
+        logging.warning(f"Dropping oversized helper frame ({size} bytes > {self.max_frame_size}).")
+
+
+class BinaryFrameReader:
+    """
+    Reader for length-prefixed v2 frames.
+
+    The whole frame (header + body) is assembled in one preallocated buffer.
+    `get_buffer()` hands out exactly the region still missing for the current
+    header or body, so a socket can `recv_into` it and never over-reads into
+    the next frame. Completed frames are returned as (frame_type, memoryview);
+    the view is only valid until the next read.
+    """
+
+    def __init__(self, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE, stats: LinkStats = None):
+        self.max_frame_size = max_frame_size
+        self.stats = stats if stats is not None else LinkStats()
+        self._buffer = bytearray(HEADER.size + max_frame_size)
+        self._view = memoryview(self._buffer)
+        self._reset_frame()
+
+    def get_buffer(self) -> memoryview:
+        """Writable view of the bytes still needed for the current frame part."""
+        return self._view[self._filled:self._need]
+
+    def buffer_updated(self, nbytes: int) -> Optional[Tuple[int, memoryview]]:
+        """
+        Marks `nbytes` of the last `get_buffer()` view as filled.
+        Returns (frame_type, body) once a frame is complete, else None.
+        Raises FrameError on an oversized length prefix.
+        """
+        self._filled += nbytes
+        self.stats.bytes_received += nbytes
+        if self._filled < self._need:
+            return None
+
+        if self._frame_type is None:
+            length, frame_type = HEADER.unpack_from(self._buffer)
+            if length > self.max_frame_size:
+                self.stats.truncated_frames += 1
+                self._reset_frame()
+                raise FrameError(f"Frame length {length} exceeds limit {self.max_frame_size}")
+            self._frame_type = frame_type
+            self._need = HEADER.size + length
+            if length:
+                return None
+
+        frame = (self._frame_type, self._view[HEADER.size:self._need])
+        self.stats.frames += 1
+        self._reset_frame()
+        return frame
+
+    def feed(self, data) -> list:
+        """
+        Push-style variant for callers that already hold the bytes
+        (e.g. leftovers after the handshake). Frame bodies are copied out
+        because the internal buffer is reused.
+        """
+        frames = []
+        src = memoryview(data)
+        offset = 0
+        while offset < len(src):
+            target = self.get_buffer()
+            chunk = min(len(target), len(src) - offset)
+            target[:chunk] = src[offset:offset + chunk]
+            offset += chunk
+            frame = self.buffer_updated(chunk)
+            if frame is not None:
+                frames.append((frame[0], bytes(frame[1])))
+        return frames
+
+    def reset(self):
+        self._reset_frame()
+
+    def _reset_frame(self):
+        self._filled = 0
+        self._need = HEADER.size
+        self._frame_type = None
@@ -0,0 +1,81 @@
+import time
+from typing import Optional
+
+# --- Helper Link States ---
+# What StateManager.connection_state reports (and the ribbon shows).
+LINK_STOPPED = "stopped"            # Auto tracking off
+LINK_WAITING = "waiting"            # Listening, no helper connected
+LINK_CONNECTED = "connected"        # Helper connected and answering
+LINK_UNRESPONSIVE = "unresponsive"  # Connected, but silent for a few heartbeats (hung helper?)
+LINK_RESTARTING = "restarting"      # Helper process being relaunched after a backoff delay
+LINK_FAILED = "failed"              # Gave up: too many restarts in a row, or the server couldn't start
+
+HEARTBEAT_INTERVAL = 2.0   # Seconds between pings to the helper
+DEAD_PEER_TIMEOUT = 10.0   # Seconds of silence before the link is dropped and the helper restarted
+UNRESPONSIVE_AFTER = 2     # Missed heartbeat intervals before the link is shown as unresponsive
+HEALTHY_AFTER = 60.0       # Seconds connected before the restart backoff starts over
+
+
+class Backoff:
+    """Exponential delay between helper restarts: initial, initial*factor, ... capped at `maximum`."""
+
+    def __init__(self, initial=1.0, maximum=30.0, factor=2.0, max_attempts=6):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.max_attempts = max_attempts
+        self.attempts = 0
+
+    def next_delay(self) -> Optional[float]:
+        """Delay before the next attempt, or None once `max_attempts` in a row have been used up."""
+        if self.max_attempts is not None and self.attempts >= self.max_attempts:
+            return None
+        delay = min(self.maximum, self.initial * self.factor ** self.attempts)
+        self.attempts += 1
+        return delay
+
+    def reset(self):
+        self.attempts = 0
+
+
+class LinkHealth:
+    """Liveness bookkeeping and metrics for one HelperInterface (survives reconnects)."""
+
+    RTT_SMOOTHING = 0.2 # EWMA weight of the newest sample
+
+    def __init__(self):
+        self.state = LINK_STOPPED
+        self.connects = 0
+        self.reconnects = 0        # Connections after the first one of a session
+        self.restarts = 0          # Helper relaunches (crash or dead peer)
+        self.dead_peer_drops = 0
+        self.heartbeats_sent = 0
+        self.heartbeats_acked = 0
+        self.rtt_ms = None         # Last heartbeat round trip
+        self.rtt_avg_ms = None     # Smoothed
+        self.rtt_max_ms = 0.0
+        self.last_rx = None        # time.monotonic() of the last byte from the helper
+
+    def record_rtt(self, rtt_ms: float):
+        self.heartbeats_acked += 1
+        self.rtt_ms = rtt_ms
+        self.rtt_max_ms = max(self.rtt_max_ms, rtt_ms)
+        if self.rtt_avg_ms is None:
+            self.rtt_avg_ms = rtt_ms
+        else:
+            self.rtt_avg_ms += self.RTT_SMOOTHING * (rtt_ms - self.rtt_avg_ms)
+
+    def silence(self, now=None) -> float:
+        """Seconds since the helper last sent anything (0 if it never has)."""
+        if self.last_rx is None:
+            return 0.0
+        return (now if now is not None else time.monotonic()) - self.last_rx
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+    def __repr__(self):
+        rtt = f"{self.rtt_avg_ms:.1f}ms" if self.rtt_avg_ms is not None else "n/a"
+        return (f"LinkHealth(state={self.state}, rtt={rtt}, max_rtt={self.rtt_max_ms:.1f}ms, "
+                f"heartbeats={self.heartbeats_acked}/{self.heartbeats_sent}, reconnects={self.reconnects}, "
+                f"restarts={self.restarts}, dead_peer_drops={self.dead_peer_drops})")
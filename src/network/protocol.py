@@ -0,0 +1,99 @@
+import json
+import struct
+from typing import Optional
+
+# --- Helper Link Protocol ---
+# v1: newline-delimited JSON (what the C# helper has always sent).
+# v2: length-prefixed binary frames with a type byte.
+#
+# Negotiation is backwards compatible: a v2-capable helper opens with a single
+# NDJSON hello line and waits for the tracker's ack before switching. Helpers
+# that never send a hello (the current C# build) simply stay on v1.
+#
+#   helper  -> {"hello": {"protocols": [1, 2]}}\n
+#   tracker -> {"hello_ack": {"protocol": 2}}\n
+#   ... both sides now speak v2 frames ...
+#
+# A hello may also list optional features. "commands" means the helper
+# understands JSON command lines on v1 (network/commands.py) and acks them;
+# helpers without it only ever get the bare "SYNC" keyword.
+#
+#   helper  -> {"hello": {"protocols": [1], "features": ["commands"]}}\n
+
+PROTOCOL_NDJSON = 1
+PROTOCOL_BINARY = 2
+SUPPORTED_PROTOCOLS = (PROTOCOL_NDJSON, PROTOCOL_BINARY)
+
+FEATURE_COMMANDS = "commands"
+
+# Frame types (v2)
+FRAME_SNAPSHOT = 0x01   # Full GameState payload
+FRAME_DELTA = 0x02      # Changed fields only
+FRAME_HEARTBEAT = 0x03  # Liveness, empty or tiny body
+FRAME_COMMAND = 0x04    # Control message (either direction)
+
+FRAME_NAMES = {
+    FRAME_SNAPSHOT: "snapshot",
+    FRAME_DELTA: "delta",
+    FRAME_HEARTBEAT: "heartbeat",
+    FRAME_COMMAND: "command",
+}
+
+# Frame header: body length (uint32 LE) + frame type (uint8)
+HEADER = struct.Struct("<IB")
+
+
+def encode_frame(frame_type: int, body: bytes = b"") -> bytes:
+    """Builds a single v2 frame."""
+    return HEADER.pack(len(body), frame_type) + body
+
+
+def encode_json_frame(frame_type: int, obj) -> bytes:
+    """Builds a v2 frame carrying a compact JSON body."""
+    return encode_frame(frame_type, json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def encode_ndjson(obj) -> bytes:
+    """Builds a single v1 line."""
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def hello_message(protocols=SUPPORTED_PROTOCOLS, features=()) -> bytes:
+    hello = {"protocols": list(protocols)}
+    if features:
+        hello["features"] = list(features)
+    return encode_ndjson({"hello": hello})
+
+
+def hello_ack_message(protocol: int) -> bytes:
+    return encode_ndjson({"hello_ack": {"protocol": protocol}})
+
+
+def parse_hello(data: dict) -> Optional[list]:
+    """Returns the offered protocol list if `data` is a hello, else None."""
+    hello = data.get("hello") if isinstance(data, dict) else None
+    if not isinstance(hello, dict):
+        return None
+    return [p for p in hello.get("protocols", []) if isinstance(p, int)]
+
+
+def parse_hello_features(data: dict) -> list:
+    """Optional features listed in a hello (empty for older helpers)."""
+    hello = data.get("hello") if isinstance(data, dict) else None
+    if not isinstance(hello, dict):
+        return []
+    return [f for f in hello.get("features", []) if isinstance(f, str)]
+
+
+def parse_hello_ack(data: dict) -> Optional[int]:
+    """Returns the chosen protocol if `data` is a hello ack, else None."""
+    ack = data.get("hello_ack") if isinstance(data, dict) else None
+    if not isinstance(ack, dict):
+        return None
+    return ack.get("protocol")
+
+
+def choose_protocol(offered) -> int:
+    """Highest protocol both sides speak. Falls back to v1."""
+    common = set(offered) & set(SUPPORTED_PROTOCOLS)
+    return max(common) if common else PROTOCOL_NDJSON
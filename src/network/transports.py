@@ -0,0 +1,412 @@
+"""
+Transports for the helper link. The framing/protocol layer doesn't care
+which one is used, all three deliver a byte stream:
+
+    tcp://localhost:65432    loopback TCP (default, the only one the C# helper speaks)
+    unix:///tmp/l2at.sock    AF_UNIX stream socket (POSIX)
+    shm:///dev/shm/l2at      pair of mmap'd single-producer/single-consumer rings (POSIX)
+
+The shm transport uses <path>.h2t (helper -> tracker) and <path>.t2h
+(tracker -> helper) ring files, each with a named FIFO "doorbell"
+(<ring>.bell) that the producer pokes after publishing. An eventfd would
+be cheaper, but can't be opened by an unrelated helper process.
+"""
+import asyncio
+import logging
+import mmap
+import os
+import select
+import socket
+import struct
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+TRANSPORT_TCP = "tcp"
+TRANSPORT_UNIX = "unix"
+TRANSPORT_SHM = "shm"
+TRANSPORTS = (TRANSPORT_TCP, TRANSPORT_UNIX, TRANSPORT_SHM)
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 65432
+DEFAULT_RING_CAPACITY = 1024 * 1024
+
+
+class Endpoint:
+    """Where the helper link lives. Parsed from strings like "unix:///tmp/l2at.sock"."""
+
+    def __init__(self, kind=TRANSPORT_TCP, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if kind not in TRANSPORTS:
+            raise ValueError(f"Unknown helper transport '{kind}' (expected one of {', '.join(TRANSPORTS)})")
+        if kind != TRANSPORT_TCP and not path:
+            raise ValueError(f"{kind} endpoint needs a path")
+        self.kind = kind
+        self.host = host
+        self.port = port
+        self.path = path
+
+    @classmethod
+    def parse(cls, spec: str) -> "Endpoint":
+        if "://" not in spec:
+            spec = f"{TRANSPORT_TCP}://{spec}"
+        parts = urlsplit(spec)
+        kind = parts.scheme.lower()
+        if kind == TRANSPORT_TCP:
+            return cls(kind, parts.hostname or DEFAULT_HOST, parts.port or DEFAULT_PORT)
+        return cls(kind, path=parts.netloc + parts.path)
+
+    def __str__(self):
+        if self.kind == TRANSPORT_TCP:
+            return f"tcp://{self.host}:{self.port}"
+        return f"{self.kind}://{self.path}"
+
+    def __repr__(self):
+        return f"Endpoint({self})"
+
+
+# --- Server Side (tracker) ---
+
+async def create_server(loop: asyncio.AbstractEventLoop, endpoint: Endpoint, protocol_factory):
+    """Starts listening on `endpoint`. Returns an object with close()."""
+    if endpoint.kind == TRANSPORT_TCP:
+        return await loop.create_server(protocol_factory, endpoint.host, endpoint.port)
+
+    if not hasattr(socket, "AF_UNIX") or os.name == "nt":
+        raise OSError(f"{endpoint.kind} transport isn't available on this platform, use tcp")
+
+    if endpoint.kind == TRANSPORT_UNIX:
+        if os.path.exists(endpoint.path):
+            os.unlink(endpoint.path) # Stale socket from a previous run
+        return await loop.create_unix_server(protocol_factory, endpoint.path)
+
+    server = ShmRingServer(loop, endpoint.path, protocol_factory)
+    server.start()
+    return server
+
+
+def close_server(server, endpoint: Endpoint):
+    server.close()
+    if endpoint.kind == TRANSPORT_UNIX:
+        try:
+            os.unlink(endpoint.path)
+        except OSError:
+            pass
+
+
+class SpscRing:
+    """
+    Byte ring in a shared file mapping. Exactly one writer and one reader.
+    head/tail are free-running 64-bit counters on separate cache lines;
+    each side only ever writes its own counter.
+    """
+    MAGIC = b"L2ATRNG1"
+    FLAGS_OFFSET = 16
+    HEAD_OFFSET = 64
+    TAIL_OFFSET = 128
+    DATA_OFFSET = 192
+
+    FLAG_ATTACHED = 1 # A producer is connected
+    FLAG_CLOSED = 2   # The producer has left
+
+    _U64 = struct.Struct("<Q")
+
+    def __init__(self, path, capacity=DEFAULT_RING_CAPACITY, create=False):
+        self.path = path
+        if create:
+            with open(path, "wb") as f:
+                f.truncate(self.DATA_OFFSET + capacity)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if create:
+            self._map[0:8] = self.MAGIC
+            self._U64.pack_into(self._map, 8, capacity)
+        elif self._map[0:8] != self.MAGIC:
+            raise ConnectionError(f"{path} is not a helper ring")
+        self.capacity = self._U64.unpack_from(self._map, 8)[0]
+        self._data = memoryview(self._map)[self.DATA_OFFSET:self.DATA_OFFSET + self.capacity]
+
+    def _get(self, offset) -> int:
+        return self._U64.unpack_from(self._map, offset)[0]
+
+    def _set(self, offset, value: int):
+        self._U64.pack_into(self._map, offset, value)
+
+    @property
+    def flags(self) -> int:
+        return self._get(self.FLAGS_OFFSET)
+
+    @flags.setter
+    def flags(self, value: int):
+        self._set(self.FLAGS_OFFSET, value)
+
+    def readable(self) -> int:
+        return self._get(self.HEAD_OFFSET) - self._get(self.TAIL_OFFSET)
+
+    def write(self, data) -> int:
+        """Copies as much of `data` as fits. Returns the number of bytes written."""
+        head = self._get(self.HEAD_OFFSET)
+        free = self.capacity - (head - self._get(self.TAIL_OFFSET))
+        n = min(len(data), free)
+        if n <= 0:
+            return 0
+        start = head % self.capacity
+        first = min(n, self.capacity - start)
+        data = memoryview(data)
+        self._data[start:start + first] = data[:first]
+        if n > first:
+            self._data[0:n - first] = data[first:n]
+        self._set(self.HEAD_OFFSET, head + n) # Publish after the copy
+        return n
+
+    def readinto(self, view) -> int:
+        """Copies up to len(view) bytes out of the ring. Returns the number of bytes read."""
+        tail = self._get(self.TAIL_OFFSET)
+        n = min(len(view), self._get(self.HEAD_OFFSET) - tail)
+        if n <= 0:
+            return 0
+        start = tail % self.capacity
+        first = min(n, self.capacity - start)
+        view[:first] = self._data[start:start + first]
+        if n > first:
+            view[first:n] = self._data[0:n - first]
+        self._set(self.TAIL_OFFSET, tail + n)
+        return n
+
+    def reset(self):
+        """Reader side: forget everything for the next producer."""
+        self._set(self.HEAD_OFFSET, 0)
+        self._set(self.TAIL_OFFSET, 0)
+        self.flags = 0
+
+    def close(self):
+        self._data.release()
+        self._map.close()
+        self._file.close()
+
+
+class FifoDoorbell:
+    """Named FIFO used as a cross-process wake-up. Rings coalesce: one read drains them all."""
+
+    def __init__(self, path, create=False):
+        self.path = path
+        if create:
+            if os.path.exists(path):
+                os.unlink(path)
+            os.mkfifo(path, 0o600)
+        # O_RDWR keeps the FIFO open on both ends, so neither side blocks or sees EOF
+        self.fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+
+    def ring(self):
+        try:
+            os.write(self.fd, b"\0")
+        except BlockingIOError:
+            pass # FIFO full: the reader has plenty of pending wake-ups already
+
+    def drain(self):
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(readable)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _ShmTransport(asyncio.Transport):
+    """What the link protocol sees of an shm connection: write() goes into the t2h ring."""
+
+    def __init__(self, server):
+        super().__init__()
+        self._server = server
+        self._closing = False
+
+    def write(self, data):
+        if self._closing:
+            return
+        data = memoryview(data)
+        while data:
+            n = self._server.outgoing.write(data)
+            if n == 0:
+                # Helper isn't reading its commands; they're tiny, so this means it's gone
+                logging.warning("shm transport: command ring full, dropping command")
+                break
+            data = data[n:]
+        self._server.outgoing_bell.ring()
+
+    def get_extra_info(self, name, default=None):
+        if name == "peername":
+            return f"shm:{self._server.path}"
+        return default
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        self._server.outgoing.flags = SpscRing.FLAG_CLOSED
+        self._server.outgoing_bell.ring()
+        self._server._loop.call_soon(self._server._detach, None)
+
+
+class ShmRingServer:
+    """
+    Tracker end of the shm transport. Wakes on the h2t doorbell and pumps
+    the ring straight into the protocol's get_buffer()/buffer_updated(),
+    the same calls asyncio makes for a socket.
+    """
+
+    def __init__(self, loop, path, protocol_factory, capacity=DEFAULT_RING_CAPACITY):
+        self._loop = loop
+        self.path = path
+        self._factory = protocol_factory
+        self._capacity = capacity
+        self._protocol = None
+        self._transport = None
+        self.incoming = self.incoming_bell = None
+        self.outgoing = self.outgoing_bell = None
+
+    def start(self):
+        self.incoming = SpscRing(self.path + ".h2t", self._capacity, create=True)
+        self.outgoing = SpscRing(self.path + ".t2h", 64 * 1024, create=True)
+        self.incoming_bell = FifoDoorbell(self.path + ".h2t.bell", create=True)
+        self.outgoing_bell = FifoDoorbell(self.path + ".t2h.bell", create=True)
+        self._loop.add_reader(self.incoming_bell.fileno(), self._on_bell)
+
+    def _on_bell(self):
+        self.incoming_bell.drain()
+        flags = self.incoming.flags
+        if self._protocol is None:
+            if not flags & SpscRing.FLAG_ATTACHED:
+                return
+            self.outgoing.reset()
+            self._transport = _ShmTransport(self)
+            self._protocol = self._factory()
+            self._protocol.connection_made(self._transport)
+
+        protocol = self._protocol
+        while self.incoming.readable() and self._protocol is protocol:
+            buf = protocol.get_buffer(-1)
+            n = self.incoming.readinto(buf)
+            protocol.buffer_updated(n)
+
+        if flags & SpscRing.FLAG_CLOSED and self._protocol is protocol and not self.incoming.readable():
+            self._detach(None)
+
+    def _detach(self, exc):
+        protocol, self._protocol = self._protocol, None
+        if protocol is None:
+            return
+        self._transport._closing = True
+        self._transport = None
+        self.incoming.reset() # Ready for the next helper
+        protocol.connection_lost(exc)
+
+    def close(self):
+        if self.incoming is None:
+            return
+        self._loop.remove_reader(self.incoming_bell.fileno())
+        if self._transport is not None:
+            self._transport.close()
+        self._detach(None)
+        for obj in (self.incoming, self.outgoing, self.incoming_bell, self.outgoing_bell):
+            obj.close()
+        for suffix in (".h2t", ".t2h", ".h2t.bell", ".t2h.bell"):
+            try:
+                os.unlink(self.path + suffix)
+            except OSError:
+                pass
+        self.incoming = None
+
+
+# --- Client Side (helper / stand-ins) ---
+
+def open_client(endpoint: Endpoint, timeout=5.0):
+    """Connects to the tracker. Returns a socket-like object (sendall/recv/setblocking/close)."""
+    if endpoint.kind == TRANSPORT_TCP:
+        sock = socket.create_connection((endpoint.host, endpoint.port), timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+    if endpoint.kind == TRANSPORT_UNIX:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(endpoint.path)
+        return sock
+    return ShmRingClient(endpoint.path, timeout)
+
+
+class ShmRingClient:
+    """Helper end of the shm transport, with just enough of the socket API for StandInHelper."""
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self._timeout = timeout
+        try:
+            self._out = SpscRing(path + ".h2t")
+            self._in = SpscRing(path + ".t2h")
+            self._out_bell = FifoDoorbell(path + ".h2t.bell")
+            self._in_bell = FifoDoorbell(path + ".t2h.bell")
+        except FileNotFoundError:
+            raise ConnectionRefusedError(f"No tracker listening on shm://{path}") from None
+        if self._out.flags & SpscRing.FLAG_ATTACHED and not self._out.flags & SpscRing.FLAG_CLOSED:
+            raise ConnectionRefusedError(f"shm://{path} already has a helper attached")
+        self._out.flags = SpscRing.FLAG_ATTACHED
+        self._out_bell.ring()
+
+    def sendall(self, data):
+        data = memoryview(data)
+        deadline = None
+        while data:
+            n = self._out.write(data)
+            if n:
+                data = data[n:]
+                self._out_bell.ring()
+                deadline = None
+                continue
+            # Ring full: the tracker is behind, back off briefly
+            if deadline is None:
+                deadline = time.monotonic() + (self._timeout or 5.0)
+            elif time.monotonic() > deadline:
+                raise TimeoutError("shm ring stayed full")
+            time.sleep(0.0005)
+
+    def recv(self, bufsize: int) -> bytes:
+        buf = bytearray(bufsize)
+        while True:
+            n = self._in.readinto(buf)
+            if n:
+                return bytes(buf[:n])
+            if self._in.flags & SpscRing.FLAG_CLOSED:
+                return b""
+            if self._timeout == 0:
+                raise BlockingIOError()
+            if not self._in_bell.wait(self._timeout):
+                raise socket.timeout("timed out")
+            self._in_bell.drain()
+
+    def setblocking(self, flag: bool):
+        self._timeout = None if flag else 0
+
+    def settimeout(self, value):
+        self._timeout = value
+
+    def setsockopt(self, *args):
+        pass
+
+    def close(self):
+        if self._out is None:
+            return
+        self._out.flags = SpscRing.FLAG_ATTACHED | SpscRing.FLAG_CLOSED
+        self._out_bell.ring()
+        for obj in (self._out, self._in, self._out_bell, self._in_bell):
+            obj.close()
+        self._out = None
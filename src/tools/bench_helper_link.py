@@ -0,0 +1,72 @@
+"""
+Throughput benchmark for the helper link (HelperInterface reader side).
+
+Runs the tracker's TCP server in-process and drives it with the Python
+stand-in helper over both protocols.
+
+Usage:
+    python src/tools/bench_helper_link.py --count 5000
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.helper_interface import HelperInterface
+from network.protocol import PROTOCOL_NDJSON, PROTOCOL_BINARY
+from tools.stand_in_helper import StandInHelper, sample_snapshot
+
+BENCH_PORT = 65433  # Keep clear of a running tracker
+
+
+def run_once(protocol: int, count: int, port: int) -> float:
+    received = 0
+    done = threading.Event()
+
+    def on_data(_payload):
+        nonlocal received
+        received += 1
+        if received >= count:
+            done.set()
+
+    interface = HelperInterface(on_data, port=port)
+    interface.start_server()
+
+    helper = StandInHelper(port=port, protocol=protocol)
+    helper.connect()
+    payload = sample_snapshot()
+
+    start = time.perf_counter()
+    for i in range(count):
+        payload["player_x"] = i
+        helper.send_snapshot(payload)
+    done.wait(timeout=60)
+    elapsed = time.perf_counter() - start
+
+    helper.close()
+    interface.stop()
+    if received < count:
+        logging.warning(f"Only {received}/{count} payloads arrived.")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Helper link throughput benchmark.")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=BENCH_PORT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    for protocol in (PROTOCOL_NDJSON, PROTOCOL_BINARY):
+        # Separate port per run: the previous listener may still be in TIME_WAIT
+        elapsed = run_once(protocol, args.count, args.port + protocol)
+        print(f"protocol v{protocol}: {args.count} snapshots in {elapsed:.3f}s "
+              f"({args.count / elapsed:,.0f} payloads/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Inventory / scenario decode benchmark for the native memory reader:
+naive per-item decoding (a substring search per tool id and a mask test per
+item, like helper/Core/DataReaders.cs) against core/item_decoder.py with
+every installed backend. All decoders must agree on every sample.
+
+Usage:
+    python src/tools/bench_item_decode.py
+    python src/tools/bench_item_decode.py --samples 2000 --repeat 10
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.item_decoder import ItemDecoder, available_backends
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+INVENTORY_SIZE = 0xA32E60 - 0xA32DA1 # inventory_range of the Snes9x profiles
+SCENARIO_SIZE = 3
+
+
+def _load(name):
+    with open(DATA_DIR / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class NaiveDecoder:
+    """One test per item, the way the helper does it."""
+
+    def __init__(self, tool_items, scenario_items):
+        self.tools = tool_items
+        self.scenario = scenario_items
+
+    def decode(self, inventory, scenario):
+        data = bytes(inventory)
+        value = int.from_bytes(scenario, "little")
+        inv, keys = [], []
+        for name, item in self.tools.items():
+            if item.get("type") == "normal":
+                if int(item["obtained_value"], 16).to_bytes(2, "little") in data:
+                    inv.append(name)
+            elif value & int(item["obtained_value"].replace(" ", ""), 2):
+                inv.append(name)
+        for name, item in self.scenario.items():
+            if value & int(item["obtained_value"].replace(" ", ""), 2):
+                keys.append(name)
+        return inv, keys
+
+
+def make_samples(count: int, tool_items: dict, seed=1) -> list:
+    """Inventories of random consumables / equipment with some tools mixed in, plus a random scenario field."""
+    rng = random.Random(seed)
+    tool_ids = [int(item["obtained_value"], 16) for item in tool_items.values() if item.get("type") == "normal"]
+    samples = []
+    for _ in range(count):
+        inventory = bytearray(INVENTORY_SIZE)
+        for slot in range(0, INVENTORY_SIZE - 1, 2):
+            roll = rng.random()
+            if roll < 0.05:
+                item_id = rng.choice(tool_ids)
+            elif roll < 0.6:
+                item_id = rng.randrange(0x0001, 0x0380) # Not a tool
+            else:
+                continue
+            inventory[slot:slot + 2] = item_id.to_bytes(2, "little")
+        samples.append((bytes(inventory), rng.getrandbits(8 * SCENARIO_SIZE).to_bytes(SCENARIO_SIZE, "little")))
+    return samples
+
+
+def bench(decode, samples: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for inventory, scenario in samples:
+            decode(inventory, scenario)
+        best = min(best, time.perf_counter() - start)
+    return best / len(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inventory / scenario decode benchmark.")
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tool_items, scenario_items = _load("tool_items.json"), _load("scenario_items.json")
+    samples = make_samples(args.samples, tool_items)
+    naive = NaiveDecoder(tool_items, scenario_items)
+    decoders = {backend: ItemDecoder(tool_items, scenario_items, SCENARIO_SIZE, backend) for backend in available_backends()}
+
+    for inventory, scenario in samples:
+        expected = naive.decode(inventory, scenario)
+        for backend, decoder in decoders.items():
+            bits = decoder.decode(inventory, scenario)
+            got = decoder.names(bits & decoder.tool_bits), decoder.names(bits & decoder.scenario_bits)
+            if tuple(map(sorted, got)) != tuple(map(sorted, expected)):
+                sys.exit(f"{backend} disagrees with the naive decoder: {got} != {expected}")
+
+    print(f"{len(samples)} samples ({INVENTORY_SIZE}-byte inventory, {SCENARIO_SIZE}-byte scenario), best of {args.repeat}")
+    baseline = bench(naive.decode, samples, args.repeat)
+    print(f"{'naive':8s} {baseline * 1e6:7.2f} us/poll")
+    for backend, decoder in decoders.items():
+        elapsed = bench(decoder.decode, samples, args.repeat)
+        print(f"{backend:8s} {elapsed * 1e6:7.2f} us/poll  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
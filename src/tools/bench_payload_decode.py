@@ -0,0 +1,74 @@
+"""
+Decode benchmark for helper payloads: compares the JSON backends of
+core/schema.py (msgspec / orjson / json, whichever are installed) on the
+same frames, validation included.
+
+Frames come from an NDJSON file (one helper frame per line, e.g. helper
+output captured with `nc -l 65432 > traffic.ndjson`) or are synthesized.
+
+Usage:
+    python src/tools/bench_payload_decode.py
+    python src/tools/bench_payload_decode.py --input traffic.ndjson --repeat 20
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.schema import PayloadDecoder, available_backends
+from tools.stand_in_helper import sample_snapshot
+
+
+def load_frames(path) -> list:
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\r\n") for line in f if line.strip()]
+
+
+def synthesize_frames(count: int) -> list:
+    """Walking player with the occasional inventory change, like a quiet stretch of play."""
+    frames = []
+    payload = sample_snapshot()
+    for i in range(count):
+        payload["player_x"] = 1024 + i % 300
+        payload["player_y"] = 2048 + (i // 300) % 300
+        if i % 50 == 0:
+            payload["inventory"] = payload["inventory"] + [f"Item {i}"]
+        frames.append(json.dumps(payload).encode("utf-8"))
+    return frames
+
+
+def bench(backend: str, frames: list, repeat: int) -> float:
+    decode = PayloadDecoder(backend).decode
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            decode(frame)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Helper payload decode benchmark.")
+    parser.add_argument("--input", help="NDJSON file with recorded helper frames")
+    parser.add_argument("--count", type=int, default=5000, help="Synthesized frames (without --input)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.input) if args.input else synthesize_frames(args.count)
+    total_bytes = sum(len(f) for f in frames)
+    print(f"{len(frames)} frames, {total_bytes / len(frames):.0f} bytes avg, best of {args.repeat}")
+
+    baseline = None
+    for backend in reversed(available_backends()): # stdlib json first
+        elapsed = bench(backend, frames, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{backend:8s} {elapsed * 1e6 / len(frames):7.2f} us/frame  "
+              f"{len(frames) / elapsed:10,.0f} frames/s  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Poll scheduler benchmark (core/poll_scheduler.py): runs MemoryReaderSource
+against a dummy emulator (tools/dummy_emulator.py) whose game advances at the
+helper's 10 ticks/s, once per schedule, and prints reads per second:
+
+    fixed 100ms   everything at the old single rate
+    fixed 33ms    everything at the rate the player position wants
+    adaptive      per-region intervals with change detection and back-off
+
+Usage (Linux):
+    python src/tools/bench_poll_scheduler.py
+    python src/tools/bench_poll_scheduler.py --seconds 20 --tick-rate 20
+"""
+import argparse
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.memory_reader import POLL_INTERVAL, MemoryReaderSource
+from core.poll_scheduler import PollScheduler
+from tools.dummy_emulator import DEFAULT_PROFILE, advance, spawn
+
+
+def run(profile_name: str, scheduler: PollScheduler, seconds: float, tick_rate: float, seed=1):
+    child, pid, profile, base = spawn(profile_name, seed)
+    payloads = []
+    source = MemoryReaderSource(pid, payloads.append, profile_name=profile_name, base=base, scheduler=scheduler)
+    stop = threading.Event()
+
+    def play():
+        while not stop.wait(1.0 / tick_rate):
+            advance(child)
+
+    player = threading.Thread(target=play, daemon=True)
+    try:
+        advance(child)
+        player.start()
+        source.start()
+        time.sleep(seconds)
+        source.stop()
+        source.join(5)
+    finally:
+        stop.set()
+        player.join(5)
+        child.stdin.close()
+        child.wait(5)
+    return source, len(payloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll scheduler benchmark.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Run time per schedule")
+    parser.add_argument("--tick-rate", type=float, default=10.0, help="Dummy game ticks per second")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    schedules = {
+        f"fixed {POLL_INTERVAL * 1000:.0f}ms": PollScheduler.fixed(POLL_INTERVAL),
+        "fixed 33ms": PollScheduler.fixed(1 / 30),
+        "adaptive": PollScheduler(),
+    }
+    print(f"{args.profile}: {args.seconds:.0f}s per schedule, game at {args.tick_rate:.0f} ticks/s")
+    for name, scheduler in schedules.items():
+        source, payloads = run(args.profile, scheduler, args.seconds, args.tick_rate)
+        stats, elapsed = source.stats, args.seconds
+        region_reads = sum(region.reads for region in scheduler.regions.values())
+        decodes = sum(region.changes for region in scheduler.regions.values())
+        print(f"{name:12s} {stats.reads / elapsed:6.1f} reads/s  {stats.syscalls / elapsed:6.1f} syscalls/s  "
+              f"{stats.bytes_read / elapsed / 1024:6.1f} KiB/s  {region_reads / elapsed:6.1f} region reads/s  "
+              f"{decodes / elapsed:5.1f} decodes/s  {payloads / elapsed:5.1f} payloads/s")
+        print(f"{'':12s} {scheduler.describe(elapsed)}")
+    print(f"Helper poll_ms for this schedule: {PollScheduler().poll_ms()}")
+
+
+if __name__ == "__main__":
+    main()
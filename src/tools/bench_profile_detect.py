@@ -0,0 +1,70 @@
+"""
+Profile detection benchmark (core/profile_detect.py): a full signature scan
+of a dummy emulator (tools/dummy_emulator.py) per scan backend, against an
+attach that finds the executable in the detection cache. Once with the
+profile's own layout, once with the fake WRAM moved like another build.
+
+Usage (Linux):
+    python src/tools/bench_profile_detect.py
+    python src/tools/bench_profile_detect.py --shift 0x12340 --ticks 1000 --repeat 5
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.memory_reader import load_profiles
+from core.profile_detect import ProfileDetector, available_backends
+from tools.dummy_emulator import DEFAULT_PROFILE, advance, spawn
+
+
+def bench(profile_name: str, shift: int, ticks: int, repeat: int):
+    child, pid, profile, base = spawn(profile_name, seed=1, shift=shift)
+    try:
+        advance(child, ticks) # Enough game state (a tool) for a shifted match to count
+        with tempfile.TemporaryDirectory(prefix="l2at-detect-") as directory:
+            cache_file = Path(directory) / "emulators.json"
+            for backend in available_backends():
+                detector = ProfileDetector(load_profiles(), cache_file, backend)
+                for _ in range(repeat):
+                    detected, _ = detector.detect(pid, use_cache=False)
+                stats = detector.stats
+                mib = stats.scanned_bytes / repeat / 1048576
+                ms = stats.scan_ms / repeat
+                print(f"  scan   {backend:6s} {ms:8.1f} ms  {mib:5.1f} MiB  {mib / ms * 1000:7.1f} MiB/s  -> {detected.name}")
+
+            started = time.perf_counter()
+            for _ in range(repeat):
+                detected, _ = ProfileDetector(load_profiles(), cache_file).detect(pid) # Cold detector, warm cache
+            ms = (time.perf_counter() - started) * 1000 / repeat
+            print(f"  cached        {ms:8.2f} ms (profiles, hash lookup, cache file)  -> {detected.name}")
+        ok = (detected.character_slots, detected.pointer_base) == (profile.character_slots, profile.pointer_base)
+        print(f"  {'matches' if ok else 'DOES NOT MATCH'} the dummy's layout ({profile.name})")
+        return ok
+    finally:
+        child.stdin.close()
+        child.wait(5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile detection benchmark.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    parser.add_argument("--shift", type=lambda text: int(text, 0), default=0x12340, help="WRAM shift of the second run")
+    parser.add_argument("--ticks", type=int, default=600, help="Dummy game ticks before detecting")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    ok = True
+    for shift in (0, args.shift):
+        print(f"{args.profile}, WRAM shift 0x{shift:X}:")
+        ok &= bench(args.profile, shift, args.ticks, args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
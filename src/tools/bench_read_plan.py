@@ -0,0 +1,71 @@
+"""
+Read planner benchmark (core/read_plan.py): prints the WRAM read plan of an
+emulator profile for several merge thresholds and measures syscalls, bytes
+and time per poll against a dummy emulator process (tools/dummy_emulator.py).
+
+Usage (Linux):
+    python src/tools/bench_read_plan.py
+    python src/tools/bench_read_plan.py --profile "Snes9x 1.62.3-nwa" --gaps 0 64 4096 --polls 5000
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.memory_reader import MemoryReader
+from core.process_memory import ProcessMemory
+from tools.dummy_emulator import DEFAULT_PROFILE, advance, spawn
+
+
+def bench(pid: int, base: int, profile, gap: int, polls: int):
+    memory = ProcessMemory(pid)
+    reader = MemoryReader(memory, base, profile, gap)
+    reader.read_game_state() # Static ROM data is read (and cached) on the first poll
+    memory.syscalls = memory.bytes_read = 0
+
+    start = time.perf_counter()
+    for _ in range(polls):
+        reader.read_game_state()
+    elapsed = time.perf_counter() - start
+    syscalls, nbytes = memory.syscalls / polls, memory.bytes_read / polls
+
+    # The raw WRAM read alone, without decoding
+    spans = reader.plan.bind(base)
+    raw_start = time.perf_counter()
+    for _ in range(polls):
+        memory.readv(reader.plan.buffer, spans)
+    raw = time.perf_counter() - raw_start
+    return reader, syscalls, nbytes, elapsed / polls, raw / polls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory read planner benchmark.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    parser.add_argument("--gaps", type=int, nargs="+", default=[0, 16, 64, 256, 1024, 4096])
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--plan", action="store_true", help="Print the full plan for every gap")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    child, pid, profile, base = spawn(args.profile, seed=1)
+    try:
+        advance(child, 500) # Something in the inventory and on the map
+        print(f"{profile.name}: {args.polls} polls per gap")
+        for gap in args.gaps:
+            reader, syscalls, nbytes, per_poll, raw = bench(pid, base, profile, gap, args.polls)
+            plan = reader.plan
+            if args.plan:
+                print(plan.describe())
+            print(f"gap {gap:5d}: {len(plan.spans):2d} WRAM spans, {plan.size:5d} bytes "
+                  f"({plan.size - plan.field_bytes} bridged)  {syscalls:.2f} syscalls/poll  {nbytes:6.0f} bytes/poll  "
+                  f"read {raw * 1e6:5.1f} us  poll {per_poll * 1e6:6.1f} us")
+    finally:
+        child.stdin.close()
+        child.wait(5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Latency / CPU benchmark of the helper link transports (network/transports.py).
+
+The tracker side (HelperInterface) runs in this process; the helper side is
+a stand-in helper in a child process sending snapshots at a fixed rate
+(60 Hz by default, i.e. one per frame). Each payload carries its send time
+(time.monotonic, which is system-wide), so latency covers
+send -> transport -> framing -> decode -> callback.
+
+Usage:
+    python src/tools/bench_transports.py --rate 60 --duration 10
+    python src/tools/bench_transports.py --transports unix,shm --rate 1000
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+from core.helper_interface import HelperInterface
+from network.transports import Endpoint, TRANSPORTS
+from tools.stand_in_helper import StandInHelper, sample_snapshot
+
+BENCH_PORT = 65434 # Keep clear of a running tracker
+
+
+def run_client(endpoint: Endpoint, protocol: int, rate: float, duration: float):
+    """Child process: send timestamped snapshots at `rate` Hz for `duration` seconds."""
+    helper = StandInHelper(protocol=protocol, endpoint=endpoint)
+    helper.connect()
+    payload = sample_snapshot()
+    interval = 1.0 / rate
+    start = next_send = time.monotonic()
+    i = 0
+    while next_send - start < duration:
+        delay = next_send - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        payload["player_x"] = i % 4096
+        payload["sent_at"] = time.monotonic()
+        helper.send_snapshot(payload)
+        i += 1
+        next_send += interval
+    helper.close()
+
+
+def _child_cpu() -> float:
+    if resource is None:
+        return float("nan")
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench(endpoint: Endpoint, protocol: int, rate: float, duration: float) -> dict:
+    latencies = []
+
+    def on_data(payload):
+        sent_at = payload.get("sent_at")
+        if sent_at is not None:
+            latencies.append(time.monotonic() - sent_at)
+
+    interface = HelperInterface(on_data, endpoint=endpoint)
+    interface.start_server()
+    if not interface.running:
+        raise RuntimeError(f"Could not listen on {endpoint}")
+    time.sleep(0.1)
+
+    cpu_before, child_before = time.process_time(), _child_cpu()
+    child = subprocess.run(
+        [sys.executable, __file__, "--client", str(endpoint), "--protocol", str(protocol),
+         "--rate", str(rate), "--duration", str(duration)],
+        check=True,
+    )
+    time.sleep(0.2) # Let the last frames drain
+    tracker_cpu = time.process_time() - cpu_before
+    helper_cpu = _child_cpu() - child_before
+    interface.stop()
+    time.sleep(0.2)
+
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "payloads": n,
+        "p50_us": latencies[n // 2] * 1e6 if n else float("nan"),
+        "p99_us": latencies[min(n - 1, int(n * 0.99))] * 1e6 if n else float("nan"),
+        "max_us": latencies[-1] * 1e6 if n else float("nan"),
+        "mean_us": statistics.fmean(latencies) * 1e6 if n else float("nan"),
+        "tracker_cpu_pct": 100 * tracker_cpu / duration,
+        "helper_cpu_pct": 100 * helper_cpu / duration, # Includes interpreter start-up
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Helper link transport benchmark.")
+    parser.add_argument("--transports", default=",".join(TRANSPORTS) if os.name != "nt" else "tcp")
+    parser.add_argument("--protocol", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--rate", type=float, default=60.0, help="Snapshots per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per transport")
+    parser.add_argument("--port", type=int, default=BENCH_PORT)
+    parser.add_argument("--client", metavar="ENDPOINT", help=argparse.SUPPRESS) # Child process mode
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.client:
+        run_client(Endpoint.parse(args.client), args.protocol, args.rate, args.duration)
+        return
+
+    tmp = tempfile.mkdtemp(prefix="l2at-bench-")
+    endpoints = {
+        "tcp": Endpoint("tcp", "127.0.0.1", args.port),
+        "unix": Endpoint("unix", path=os.path.join(tmp, "link.sock")),
+        "shm": Endpoint("shm", path=os.path.join(tmp, "link")),
+    }
+    print(f"{args.rate:g} Hz for {args.duration:g}s per transport, protocol v{args.protocol}")
+    print(f"{'transport':9s} {'payloads':>8s} {'p50 us':>8s} {'p99 us':>8s} {'max us':>8s} {'tracker cpu':>12s} {'helper cpu':>11s}")
+    for name in args.transports.split(","):
+        result = bench(endpoints[name.strip()], args.protocol, args.rate, args.duration)
+        print(f"{name:9s} {result['payloads']:8d} {result['p50_us']:8.0f} {result['p99_us']:8.0f} {result['max_us']:8.0f} "
+              f"{result['tracker_cpu_pct']:11.1f}% {result['helper_cpu_pct']:10.1f}%")
+    try:
+        os.rmdir(tmp)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Stand-in emulator process for testing the native memory reader
+(core/memory_reader.py) on Linux without Snes9x.
+
+The child process maps a memfd named after the emulator executable
+(e.g. "snes9x-x64.exe"), so find_module_base() finds it like the real
+module, and lays out a fake WRAM at the offsets from emulator_addresses.json.
+A seeded GameSimulator provides the game: every line on stdin advances it
+one tick, writes it into the fake WRAM / ROM, and prints the payload the
+reader is expected to produce. The ROM holds the simulator's spoiler log and
+capsule sprites plus the vanilla shop lists (shop_data.json) behind a LoROM
+header. --shift moves the fake WRAM (not the ROM pointer) like another
+emulator build would, for profile detection (core/profile_detect.py).
+
+The parent (default mode) spawns the child - being its parent is what allows
+process_vm_readv under Yama ptrace_scope 1 - and compares each read, and the
+first read with every delta since applied on top, with the static seed data
+resolved from a temporary seed cache (core/seed_cache.py) the way StateManager
+does. A second reader then has to restore that seed from the cache alone.
+
+Usage:
+    python src/tools/dummy_emulator.py --ticks 2000 --seed 1
+    python src/tools/dummy_emulator.py --profile "Snes9x 1.62.3-nwa"
+    python src/tools/dummy_emulator.py --shift 0x2000
+"""
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import mmap
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.memory_reader import (
+    CAPSULE_NAMES, CAPSULE_SPRITE_COUNT, CAPSULE_SPRITE_STRIDE, CHARACTER_IDS, SHOP_ADDRESSES, SHOP_DATA,
+    SHOP_END, SHOP_SPELLS, SPOILER_LOG_MARKER, TRANSPORT_SHIP,
+    MemoryReader, find_profile, load_profiles, _load_json, _shop_range,
+)
+from core.payloads import delta_is_empty, merge_payloads
+from core.process_memory import ProcessMemory, ProcessMemoryError
+from core.profile_detect import ProfileDetector
+from core.read_plan import DEFAULT_GAP
+from core.seed_cache import SeedCache
+from tools.game_simulator import GameSimulator
+
+DEFAULT_PROFILE = "Snes9x 1.62.3"
+ROM_HEADER = 0x7FC0 # LoROM internal header
+SET_FIELDS = ("inventory", "scenario", "capsules", "cleared_locations") # Compared without order
+
+
+def _spoiler_word(text: str) -> str:
+    """What the spoiler log parser can get back: letters and single spaces, camel case split."""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    return " ".join(re.sub(r"[^A-Za-z]+", " ", text).split()).title() or "None"
+
+
+def _map_32bit(size: int) -> int:
+    """Anonymous mapping below 4 GB: the emulator's ROM pointer is a u32. Returns 0 if that's not possible."""
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    libc.mmap.restype = ctypes.c_void_p
+    libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_long]
+    MAP_32BIT = 0x40 # x86-64 only
+    address = libc.mmap(None, size, mmap.PROT_READ | mmap.PROT_WRITE,
+                        mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS | MAP_32BIT, -1, 0)
+    if address in (None, ctypes.c_void_p(-1).value) or address >= 1 << 32:
+        return 0
+    return address
+
+
+class FakeEmulator:
+    """The child side: a module mapping + ROM buffer holding one GameSimulator's state."""
+
+    def __init__(self, profile, seed=None):
+        self.profile = profile
+        self.sim = GameSimulator(seed=seed, item_every=10, dungeon_every=30)
+        self.tools = _load_json("tool_items.json")
+        self.scenario_masks = {name: int(item["obtained_value"].replace(" ", ""), 2)
+                               for name, item in _load_json("scenario_items.json").items()}
+        self.dungeons = {}
+        flags = _load_json(profile.dungeon_flag_file)
+        start = min(int(address, 16) for address in flags)
+        for address, entries in flags.items():
+            for entry in entries:
+                self.dungeons[entry["location"]] = (int(address, 16) - start, int(entry["flag"], 16))
+        self.character_ids = {name: id for id, name in CHARACTER_IDS.items()}
+
+        p = profile
+        top = max(p.inventory_end, p.capsule_end, p.dungeon_flag_end, p.transport_flag, max(p.walk), max(p.ship),
+                  max(p.character_slots), p.scenario_end, p.pointer_base or 0) + 16
+        fd = os.memfd_create(p.module)
+        os.ftruncate(fd, top)
+        self.module = mmap.mmap(fd, top)
+        os.close(fd)
+
+        # ROM: capsule sprite table, spoiler log and shops, reached through the u32 pointer at pointer_base
+        self.rom_size = max(p.spoiler_log_end or 0, (p.capsule_sprite_offset or 0) + CAPSULE_SPRITE_COUNT * CAPSULE_SPRITE_STRIDE)
+        self.rom = _map_32bit(self.rom_size) if p.pointer_base is not None else 0
+        if p.pointer_base is not None:
+            self.module[p.pointer_base:p.pointer_base + 4] = self.rom.to_bytes(4, "little")
+        self._write_header()
+        self._write_spoiler_log()
+        self._write_shops()
+
+    def _write_header(self):
+        """Title, map mode 0x20 (LoROM) and a checksum / complement pair, as profile detection checks."""
+        if not self.rom:
+            return
+        header = bytearray(0x20)
+        header[:21] = b"LUFIA2 DUMMY".ljust(21)
+        header[0x15] = 0x20
+        checksum = 0x1234
+        header[0x1C:0x20] = (checksum ^ 0xFFFF).to_bytes(2, "little") + checksum.to_bytes(2, "little")
+        ctypes.memmove(self.rom + ROM_HEADER, bytes(header), len(header))
+
+    def _write_spoiler_log(self):
+        p = self.profile
+        self.spoiler_log = []
+        if not self.rom or p.spoiler_log_start is None:
+            return
+        text = bytearray(SPOILER_LOG_MARKER)
+        size = p.spoiler_log_end - p.spoiler_log_start
+        for entry in self.sim.spoiler_log:
+            words = {key: _spoiler_word(entry[key]) for key in ("item", "location", "boss")}
+            chunk = b"".join(b"\0" + words[key].encode("ascii") for key in ("item", "location", "boss"))
+            if len(text) + len(chunk) > size:
+                break
+            text += chunk
+            self.spoiler_log.append(words)
+        ctypes.memmove(self.rom + p.spoiler_log_start, bytes(text), len(text))
+
+    def _write_shops(self):
+        """Vanilla shop lists into the shop_addresses.json ranges; weapons and armor share one."""
+        self.shops = {}
+        if not self.rom:
+            return
+        shop_data = _load_json(SHOP_DATA)
+        for shop in _load_json(SHOP_ADDRESSES)["shops"]:
+            city = shop["city"]
+            ranges = {}
+            for category, text in shop.items():
+                if category != "city":
+                    ranges.setdefault(text, []).append(category)
+            for text, categories in ranges.items():
+                start, length = _shop_range(text)
+                width = 1 if categories == [SHOP_SPELLS] else 2
+                data = bytearray()
+                for category in categories:
+                    names = self.shops.setdefault(city, {}).setdefault(category, [])
+                    for name, hex_id in shop_data.get(city, {}).get(category, []):
+                        if len(data) + width > length:
+                            break
+                        data += int.from_bytes(bytes.fromhex(hex_id), "little").to_bytes(width, "little")
+                        names.append(name)
+                if data and len(data) + width <= length: # Empty lists write nothing (Narcysus' ranges overlap)
+                    data += bytes([SHOP_END] * width)
+                ctypes.memmove(self.rom + start, bytes(data), len(data))
+
+    def write_state(self):
+        sim, p, m = self.sim, self.profile, self.module
+
+        inventory = bytearray(p.inventory_end - p.inventory_start)
+        scenario = 0
+        slot = 0
+        for name in sim.inventory:
+            item = self.tools[name]
+            if item.get("type") == "normal":
+                inventory[slot:slot + 2] = int(item["obtained_value"], 16).to_bytes(2, "little")
+                slot += 2
+            else:
+                scenario |= int(item["obtained_value"].replace(" ", ""), 2)
+        m[p.inventory_start:p.inventory_end] = bytes(inventory)
+        for name in sim.scenario:
+            scenario |= self.scenario_masks[name]
+        m[p.scenario_start:p.scenario_end + 1] = scenario.to_bytes(p.scenario_end - p.scenario_start + 1, "little")
+
+        for i, address in enumerate(p.character_slots):
+            m[address] = self.character_ids[sim.characters[i]] if i < len(sim.characters) else 0xFF
+        for i, name in enumerate(CAPSULE_NAMES[:p.capsule_end - p.capsule_start + 1]):
+            m[p.capsule_start + i] = 1 if name in sim.capsules else 0
+
+        flags = bytearray(p.dungeon_flag_end - p.dungeon_flag_start + 1)
+        for location in sim.cleared:
+            offset, mask = self.dungeons[location]
+            flags[offset] |= mask
+        m[p.dungeon_flag_start:p.dungeon_flag_end + 1] = bytes(flags)
+
+        ship = sim.transport == "ship"
+        m[p.transport_flag] = TRANSPORT_SHIP if ship else 0
+        x_fast, x_slow, y_fast, y_slow = p.ship if ship else p.walk
+        m[x_fast], m[x_slow] = sim.x & 0xFF, sim.x >> 8
+        m[y_fast], m[y_slow] = sim.y & 0xFF, sim.y >> 8
+
+        sprites = (sim.capsule_sprite_values + ["0000"] * CAPSULE_SPRITE_COUNT)[:CAPSULE_SPRITE_COUNT]
+        if self.rom:
+            for i, value in enumerate(sprites):
+                ctypes.memmove(self.rom + p.capsule_sprite_offset + i * CAPSULE_SPRITE_STRIDE, bytes.fromhex(value), 2)
+
+        return {
+            "inventory": list(sim.inventory),
+            "characters": list(sim.characters[:len(p.character_slots)]),
+            "capsules": list(sim.capsules),
+            "capsule_sprite_values": sprites if self.rom else [],
+            "player_x": sim.x,
+            "player_y": sim.y,
+            "transport_mode": sim.transport,
+            "cleared_locations": list(sim.cleared),
+            "scenario": list(sim.scenario),
+            "maidens": {},
+            "spoiler_log": self.spoiler_log,
+        }
+
+    def serve(self, stdin, stdout):
+        stdout.write(json.dumps({"pid": os.getpid(), "module": self.profile.module, "rom": self.rom,
+                                 "shops": self.shops}) + "\n")
+        stdout.flush()
+        for line in stdin:
+            for _ in range(int(line.strip() or 1)):
+                self.sim.step()
+            stdout.write(json.dumps(self.write_state()) + "\n")
+            stdout.flush()
+
+
+def compare(expected: dict, actual: dict) -> list:
+    """Field names where the reader disagrees with the dummy."""
+    mismatched = []
+    for key, value in expected.items():
+        got = actual.get(key)
+        if key in SET_FIELDS:
+            value, got = sorted(value), sorted(got or ())
+        if value != got:
+            mismatched.append(key)
+    return mismatched
+
+
+def resolve_seed(payload: dict, cache: SeedCache) -> dict:
+    """Fills in the static fields a payload only references by seed_hash, like StateManager._restore_seed."""
+    seed = cache.get(payload["seed_hash"]) if payload.get("seed_hash") else None
+    if seed is None:
+        return payload
+    payload = dict(payload)
+    for key in ("capsule_sprite_values", "spoiler_log"):
+        if payload.get(key) is None:
+            payload[key] = getattr(seed, key)
+    return payload
+
+
+def spawn(profile_name: str, seed=None, shift=0):
+    """
+    Starts a dummy emulator child. Returns (process, pid, profile, module base); its hello is child.hello.
+    With a `shift` the profile is the shifted one the child lays out.
+    """
+    child = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--profile", profile_name, f"--shift={shift}"]
+        + (["--seed", str(seed)] if seed is not None else []),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    hello = json.loads(child.stdout.readline())
+    child.hello = hello
+    profile, base = find_profile(hello["pid"], load_profiles(), profile_name)
+    if shift:
+        profile = profile.shifted(shift, profile.pointer_base)
+    logging.info(f"Dummy emulator pid {hello['pid']}: {hello['module']} at 0x{base:X}, ROM at 0x{hello['rom']:X}")
+    return child, hello["pid"], profile, base
+
+
+def advance(child, ticks=1) -> dict:
+    """Steps the dummy's game and returns the payload it now expects to be read."""
+    child.stdin.write(f"{ticks}\n")
+    child.stdin.flush()
+    return json.loads(child.stdout.readline())
+
+
+def run_check(profile_name: str, ticks: int, seed=None, step=1, gap=DEFAULT_GAP, shift=0) -> bool:
+    child, pid, profile, base = spawn(profile_name, seed, shift)
+    cache_dir = tempfile.TemporaryDirectory(prefix="l2at-seeds-")
+    try:
+        memory = ProcessMemory(pid)
+        cache = SeedCache(cache_dir.name)
+        reader = MemoryReader(memory, base, profile, gap, seed_cache=cache)
+        logging.info(f"WRAM read plan: {reader.plan.describe()}")
+
+        failures = 0
+        read_time = 0.0
+        applied = last = last_bits = None # Snapshot + every delta since, as StateManager would see it
+        deltas = 0
+        for tick in range(ticks):
+            expected = advance(child, step)
+            started = time.perf_counter()
+            actual = reader.read_game_state()
+            read_time += time.perf_counter() - started
+
+            if applied is None:
+                applied = dict(actual, seq=0)
+            else:
+                delta = reader.make_delta(last, last_bits, actual, reader.bits, applied["seq"] + 1)
+                if not delta_is_empty(delta):
+                    applied = merge_payloads(applied, delta)
+                    deltas += 1
+            last, last_bits = actual, reader.bits
+
+            mismatched = [f"read {key}" for key in compare(expected, resolve_seed(actual, cache))]
+            mismatched += [f"delta {key}" for key in compare(expected, resolve_seed(applied, cache))]
+            if mismatched:
+                failures += 1
+                if failures <= 5:
+                    logging.error(f"tick {tick}: mismatched {', '.join(mismatched)}")
+
+        logging.info(f"{ticks} ticks, {failures} mismatched, {deltas} deltas, {memory.syscalls} syscalls, "
+                     f"{memory.bytes_read:,} bytes, {read_time / max(ticks, 1) * 1e6:.1f} us per read")
+
+        if reader.seed is None or reader.seed.shops != child.hello["shops"]:
+            failures += 1
+            logging.error("Shops mismatched")
+
+        # Restart on the same seed: a new reader with a cold in-memory cache must find it on disk
+        restarted = MemoryReader(ProcessMemory(pid), base, profile, gap, seed_cache=SeedCache(cache_dir.name))
+        state = restarted.read_game_state()
+        if state.get("seed_hash") != reader.seed_hash or restarted.seed_cache.stats.hits != 1:
+            failures += 1
+            logging.error(f"Seed not restored from the cache: {restarted.seed_cache.stats}")
+        logging.info(f"Seed {reader.seed_hash}: {cache.stats}, after restart {restarted.seed_cache.stats}")
+
+        # Profile detection has to find the layout the dummy uses, by scan and then from its cache
+        detector = ProfileDetector(load_profiles(), Path(cache_dir.name) / "emulators.json")
+        for attempt in ("scan", "cache"):
+            try:
+                detected, detected_base = detector.detect(pid)
+            except ProcessMemoryError as e: # Not enough game state yet to trust a shifted match
+                logging.warning(f"Profile detection: {e}")
+                break
+            if (detected_base, detected.character_slots, detected.dungeon_flag_start, detected.pointer_base) != \
+                    (base, profile.character_slots, profile.dungeon_flag_start, profile.pointer_base):
+                failures += 1
+                logging.error(f"Detected {detected.name} by {attempt}, expected {profile.name}")
+        else:
+            logging.info(f"Profile detection: {detected.name}, {detector.stats}")
+        return failures == 0
+    finally:
+        child.stdin.close()
+        child.wait(5)
+        cache_dir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake emulator process for the native memory reader.")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="Profile name from emulator_addresses.json")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=1000, help="Reads to verify")
+    parser.add_argument("--step", type=int, default=1, help="Simulator ticks between reads")
+    parser.add_argument("--gap", type=int, default=DEFAULT_GAP, help="Read planner merge threshold in bytes")
+    parser.add_argument("--shift", type=lambda text: int(text, 0), default=0, help="Move the fake WRAM by this many bytes")
+    parser.add_argument("--serve", action="store_true", help="Run as the dummy process (driven over stdin)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.serve:
+        profile = next(p for p in load_profiles() if p.name == args.profile)
+        if args.shift:
+            profile = profile.shifted(args.shift, profile.pointer_base)
+        FakeEmulator(profile, seed=args.seed).serve(sys.stdin, sys.stdout)
+        return
+    sys.exit(0 if run_check(args.profile, args.ticks, seed=args.seed, step=args.step, gap=args.gap,
+                       shift=args.shift) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Simulated Lufia 2 session for load / soak testing the tracker without
+Windows, an emulator or the C# helper.
+
+A seeded GameSimulator walks the player around the world map, picks up
+tools and scenario keys over time, clears dungeons from
+dungeon_flags_snes9x.json and builds a spoiler log for them. Payloads
+follow the helper's send loop (helper/Program.cs): a full GameState when
+anything but the position changed, a position-only payload otherwise.
+They're sent through the StandInHelper connection, so both protocols work,
+with the tracker's category mask applied (disabled categories go out as null).
+
+Usage (tracker must be listening, e.g. Auto Tracking enabled):
+    python src/tools/game_simulator.py --rate 10 --duration 60
+    python src/tools/game_simulator.py --rate 0 --burst 50 --malformed 0.01 --count 100000
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.payloads import make_delta
+from network.protocol import PROTOCOL_BINARY, FRAME_SNAPSHOT, encode_frame
+from network.transports import Endpoint
+from tools.stand_in_helper import StandInHelper, HOST, PORT
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+WORLD_SIZE = 4096
+
+HUMANS = ["Guy", "Selan", "Dekar", "Tia", "Lexis", "Artea"] # Maxim is always in the party
+MAIDENS = ["Clare", "Lisa", "Marie"] # Spoiler log spelling (see StateManager.process_spoiler_log)
+CAPSULE_REWARDS = { # Spoiler reward name -> capsule sprite value
+    "Foomy S": "4600", "Shaggy": "A502", "Hard Hat": "4305", "Red Fish": "AF07",
+    "Myconido": "580A", "Raddisher": "0B0D", "Armor Dog": "880F",
+}
+CAPSULE_NAMES = {
+    "4600": "Jelze", "A502": "Flash", "4305": "Gusto", "AF07": "Zeppy",
+    "580A": "Darbi", "0B0D": "Sully", "880F": "Blaze",
+}
+
+# Frames that must be counted as garbled and dropped, never crash the reader
+MALFORMED_BODIES = [
+    b'{"inventory": ["Arrow", "Bo',                 # Truncated
+    b'not json at all',
+    b'["inventory"]',                                # Not an object
+    b'{"inventory": [1, 2, 3]}',                     # Wrong element type
+    b'{"player_x": "north", "player_y": 5}',        # Wrong field type
+    b'\xff\xfe{"player_x": 1}',                      # Not UTF-8
+]
+
+
+def _load(name):
+    with open(DATA_DIR / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class GameSimulator:
+    """One seeded playthrough. step() advances a tick, payload() renders what the helper would send."""
+
+    def __init__(self, seed=None, item_every=40, dungeon_every=120):
+        self.rng = random.Random(seed)
+        self.item_every = item_every       # Ticks between item pickups (on average)
+        self.dungeon_every = dungeon_every # Ticks between cleared dungeons (on average)
+        self.tick = 0
+
+        tools = list(_load("tool_items.json"))
+        scenario = list(_load("scenario_items.json"))
+        dungeons = []
+        for entries in _load("dungeon_flags_snes9x.json").values():
+            dungeons.extend(entry["location"] for entry in entries)
+        spoiler_names = _load("location_name_mapping.json")
+
+        # Shuffle acquisition orders up front so a seed always plays the same game
+        self.rng.shuffle(tools)
+        self.rng.shuffle(scenario)
+        self.rng.shuffle(dungeons)
+        self._pending_items = [("inventory", name) for name in tools] + [("scenario", name) for name in scenario]
+        self.rng.shuffle(self._pending_items)
+        self._pending_dungeons = dungeons
+
+        # Spoiler log: a reward + boss per dungeon
+        rewards = HUMANS + MAIDENS + list(CAPSULE_REWARDS) + tools[:10]
+        self.rng.shuffle(rewards)
+        bosses = [entry["name"].lstrip("#") for entry in _load("boss_sprites.json")]
+        self.spoiler_log = []
+        for location, reward in zip(dungeons, rewards):
+            self.spoiler_log.append({
+                "item": reward,
+                "location": spoiler_names.get(location, location),
+                "boss": self.rng.choice(bosses),
+            })
+        self._rewards = {entry["location"]: entry["item"] for entry in self.spoiler_log}
+        capsule_order = [entry["item"] for entry in self.spoiler_log if entry["item"] in CAPSULE_REWARDS]
+        self.capsule_sprite_values = [CAPSULE_REWARDS[name] for name in capsule_order]
+
+        # Game state
+        self.inventory = []
+        self.scenario = []
+        self.characters = ["Maxim"]
+        self.capsules = []
+        self.cleared = []
+        self.maidens = {}
+        self.x = self.rng.randrange(WORLD_SIZE)
+        self.y = self.rng.randrange(WORLD_SIZE)
+        self.transport = "walk"
+        self._heading = (1, 0)
+        self._core_dirty = True # First payload is always a full one
+
+    def step(self):
+        """Advances the game by one helper poll (100 ms in the real helper)."""
+        self.tick += 1
+        rng = self.rng
+
+        # Walk: keep heading most of the time, sometimes turn or stop (menus, dialogue)
+        roll = rng.random()
+        if roll < 0.1:
+            self._heading = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (0, 0)])
+        if rng.random() < 0.005:
+            self.transport = "ship" if self.transport == "walk" else "walk"
+        speed = 16 if self.transport == "ship" else 4
+        self.x = (self.x + self._heading[0] * speed) % WORLD_SIZE
+        self.y = (self.y + self._heading[1] * speed) % WORLD_SIZE
+
+        if self._pending_items and rng.random() < 1.0 / self.item_every:
+            field, name = self._pending_items.pop()
+            getattr(self, field).append(name)
+            self._core_dirty = True
+
+        if self._pending_dungeons and rng.random() < 1.0 / self.dungeon_every:
+            self._clear_dungeon(self._pending_dungeons.pop())
+            self._core_dirty = True
+
+    def _clear_dungeon(self, location):
+        self.cleared.append(location)
+        reward = self._rewards.get(location)
+        if reward in HUMANS and reward not in self.characters:
+            if len(self.characters) >= 4:
+                self.characters.pop(1) # Someone leaves the party
+            self.characters.append(reward)
+        elif reward in CAPSULE_REWARDS:
+            name = CAPSULE_NAMES[CAPSULE_REWARDS[reward]]
+            if name not in self.capsules:
+                self.capsules.append(name)
+        elif reward in MAIDENS:
+            self.maidens[reward] = True
+
+    def snapshot(self) -> dict:
+        """Full GameState (helper/Core/GameState.cs)."""
+        return {
+            "inventory": list(self.inventory),
+            "characters": list(self.characters),
+            "capsules": list(self.capsules),
+            "capsule_sprite_values": list(self.capsule_sprite_values),
+            "player_x": self.x,
+            "player_y": self.y,
+            "transport_mode": self.transport,
+            "cleared_locations": list(self.cleared),
+            "scenario": list(self.scenario),
+            "maidens": dict(self.maidens),
+            "spoiler_log": self.spoiler_log,
+        }
+
+    def payload(self) -> dict:
+        """What the helper would send this tick: a full state if anything but position changed."""
+        if self._core_dirty:
+            self._core_dirty = False
+            return self.snapshot()
+        return {
+            "inventory": None, "characters": None, "capsules": None, "capsule_sprite_values": None,
+            "player_x": self.x, "player_y": self.y, "transport_mode": self.transport,
+            "cleared_locations": None, "scenario": None, "maidens": None, "spoiler_log": None,
+        }
+
+    @property
+    def finished(self) -> bool:
+        return not self._pending_items and not self._pending_dungeons
+
+
+class SimulationStats:
+    def __init__(self):
+        self.payloads = 0
+        self.full_states = 0
+        self.malformed = 0
+        self.syncs = 0
+        self.options = 0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        rate = self.payloads / self.elapsed if self.elapsed else 0.0
+        return (f"SimulationStats(payloads={self.payloads}, full={self.full_states}, malformed={self.malformed}, "
+                f"syncs={self.syncs}, options={self.options}, elapsed={self.elapsed:.1f}s, {rate:,.0f} payloads/s)")
+
+
+def run(helper: StandInHelper, sim: GameSimulator, count=None, duration=None,
+        rate=10.0, burst=1, malformed=0.0, deltas=False) -> SimulationStats:
+    """
+    Drives `helper` with `sim` until `count` payloads or `duration` seconds.
+    rate: bursts per second (0 = unthrottled). burst: payloads sent back to back per tick.
+    malformed: probability that a payload is replaced by a garbage frame.
+    """
+    stats = SimulationStats()
+    interval = 1.0 / rate if rate > 0 else 0
+    start = time.perf_counter()
+    next_tick = start
+    last_state = None
+    seq = 0
+
+    while True:
+        if count is not None and stats.payloads >= count:
+            break
+        if duration is not None and time.perf_counter() - start >= duration:
+            break
+
+        # The tracker may ask for a full state at any time; a new mask gets one too
+        for cmd in helper.poll_commands():
+            if cmd.get("cmd") in ("sync", "options"):
+                if cmd["cmd"] == "sync":
+                    stats.syncs += 1
+                else:
+                    stats.options += 1
+                sim._core_dirty = True
+                last_state = None
+
+        for _ in range(burst):
+            sim.step()
+            if malformed and sim.rng.random() < malformed:
+                _send_malformed(helper, sim.rng)
+                stats.malformed += 1
+            else:
+                full = sim._core_dirty
+                payload = helper.apply_mask(sim.payload())
+                if all(value is None for value in payload.values()):
+                    stats.payloads += 1 # Position-only tick with 'pos' off: the helper sends nothing
+                    continue
+                if full:
+                    stats.full_states += 1
+                if deltas:
+                    state = helper.apply_mask(sim.snapshot())
+                    if last_state is None:
+                        helper.send_snapshot(dict(state, seq=seq))
+                    else:
+                        helper.send_delta(make_delta(last_state, state, seq))
+                    last_state = state
+                    seq += 1
+                else:
+                    helper.send_snapshot(payload)
+            stats.payloads += 1
+
+        if interval:
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def _send_malformed(helper: StandInHelper, rng: random.Random):
+    body = rng.choice(MALFORMED_BODIES)
+    if helper.protocol == PROTOCOL_BINARY:
+        # Keep the length prefix honest, a broken header would (rightly) drop the link
+        helper.send_raw(encode_frame(FRAME_SNAPSHOT, body))
+    else:
+        helper.send_raw(body.replace(b"\n", b" ") + b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated game session for the tracker.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--endpoint", help="tcp://host:port, unix:///path or shm:///path (overrides --host/--port)")
+    parser.add_argument("--protocol", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--count", type=int, default=None, help="Stop after this many payloads")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--rate", type=float, default=10.0, help="Bursts per second (0 = unthrottled)")
+    parser.add_argument("--burst", type=int, default=1, help="Payloads sent back to back per tick")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Fraction of garbage frames (0..1)")
+    parser.add_argument("--deltas", action="store_true", help="Send one seq'd snapshot, then deltas")
+    parser.add_argument("--legacy", action="store_true", help="v1 without hello, like the old C# helper")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.count is None and args.duration is None:
+        args.duration = 60.0
+
+    sim = GameSimulator(seed=args.seed)
+    endpoint = Endpoint.parse(args.endpoint) if args.endpoint else None
+    helper = StandInHelper(args.host, args.port, args.protocol, endpoint=endpoint, legacy=args.legacy)
+    helper.connect()
+    try:
+        stats = run(helper, sim, count=args.count, duration=args.duration, rate=args.rate,
+                    burst=args.burst, malformed=args.malformed, deltas=args.deltas)
+    except KeyboardInterrupt:
+        stats = None
+    finally:
+        helper.close()
+    if stats is not None:
+        logging.info(f"{stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Python stand-in for Lufia2AutoTracker.Helper.exe.
+
+Connects to the tracker like the C# helper does and speaks either the v1
+NDJSON protocol or the v2 length-prefixed protocol, so the tracker's reader
+can be exercised and benchmarked without Windows or an emulator.
+Tracker commands (network/commands.py) are acked and the category mask is
+honoured; --legacy behaves like the old C# build (no hello, SYNC keyword only).
+
+Usage (tracker must be listening, e.g. Auto Tracking enabled):
+    python src/tools/stand_in_helper.py --protocol 2 --count 100 --rate 10
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.payloads import make_delta
+from network.commands import CMD_OPTIONS, DEFAULT_POLL_MS, disabled_fields
+from network.framing import NdjsonFramer, BinaryFrameReader
+from network.protocol import (
+    PROTOCOL_NDJSON, PROTOCOL_BINARY, FRAME_SNAPSHOT, FRAME_DELTA, FRAME_HEARTBEAT, FRAME_COMMAND,
+    FEATURE_COMMANDS, encode_frame, encode_json_frame, encode_ndjson, hello_message, parse_hello_ack,
+)
+from network.transports import Endpoint, TRANSPORT_TCP, open_client
+
+HOST = '127.0.0.1'
+PORT = 65432
+
+
+def sample_snapshot(player_x=1024, player_y=2048) -> dict:
+    """A GameState payload shaped like the C# helper's output (GameState.cs)."""
+    return {
+        "inventory": ["Arrow", "Bomb", "Hook"],
+        "characters": ["Maxim", "Guy", "Selan"],
+        "capsules": ["Jelze", "Flash"],
+        "capsule_sprite_values": ["A502", "0B0D", "4600", "4305", "AF07", "580A", "880F"],
+        "player_x": player_x,
+        "player_y": player_y,
+        "transport_mode": "walk",
+        "cleared_locations": ["Foomy Woods", "Lake Cave", "Alunze Cave"],
+        "scenario": ["Door key", "Shrine", "Lake"],
+        "maidens": {},
+        "spoiler_log": [
+            {"item": "Guy", "location": "Alunze Cave", "boss": "Tarantula"},
+            {"item": "Shaggy", "location": "Lake Cave", "boss": "Lizard Man"},
+            {"item": "Hook", "location": "Foomy Woods", "boss": "None"},
+        ],
+    }
+
+
+class StandInHelper:
+    """Minimal helper client. One instance == one connection."""
+
+    def __init__(self, host=HOST, port=PORT, protocol=PROTOCOL_BINARY, endpoint=None, legacy=False):
+        self.endpoint = endpoint or Endpoint(TRANSPORT_TCP, host, port)
+        self.requested_protocol = protocol
+        self.legacy = legacy # v1 without a hello: no commands, no acks, just the SYNC keyword
+        self.protocol = PROTOCOL_NDJSON
+        self.sock = None
+        self.commands = []  # Commands received from the tracker
+        self.categories = {} # Category mask from the last options command (empty = everything on)
+        self.poll_ms = dict(DEFAULT_POLL_MS)
+        self._ndjson = NdjsonFramer()
+        self._binary = BinaryFrameReader()
+        self._inbox = [] # Commands that arrived together with the hello ack
+
+    def connect(self, timeout=5.0):
+        self.sock = open_client(self.endpoint, timeout=timeout)
+        if self.requested_protocol == PROTOCOL_BINARY:
+            self.sock.sendall(hello_message())
+            self.protocol = self._await_ack()
+        elif not self.legacy:
+            self.sock.sendall(hello_message([PROTOCOL_NDJSON], features=[FEATURE_COMMANDS]))
+            self._await_ack()
+        logging.info(f"Stand-in helper connected to {self.endpoint} (protocol v{self.protocol})")
+
+    def _await_ack(self) -> int:
+        buffer = b""
+        while b"\n" not in buffer:
+            data = self.sock.recv(4096)
+            if not data:
+                raise ConnectionError("Tracker closed the link during handshake")
+            buffer += data
+        line, rest = buffer.split(b"\n", 1)
+        chosen = parse_hello_ack(json.loads(line))
+        if chosen is None:
+            raise ConnectionError(f"Expected a hello ack, got {line[:80]!r}")
+        # The tracker may follow up right away (e.g. with its options), in the new protocol
+        self._inbox.extend(self._parse_commands(rest, chosen))
+        return chosen
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    # --- Outgoing ---
+
+    def send_snapshot(self, payload: dict):
+        self._send(FRAME_SNAPSHOT, payload)
+
+    def send_delta(self, payload: dict):
+        if self.protocol == PROTOCOL_BINARY:
+            self._send(FRAME_DELTA, payload)
+        else:
+            self._send(FRAME_DELTA, dict(payload, type="delta"))
+
+    def send_heartbeat(self):
+        if self.protocol == PROTOCOL_BINARY:
+            self.sock.sendall(encode_frame(FRAME_HEARTBEAT))
+
+    def send_raw(self, data: bytes):
+        """Bypasses encoding entirely (used to inject malformed frames)."""
+        self.sock.sendall(data)
+
+    def send_ack(self, command: dict, ok=True, error=None):
+        ack = {"ack": command["id"], "cmd": command.get("cmd"), "ok": ok}
+        if error:
+            ack["error"] = error
+        if self.protocol == PROTOCOL_BINARY:
+            self.sock.sendall(encode_json_frame(FRAME_COMMAND, ack))
+        else:
+            self.sock.sendall(encode_ndjson(ack))
+
+    def apply_mask(self, payload: dict) -> dict:
+        """Nulls the fields of disabled categories, like the helper that never read them."""
+        for field in disabled_fields(self.categories):
+            if field in payload:
+                payload[field] = None
+        return payload
+
+    def _send(self, frame_type: int, payload: dict):
+        if self.protocol == PROTOCOL_BINARY:
+            self.sock.sendall(encode_json_frame(frame_type, payload))
+        else:
+            self.sock.sendall(encode_ndjson(payload))
+
+    # --- Incoming ---
+
+    def poll_commands(self) -> list:
+        """
+        Non-blocking read of tracker commands. Returns newly received ones.
+        Options are applied and everything with an id is acked on the way.
+        """
+        received, self._inbox = self._inbox, []
+        self.sock.setblocking(False)
+        try:
+            while True:
+                data = self.sock.recv(4096)
+                if not data:
+                    break
+                received.extend(self._parse_commands(data, self.protocol))
+        except (BlockingIOError, InterruptedError):
+            pass
+        finally:
+            self.sock.setblocking(True)
+        for command in received:
+            if command.get("cmd") == CMD_OPTIONS:
+                self.categories = dict(command.get("categories") or {})
+                self.poll_ms.update(command.get("poll_ms") or {})
+            if "id" in command:
+                self.send_ack(command)
+        self.commands.extend(received)
+        return received
+
+    def _parse_commands(self, data: bytes, protocol: int) -> list:
+        commands = []
+        if protocol == PROTOCOL_BINARY:
+            for frame_type, body in self._binary.feed(data):
+                if frame_type == FRAME_COMMAND:
+                    commands.append(json.loads(bytes(body)))
+        else:
+            for line in self._ndjson.feed(data):
+                if line.startswith(b"{"):
+                    commands.append(json.loads(line))
+                else:
+                    # Legacy commands are bare keywords ("SYNC")
+                    commands.append({"cmd": line.decode("ascii", "replace").lower()})
+        return commands
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python stand-in for the C# tracker helper.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--endpoint", help="tcp://host:port, unix:///path or shm:///path (overrides --host/--port)")
+    parser.add_argument("--protocol", type=int, choices=[1, 2], default=2)
+    parser.add_argument("--count", type=int, default=50, help="Number of payloads to send")
+    parser.add_argument("--rate", type=float, default=10.0, help="Payloads per second (0 = unthrottled)")
+    parser.add_argument("--deltas", action="store_true", help="Send one seq'd snapshot, then deltas")
+    parser.add_argument("--legacy", action="store_true", help="v1 without hello, like the old C# helper")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    endpoint = Endpoint.parse(args.endpoint) if args.endpoint else None
+    helper = StandInHelper(args.host, args.port, args.protocol, endpoint=endpoint, legacy=args.legacy)
+    helper.connect()
+    try:
+        interval = 1.0 / args.rate if args.rate > 0 else 0
+        last = None
+        for i in range(args.count):
+            state = helper.apply_mask(sample_snapshot(player_x=1024 + i, player_y=2048))
+            if args.deltas and last is not None:
+                helper.send_delta(make_delta(last, state, seq=i))
+            else:
+                helper.send_snapshot(dict(state, seq=i))
+            last = state
+            for cmd in helper.poll_commands():
+                logging.info(f"Tracker command: {cmd}")
+            if interval:
+                time.sleep(interval)
+    finally:
+        helper.close()
+
+
+if __name__ == "__main__":
+    main()
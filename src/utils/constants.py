@@ -12,6 +12,26 @@ BASE_DIR = get_base_dir()
 DATA_DIR = BASE_DIR / "src" / "data"
 IMAGES_DIR = BASE_DIR / "images"
 
+# Per-user cache (e.g. core/seed_cache.py), outside the install so frozen builds can write it
+def get_cache_dir():
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "Lufia2Autotracker"
+
+CACHE_DIR = get_cache_dir()
+
+# Per-user state that must survive (e.g. the tracker journal, core/journal.py); unlike the cache, not disposable
+def get_state_dir():
+    if sys.platform == "win32":
+        root = os.environ.get("APPDATA") or Path.home() / "AppData" / "Roaming"
+    else:
+        root = os.environ.get("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    return Path(root) / "Lufia2Autotracker"
+
+STATE_DIR = get_state_dir()
+
 # Sacred Pixel Coordinates (Extracted from shared.py in v1.3)
 # DO NOT MODIFY THESE VALUES UNDER ANY CIRCUMSTANCES
 GAME_WORLD_SIZE = (4096, 4096)